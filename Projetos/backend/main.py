@@ -1,4 +1,4 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 # --- 1. IMPORTS DOS ROTEADORES (CORRIGIDOS) ---
@@ -11,6 +11,8 @@ from src.infrastructure.controllers.pysus.sih.routes import sih_router
 from src.infrastructure.controllers.pysus.sim.routes import sim_router
 from src.infrastructure.controllers.pysus.sinan.routes import sinan_router
 from src.infrastructure.controllers.pysus.sinasc.routes import sinasc_router
+from src.infrastructure.controllers.pysus.aggregate.routes import aggregate_router
+from src.infrastructure.controllers.pysus.sql.routes import sql_router
 
 # Módulo Sidra
 from src.infrastructure.controllers.sidra.routes import sidra_router 
@@ -18,6 +20,10 @@ from src.infrastructure.controllers.sidra.routes import sidra_router
 # Módulo de Mapas
 from src.infrastructure.controllers.maps.routes import maps_router
 from src.infrastructure.controllers.maps.routes import get_map_state_layers_route
+from src.infrastructure.controllers.tiles.routes import tiles_router
+
+# Catálogo dos bancos do PySUS (listagens do FTP compartilhadas pelo processo)
+from src.infrastructure.shared import aggregation, data_version, geometry_registry, pysus_catalog
 
 # --- 2. INSTÂNCIA PRINCIPAL DA API ---
 app = FastAPI(
@@ -41,6 +47,34 @@ app.add_middleware(
 )
 
 
+# Toda resposta informa a versão dos dados locais, para que clientes e caches
+# descartem resultados calculados antes da última sincronização com o FTP.
+@app.middleware("http")
+async def add_data_version_header(request: Request, call_next):
+    response = await call_next(request)
+    response.headers[data_version.HEADER_NAME] = data_version.get_token()
+    return response
+
+
+# Pré-carrega as listagens do FTP numa thread: a API sobe na hora e as primeiras
+# consultas já encontram o catálogo em memória.
+@app.on_event("startup")
+def warm_up_pysus_catalog():
+    pysus_catalog.warm_up_in_background()
+
+
+# O mapa do Brasil usado como fundo de todos os mapas também é carregado na subida.
+@app.on_event("startup")
+def warm_up_geometry_registry():
+    geometry_registry.warm_up_in_background()
+
+
+# Os processos da agregação paralela são compartilhados pelas requisições: encerrados junto com a API.
+@app.on_event("shutdown")
+def shutdown_aggregation_pool():
+    aggregation.shutdown_pool()
+
+
 # --- 4. INCLUSÃO DOS ROTEADORES ---
 
 # Rota Raiz
@@ -57,6 +91,9 @@ app.include_router(sih_router, prefix="/pysus/sih")
 app.include_router(sim_router, prefix="/pysus/sim")
 app.include_router(sinan_router, prefix="/pysus/sinan")
 app.include_router(sinasc_router, prefix="/pysus/sinasc")
+app.include_router(sql_router, prefix="/pysus/sql")
+# Resumo genérico '/pysus/{system}/aggregate' (depois dos roteadores específicos)
+app.include_router(aggregate_router, prefix="/pysus")
 
 # Módulo Sidra
 app.include_router(sidra_router, prefix="/sidra")
@@ -68,6 +105,9 @@ app.include_router(
     tags=["Maps"] # A tag já está no arquivo de rotas, mas é bom manter aqui.
 )
 
+# Tiles vetoriais para mapas web interativos
+app.include_router(tiles_router, prefix="/tiles")
+
 
 # --- 5. COMANDO PARA RODAR (NO TERMINAL) ---
 # Lembre-se de estar na pasta 'backend/' e com o ambiente virtual ativado
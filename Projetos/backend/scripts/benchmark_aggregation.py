@@ -0,0 +1,84 @@
+# scripts/benchmark_aggregation.py
+"""
+Benchmark: contagem por município com Counter + pandas (caminho antigo) x GroupCounter em Arrow.
+
+Uso (a partir da pasta 'backend/'):
+    python -m scripts.benchmark_aggregation --rows 5000000 --row-group-size 65536
+"""
+import argparse
+import time
+from collections import Counter
+
+import numpy as np
+import pyarrow as pa
+
+from src.infrastructure.shared import aggregation
+
+MUNICIPALITY_COLUMN = 'CODMUNOCOR'
+NUMBER_OF_MUNICIPALITIES = 5570
+
+
+def build_row_groups(rows: int, row_group_size: int, seed: int = 42) -> list:
+    """Gera row groups sintéticos com códigos de município no formato texto do DATASUS."""
+    rng = np.random.default_rng(seed)
+    municipality_codes = np.array([str(110000 + i * 9) for i in range(NUMBER_OF_MUNICIPALITIES)], dtype=object)
+    row_groups = []
+    for start in range(0, rows, row_group_size):
+        size = min(row_group_size, rows - start)
+        codes = municipality_codes[rng.integers(0, NUMBER_OF_MUNICIPALITIES, size)]
+        row_groups.append(pa.table({MUNICIPALITY_COLUMN: pa.array(codes, type=pa.string())}))
+    return row_groups
+
+
+def run_counter_path(row_groups: list) -> Counter:
+    total_counts = Counter()
+    for chunk_table in row_groups:
+        chunk_df = chunk_table.to_pandas()
+        municipality_series = chunk_df.dropna(subset=[MUNICIPALITY_COLUMN])[MUNICIPALITY_COLUMN].astype(str)
+        total_counts.update(municipality_series.value_counts().to_dict())
+    return total_counts
+
+
+def run_arrow_path(row_groups: list) -> aggregation.GroupCounter:
+    counter = aggregation.GroupCounter([MUNICIPALITY_COLUMN])
+    for chunk_table in row_groups:
+        counter.update(chunk_table)
+    counter.result()
+    return counter
+
+
+def measure(label: str, function, row_groups: list, rows: int, repeat: int) -> float:
+    best_seconds = min(_timed(function, row_groups) for _ in range(repeat))
+    rows_per_second = rows / best_seconds
+    print(f"{label:<22} {best_seconds:8.3f} s   {rows_per_second:14,.0f} linhas/s")
+    return rows_per_second
+
+
+def _timed(function, row_groups: list) -> float:
+    start = time.perf_counter()
+    function(row_groups)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--row-group-size", type=int, default=65_536)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Gerando {args.rows:,} linhas em row groups de {args.row_group_size:,}...")
+    row_groups = build_row_groups(args.rows, args.row_group_size)
+
+    # Os dois caminhos precisam produzir exatamente as mesmas contagens.
+    expected = run_counter_path(row_groups)
+    arrow_counts = {row[MUNICIPALITY_COLUMN]: row['count'] for row in run_arrow_path(row_groups).to_records()}
+    assert arrow_counts == dict(expected), "As contagens em Arrow divergem do caminho com Counter."
+
+    counter_rate = measure("Counter + pandas", run_counter_path, row_groups, args.rows, args.repeat)
+    arrow_rate = measure("GroupCounter (Arrow)", run_arrow_path, row_groups, args.rows, args.repeat)
+    print(f"Ganho: {arrow_rate / counter_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
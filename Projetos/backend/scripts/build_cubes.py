@@ -0,0 +1,35 @@
+# scripts/build_cubes.py
+"""
+Gera os cubos de contagem (sistema × grupo × ano × mês × município × sexo × faixa etária)
+lidos pelos resumos do SIM, SINAN, SINASC e CNES.
+
+Uso (a partir da pasta 'backend/'):
+    python -m scripts.build_cubes --system SIM --group CID10 --years 2020 2021 2022
+    python -m scripts.build_cubes --system SINAN --group DENG --years 2023
+    python -m scripts.build_cubes --system CNES --group ST --years 2023 --states PE PB
+
+Sem --states o cubo cobre todas as UFs. Rodar de novo para o mesmo ano regrava o cubo.
+"""
+import argparse
+import time
+
+from src.domain.use_cases.pysus.cubes.build_aggregate_cube_use_case import CUBE_SOURCES, BuildAggregateCubeUseCase
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--system", required=True, choices=sorted(CUBE_SOURCES), type=str.upper)
+    parser.add_argument("--group", required=True, help="Grupo do sistema (ou código do agravo no SINAN).")
+    parser.add_argument("--years", required=True, type=int, nargs="+")
+    parser.add_argument("--states", nargs="*", default=None, help="Siglas das UFs (padrão: todas).")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    written = BuildAggregateCubeUseCase().execute(args.system, args.group, args.years, args.states or None)
+    print(f"{len(written)} cubo(s) gravado(s) em {time.perf_counter() - start:.1f} s.")
+    for path in written:
+        print(f"  {path}")
+
+
+if __name__ == "__main__":
+    main()
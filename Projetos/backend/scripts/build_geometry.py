@@ -0,0 +1,34 @@
+# scripts/build_geometry.py
+"""
+Pré-gera as malhas do geobr usadas pelos mapas: a camada completa, os níveis simplificados
+(TIERS) e as partições por UF de cada nível, no GEOMETRY_STORE_DIR.
+
+Uso (a partir da pasta 'backend/'):
+    python -m scripts.build_geometry
+    python -m scripts.build_geometry --layers municipality state --years 2020 2022
+
+Sem argumentos, gera todas as camadas do ano de contexto dos mapas.
+"""
+import argparse
+import time
+
+from src.infrastructure.shared import geometry_registry
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--layers", nargs="+", default=list(geometry_registry.LAYERS), choices=sorted(geometry_registry.LAYERS))
+    parser.add_argument("--years", nargs="+", type=int, default=[geometry_registry.CONTEXT_YEAR])
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    registry = geometry_registry.get_registry()
+    keys = [(layer, year, tier) for layer in args.layers for year in args.years for tier in geometry_registry.TIERS]
+    for layer, year, tier in keys:
+        index = registry.index(layer, year, tier)
+        print(f"  {layer} {year} {tier}: {sum(entry['rows'] for entry in index.values())} feições em {len(index)} UF(s)")
+    print(f"{len(keys)} camada(s) pronta(s) em {time.perf_counter() - start:.1f} s.")
+
+
+if __name__ == "__main__":
+    main()
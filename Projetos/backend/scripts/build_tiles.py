@@ -0,0 +1,45 @@
+# scripts/build_tiles.py
+"""
+Pré-gera os tiles vetoriais dos zooms baixos (os que cobrem o Brasil inteiro), para que
+a primeira visita a um mapa web não monte dezenas de tiles nacionais na hora.
+
+Uso (a partir da pasta 'backend/'):
+    python -m scripts.build_tiles
+    python -m scripts.build_tiles --layers municipality --max-zoom 7
+    python -m scripts.build_tiles --layers municipality --year 2022 --sinasc-group DN
+
+Sem --max-zoom, gera até TILE_PRECOMPUTE_MAX_ZOOM. Tiles já gerados são pulados.
+"""
+import argparse
+import time
+
+from src.domain.use_cases.maps.get_vector_tile_use_case import TILE_PROPERTIES, GetVectorTileUseCase
+from src.infrastructure.shared import geometry_registry, vector_tiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--layers", nargs="+", default=["state", "municipality"], choices=sorted(TILE_PROPERTIES))
+    parser.add_argument("--min-zoom", type=int, default=0)
+    parser.add_argument("--max-zoom", type=int, default=vector_tiles.TILE_PRECOMPUTE_MAX_ZOOM)
+    parser.add_argument("--geometry-year", type=int, default=geometry_registry.CONTEXT_YEAR)
+    parser.add_argument("--year", type=int, default=None, help="Ano dos dados anexados.")
+    parser.add_argument("--sinasc-group", default=None, help="Anexa 'total_births' (ex.: DN).")
+    parser.add_argument("--disease-code", default=None, help="Anexa 'total_cases' (ex.: DENG).")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    use_case = GetVectorTileUseCase()
+    total = 0
+    for layer in args.layers:
+        for z in range(args.min_zoom, args.max_zoom + 1):
+            tiles = list(vector_tiles.tiles_in_bounds(geometry_registry.BRAZIL_BOUNDS, z))
+            for x, y in tiles:
+                use_case.execute(layer, z, x, y, args.geometry_year, args.year, args.sinasc_group, args.disease_code)
+            total += len(tiles)
+            print(f"  {layer} z{z}: {len(tiles)} tile(s)")
+    print(f"{total} tile(s) prontos em {time.perf_counter() - start:.1f} s.")
+
+
+if __name__ == "__main__":
+    main()
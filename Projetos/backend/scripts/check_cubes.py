@@ -0,0 +1,162 @@
+# scripts/check_cubes.py
+"""
+Confere que o cubo de contagem responde igual aos arquivos brutos, sem rede e sem o PySUS.
+
+Grava arquivos sintéticos do SIM, SINAN e SINASC (com sexo com espaços, em branco e
+nulo), monta os cubos numa pasta temporária com o BuildAggregateCubeUseCase e compara:
+  - o motor de resumo lendo os arquivos contra o motor somando o cubo (SIM e SINAN);
+  - o resumo do SINASC pelos arquivos contra o resumo pelo cubo.
+
+Uso (a partir da pasta 'backend/'):
+    python -m scripts.check_cubes
+
+Termina com código 1 se alguma verificação falhar.
+"""
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.domain.use_cases.pysus.aggregate.aggregate_pysus_use_case import CUBE_DIMENSIONS, SYSTEM_SOURCES
+from src.domain.use_cases.pysus.cubes.build_aggregate_cube_use_case import CUBE_SOURCES, BuildAggregateCubeUseCase
+from src.domain.use_cases.pysus.sinasc.get_summary_sinasc_use_case import REQUIRED_COLUMNS, SUMMARY_KEYS, GetSummarySinascUseCase
+from src.infrastructure.shared import aggregate_cube, aggregation, summary_engine
+
+YEAR = 2022
+GROUP = "CHECK"
+MUNICIPALITIES = ["261160", "260790", "2611606", None]
+
+# Sexo como aparece nos arquivos do DATASUS: com espaço nas pontas, em branco e nulo.
+SIM_SEXES = ["1", " 1", "2", "2 ", "", None, "9"]
+SINAN_SEXES = ["M", " M", "F", "F ", "", None, "I"]
+SINASC_SEXES = ["1", " 1", "2", "", None, "0"]
+
+# (group_by, filtros) comparados no SIM e no SINAN.
+QUESTIONS = {
+    system: [
+        (["municipality"], []),
+        (["municipality", "sex"], []),
+        (["sex", "age_band"], []),
+        (["municipality"], [f"sex={sex}"]),
+    ]
+    for system, sex in (("SIM", "1"), ("SINAN", "M"))
+}
+
+
+def _column(values: List[Any], rows: int) -> List[Any]:
+    return [values[i % len(values)] for i in range(rows)]
+
+
+def _write_raw(path: Path, rows: int, columns: Dict[str, List[Any]]) -> Path:
+    pq.write_table(pa.table({name: pa.array(_column(values, rows), pa.string()) for name, values in columns.items()}), path, row_group_size=97)
+    return path
+
+
+def _build_cube(system: str, raw_path: Path, cube_dir: str) -> None:
+    counts, columns = BuildAggregateCubeUseCase()._count_file(raw_path, CUBE_SOURCES[system], 0)
+    length = counts.num_rows
+    counts = (counts
+        .append_column(aggregate_cube.UF, pa.array([aggregate_cube.NOT_AVAILABLE] * length, pa.string()))
+        .append_column(aggregate_cube.YEAR, pa.array([YEAR] * length, pa.int16())))
+    aggregate_cube.write_cube(system, GROUP, YEAR, counts, source_columns=columns, root_dir=cube_dir)
+
+
+def _engine(system: str, group_by: List[str], filters: List[str]) -> summary_engine.SummaryEngine:
+    dimensions = SYSTEM_SOURCES[system]["dimensions"]
+    return summary_engine.SummaryEngine(dimensions, group_by, summary_engine.parse_filters(filters, dimensions))
+
+
+def _cube_records(system: str, group_by: List[str], filters: List[str], cube_dir: str) -> Optional[List[Dict[str, Any]]]:
+    """O mesmo caminho do AggregatePysusUseCase._add_from_cube, lendo os cubos de `cube_dir`."""
+    engine = _engine(system, group_by, filters)
+    cube = aggregate_cube.lookup(system, GROUP, [YEAR], root_dir=cube_dir, min_format=aggregate_cube.CUBE_FORMAT)
+    if cube is None:
+        return None
+    names = sorted(set(engine.group_by) | set(engine.filters), key=list(CUBE_DIMENSIONS).index)
+    counts = aggregation.sum_counts(cube[0], [CUBE_DIMENSIONS[name] for name in names])
+    engine.add_counts(counts.rename_columns(names + [aggregation.COUNT_COLUMN]) if counts is not None else None)
+    return engine.to_records(["count"])
+
+
+def _raw_records(system: str, group_by: List[str], filters: List[str], raw_path: Path) -> List[Dict[str, Any]]:
+    engine = _engine(system, group_by, filters)
+    engine.add_files([raw_path])
+    return engine.to_records(["count"])
+
+
+def _sorted(records: List[Dict[str, Any]]) -> List[str]:
+    return sorted(repr(sorted(record.items())) for record in records)
+
+
+def _sinasc_rows(counts: Optional[pa.Table]) -> List[str]:
+    return sorted(repr(row) for row in counts.to_pylist()) if counts is not None else []
+
+
+def main() -> int:
+    failed: List[str] = []
+
+    def check(condition: bool, description: str) -> None:
+        print(f"  {'✅' if condition else '❌'} {description}")
+        if not condition:
+            failed.append(description)
+
+    work_dir = Path(tempfile.mkdtemp(prefix="check-cubes-"))
+    cube_dir = str(work_dir / "cubes")
+    try:
+        rows = 1000
+        raw_paths = {
+            "SIM": _write_raw(work_dir / "DOCHECK.parquet", rows, {
+                "CODMUNOCOR": MUNICIPALITIES, "SEXO": SIM_SEXES,
+                "IDADE": ["401", "425", "470", "305", None, "999"], "DTOBITO": ["15032022", "01112022", None],
+            }),
+            "SINAN": _write_raw(work_dir / "CHECKBR.parquet", rows, {
+                "ID_MN_RESI": MUNICIPALITIES, "CS_SEXO": SINAN_SEXES,
+                "NU_IDADE_N": ["4001", "4030", "4075", "3005", None], "DT_NOTIFIC": ["20220315", "20221101", None],
+            }),
+            "SINASC": _write_raw(work_dir / "DNCHECK.parquet", rows, {
+                "CODMUNNASC": MUNICIPALITIES, "SEXO": SINASC_SEXES,
+                "IDADEMAE": ["17", "25", "38", "45", None], "DTNASC": ["15032022", None],
+            }),
+        }
+        for system, raw_path in raw_paths.items():
+            _build_cube(system, raw_path, cube_dir)
+
+        for system in ("SIM", "SINAN"):
+            print(f"{system}:")
+            for group_by, filters in QUESTIONS[system]:
+                raw = _raw_records(system, group_by, filters, raw_paths[system])
+                cube = _cube_records(system, group_by, filters, cube_dir)
+                check(cube is not None and _sorted(cube) == _sorted(raw), f"group_by={group_by} filtros={filters}: cubo igual aos arquivos ({len(raw)} grupos)")
+
+        print("SINASC:")
+        use_case = GetSummarySinascUseCase()
+        counter = aggregation.GroupCounter(SUMMARY_KEYS)
+        for chunk_table in pq.ParquetFile(raw_paths["SINASC"]).iter_batches(columns=REQUIRED_COLUMNS):
+            counter.update(use_case._prepare_chunk(pa.Table.from_batches([chunk_table]), None))
+        cube = aggregate_cube.lookup("SINASC", GROUP, [YEAR], root_dir=cube_dir, min_format=aggregate_cube.CUBE_FORMAT)
+        check(cube is not None and _sinasc_rows(use_case._counts_from_cube(cube[0], None)) == _sinasc_rows(counter.result()),
+              "resumo por município × sexo × faixa etária da mãe igual aos arquivos")
+
+        print("Formato:")
+        old_cube = aggregate_cube.cube_path("SIM", GROUP, YEAR, cube_dir)
+        table = pq.read_table(old_cube)
+        metadata = dict(table.schema.metadata)
+        metadata.pop(aggregate_cube.METADATA_FORMAT)
+        pq.write_table(table.replace_schema_metadata(metadata), old_cube)
+        check(aggregate_cube.lookup("SIM", GROUP, [YEAR], root_dir=cube_dir, min_format=aggregate_cube.CUBE_FORMAT) is None,
+              "um cubo sem formato não responde por sexo nem faixa etária")
+        check(aggregate_cube.lookup("SIM", GROUP, [YEAR], root_dir=cube_dir) is not None,
+              "um cubo sem formato continua respondendo os totais por município")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"\n{'Tudo certo.' if not failed else f'{len(failed)} verificação(ões) falharam.'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
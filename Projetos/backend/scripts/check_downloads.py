@@ -0,0 +1,151 @@
+# scripts/check_downloads.py
+"""
+Confere o caminho de download do datasus_store (novas tentativas, backoff, pasta
+.partial-* e validação) contra um FTP local, sem rede e sem o PySUS.
+
+O "FTP" é uma pasta temporária com arquivos parquet; a base falsa copia de lá como o
+PySUS faria e pode falhar, truncar ou esvaziar os downloads sob comando.
+
+Uso (a partir da pasta 'backend/'):
+    python -m scripts.check_downloads
+
+Termina com código 1 se alguma verificação falhar.
+"""
+import shutil
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.infrastructure.shared.datasus_store import PARTIAL_DIR_PREFIX, DatasusStore, IncompleteDownloadError
+from src.infrastructure.shared.download_scheduler import DownloadScheduler
+
+MAX_ATTEMPTS = 3
+BACKOFF_SECONDS = 1.0
+
+
+class LocalFtpFile:
+    def __init__(self, name: str, uf: str = "PE", year: int = 2022):
+        self.name = name
+        self.uf = uf
+        self.year = year
+
+
+class LocalFtpDatabase:
+    """
+    Base no formato do PySUS (describe/download) servida a partir de uma pasta local.
+
+    `failures[name]` é a lista de falhas das próximas tentativas daquele arquivo:
+    'error' (conexão cai), 'truncated' (sem rodapé) ou 'empty' (parquet sem linhas).
+    """
+    def __init__(self, remote_dir: Path):
+        self.remote_dir = remote_dir
+        self.failures: Dict[str, List[str]] = {}
+        self.attempts: Dict[str, int] = {}
+        self.staging_dirs: List[Path] = []
+        self._lock = threading.Lock()
+
+    def publish(self, name: str, rows: int = 1000) -> LocalFtpFile:
+        pq.write_table(pa.table({"CODMUNRES": [str(261160 + i % 7) for i in range(rows)]}), self._remote_path(name), row_group_size=250)
+        return LocalFtpFile(name)
+
+    def _remote_path(self, name: str) -> Path:
+        return self.remote_dir / f"{name}.parquet"
+
+    def describe(self, file: LocalFtpFile) -> Dict[str, Any]:
+        path = self._remote_path(file.name)
+        return {"uf": file.uf, "year": file.year, "month": "", "size": path.stat().st_size, "last_update": path.stat().st_mtime}
+
+    def download(self, files: List[LocalFtpFile], local_dir: str) -> Any:
+        file = files[0]
+        target = Path(local_dir) / f"{file.name}.parquet"
+        with self._lock:
+            self.attempts[file.name] = self.attempts.get(file.name, 0) + 1
+            self.staging_dirs.append(Path(local_dir))
+            pending = self.failures.get(file.name) or []
+            failure = pending.pop(0) if pending else None
+
+        if failure == "error":
+            # O PySUS costuma deixar o arquivo pela metade quando a conexão cai.
+            target.write_bytes(self._remote_path(file.name).read_bytes()[:100])
+            raise ConnectionError("conexão encerrada pelo servidor")
+        if failure == "truncated":
+            data = self._remote_path(file.name).read_bytes()
+            target.write_bytes(data[: len(data) // 2])
+        elif failure == "empty":
+            pq.write_table(pa.table({"CODMUNRES": pa.array([], pa.string())}), target)
+        else:
+            shutil.copyfile(self._remote_path(file.name), target)
+        return type("ParquetSet", (), {"path": str(target)})()
+
+
+def main() -> int:
+    failed: List[str] = []
+
+    def check(condition: bool, description: str) -> None:
+        print(f"  {'✅' if condition else '❌'} {description}")
+        if not condition:
+            failed.append(description)
+
+    work_dir = Path(tempfile.mkdtemp(prefix="check-downloads-"))
+    try:
+        remote_dir = work_dir / "ftp"
+        remote_dir.mkdir()
+        database = LocalFtpDatabase(remote_dir)
+
+        waits: List[float] = []
+        scheduler = DownloadScheduler(max_workers=4, max_per_host=2, max_attempts=MAX_ATTEMPTS, backoff_seconds=BACKOFF_SECONDS, sleep=waits.append)
+
+        # Sobra de um processo interrompido no meio de um download.
+        leftover = work_dir / "store" / "SIM" / "DO" / "PE" / "2022" / "ALL" / f"{PARTIAL_DIR_PREFIX}crash"
+        leftover.mkdir(parents=True)
+        store = DatasusStore(str(work_dir / "store"), scheduler=scheduler)
+
+        print("Início:")
+        check(not leftover.exists(), "pastas .partial-* de um processo interrompido são apagadas")
+
+        print("Novas tentativas e backoff:")
+        flaky = database.publish("DOPE_FLAKY")
+        database.failures["DOPE_FLAKY"] = ["error", "truncated"]
+        paths = store.fetch(database, "SIM", "DO", [flaky])
+        check(len(paths) == 1 and database.attempts["DOPE_FLAKY"] == 3, "o arquivo chega na 3ª tentativa")
+        check(len(waits) == 2 and waits[1] > waits[0] >= BACKOFF_SECONDS * 0.8, f"espera exponencial entre as tentativas: {[round(w, 2) for w in waits]}")
+        check(bool(paths) and pq.ParquetFile(paths[0]).metadata.num_rows == 1000, "a cópia registrada é a completa")
+
+        print("Falha em todas as tentativas:")
+        waits.clear()
+        broken = database.publish("DOPE_BROKEN")
+        database.failures["DOPE_BROKEN"] = ["error", "truncated", "empty"]
+        try:
+            store.fetch(database, "SIM", "DO", [flaky, broken])
+            raised = False
+        except IncompleteDownloadError as e:
+            raised = [key.rsplit("/", 1)[-1] for key in e.missing_keys] == ["DOPE_BROKEN"]
+        check(raised, "o pedido falha com IncompleteDownloadError em vez de devolver só parte dos arquivos")
+        keys = store.entries()
+        check(not any(key.endswith("DOPE_BROKEN") for key in keys), "nada entra no manifesto")
+        check(database.attempts["DOPE_BROKEN"] == MAX_ATTEMPTS and len(waits) == MAX_ATTEMPTS - 1, "as tentativas param no limite configurado")
+
+        print("Pasta temporária:")
+        check(all(PARTIAL_DIR_PREFIX in staging.name for staging in database.staging_dirs), "todo download é feito numa pasta .partial-*")
+        check(not any(staging.exists() for staging in database.staging_dirs), "nenhuma pasta .partial-* sobra depois do download")
+        check(not list((work_dir / "store").rglob("DOPE_BROKEN*")), "nenhuma cópia parcial fica na partição")
+
+        print("Cache e travas:")
+        attempts_before = dict(database.attempts)
+        paths = store.fetch(database, "SIM", "DO", [flaky])
+        check(len(paths) == 1 and database.attempts == attempts_before, "o segundo pedido usa a cópia local")
+        check(not store._key_locks, "as travas por chave são descartadas depois do download")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"\n{'Tudo certo.' if not failed else f'{len(failed)} verificação(ões) falharam.'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+# scripts/sync_datasus.py
+"""
+Sincroniza as cópias locais do DATASUS com o FTP: baixa de novo só os arquivos
+revisados (tamanho ou data diferentes do manifesto), refaz só os cubos afetados e
+incrementa a versão dos dados (cabeçalho X-Data-Version da API).
+
+Uso (a partir da pasta 'backend/'), por exemplo num cron diário:
+    python -m scripts.sync_datasus
+    python -m scripts.sync_datasus --systems SIM SINASC
+    python -m scripts.sync_datasus --no-cubes
+"""
+import argparse
+import time
+
+from src.domain.use_cases.pysus.sync.sync_datasus_use_case import SyncDatasusUseCase
+from src.infrastructure.shared import pysus_catalog
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--systems", nargs="*", default=None, type=str.upper, choices=sorted(pysus_catalog.DATABASES),
+                        help="Sistemas a verificar (padrão: todos).")
+    parser.add_argument("--no-cubes", action="store_true", help="Não refaz os cubos afetados.")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = SyncDatasusUseCase().execute(args.systems or None, rebuild_cubes=not args.no_cubes)
+    print(f"Sincronização concluída em {time.perf_counter() - start:.1f} s. Versão dos dados: {result['data_version']}")
+    for key in result["updated_files"]:
+        print(f"  atualizado: {key}")
+    for path in result["rebuilt_cubes"]:
+        print(f"  cubo refeito: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,12 +5,13 @@ for all municipalities of a given state.
 """
 from typing import List, Dict, Any, Optional
 import time
-from src.infrastructure.shared import ibge_client
+from src.infrastructure.shared import geometry_export, geometry_registry, ibge_client
 
 # Constants to avoid "magic strings" and improve readability.
 IBGE_TERRITORIAL_LEVEL_MUNICIPALITY = "N6"
 IBGE_LOCALITY_TYPE_MUNICIPALITIES = "municipios"
 API_REQUEST_DELAY_SECONDS = 0.1
+EXPORT_FORMATS = ("geojson", "topojson")
 
 class FetchDataMunicipalitiesUseCase:
     """
@@ -66,4 +67,49 @@ class FetchDataMunicipalitiesUseCase:
                 geojson_features_list.append(single_feature)
 
         # Step 5: Return the complete list of enriched GeoJSON features.
-        return geojson_features_list
\ No newline at end of file
+        return geojson_features_list
+
+    def export(
+        self,
+        state_abbreviation: str,
+        export_format: str = "topojson",
+        tier: str = geometry_registry.DEFAULT_TIER,
+        precision: int = geometry_export.DEFAULT_PRECISION,
+        quantization: int = geometry_export.DEFAULT_QUANTIZATION
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Compact export of the same municipalities, built from the cached geometry instead
+        of one IBGE mesh request per municipality.
+
+        Args:
+            state_abbreviation: The two-letter abbreviation of the state (e.g., "PE").
+            export_format: "topojson" (shared arcs, quantized coordinates) or "geojson"
+                (coordinates trimmed to `precision` decimal places).
+            tier: Simplification tier of the geometry (see geometry_registry.TIERS).
+
+        Returns:
+            A TopoJSON Topology or a GeoJSON FeatureCollection with 'id', 'name' and
+            'population' properties, or None if the state is unknown.
+
+        Raises:
+            ValueError: For an unknown format or tier.
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format '{export_format}'. Available: {list(EXPORT_FORMATS)}")
+
+        municipalities_gdf = geometry_registry.get_registry().municipalities(state_abbreviation, tier=tier)
+        if municipalities_gdf.empty:
+            return None
+
+        # One request for the whole state, keyed by the 7-digit IBGE code.
+        code_state = int(municipalities_gdf["code_state"].iloc[0])
+        populations = ibge_client.fetch_populations(f"{IBGE_TERRITORIAL_LEVEL_MUNICIPALITY}[N3[{code_state}]]")
+
+        municipalities_gdf["id"] = municipalities_gdf["code_muni"].astype(int).astype(str)
+        municipalities_gdf["name"] = municipalities_gdf["name_muni"]
+        municipalities_gdf["population"] = municipalities_gdf["id"].map(populations).fillna(0).astype(int)
+
+        columns = ["id", "name", "population"]
+        if export_format == "topojson":
+            return geometry_export.to_topojson(municipalities_gdf, IBGE_LOCALITY_TYPE_MUNICIPALITIES, quantization, columns)
+        return geometry_export.to_geojson(municipalities_gdf, precision, columns)
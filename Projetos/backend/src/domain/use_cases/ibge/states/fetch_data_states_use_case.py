@@ -1,12 +1,13 @@
 
 from typing import List, Dict, Any, Optional
 import time
-from src.infrastructure.shared import ibge_client
+from src.infrastructure.shared import geometry_export, geometry_registry, ibge_client
 
 # Constants for IBGE API parameters to make the code self-documenting.
 IBGE_TERRITORIAL_LEVEL_STATE = "N3"
 IBGE_LOCALITY_TYPE_STATES = "estados"
 API_REQUEST_DELAY_SECONDS = 0.1
+EXPORT_FORMATS = ("geojson", "topojson")
 
 class FetchDataStatesUseCase:
     """
@@ -56,4 +57,47 @@ class FetchDataStatesUseCase:
                 geojson_features_list.append(single_feature)
 
         # Step 5: Return the complete list of enriched GeoJSON features.
-        return geojson_features_list
\ No newline at end of file
+        return geojson_features_list
+
+    def export(
+        self,
+        export_format: str = "topojson",
+        tier: str = geometry_registry.DEFAULT_TIER,
+        precision: int = geometry_export.DEFAULT_PRECISION,
+        quantization: int = geometry_export.DEFAULT_QUANTIZATION
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Compact export of every state, built from the cached geometry instead of one IBGE
+        mesh request per state.
+
+        Args:
+            export_format: "topojson" (shared arcs, quantized coordinates) or "geojson"
+                (coordinates trimmed to `precision` decimal places).
+            tier: Simplification tier of the geometry (see geometry_registry.TIERS).
+
+        Returns:
+            A TopoJSON Topology or a GeoJSON FeatureCollection with 'id', 'abbreviation',
+            'name' and 'population_2021' properties.
+
+        Raises:
+            ValueError: For an unknown format or tier.
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format '{export_format}'. Available: {list(EXPORT_FORMATS)}")
+
+        states_gdf = geometry_registry.get_registry().states(tier=tier)
+        if states_gdf.empty:
+            return None
+
+        # One request for all states, keyed by the 2-digit IBGE code.
+        populations = ibge_client.fetch_populations(f"{IBGE_TERRITORIAL_LEVEL_STATE}[all]")
+
+        states_gdf["id"] = states_gdf["code_state"].astype(int).astype(str)
+        states_gdf["abbreviation"] = states_gdf["abbrev_state"]
+        states_gdf["name"] = states_gdf["name_state"]
+        states_gdf["population_2021"] = states_gdf["id"].map(populations).fillna(0).astype(int)
+
+        columns = ["id", "abbreviation", "name", "population_2021"]
+        if export_format == "topojson":
+            return geometry_export.to_topojson(states_gdf, IBGE_LOCALITY_TYPE_STATES, quantization, columns)
+        return geometry_export.to_geojson(states_gdf, precision, columns)
@@ -0,0 +1,64 @@
+from typing import Any, Dict, Optional
+
+from src.infrastructure.shared import geometry_export, geometry_registry
+
+# Largura padrão de um mapa web quando o cliente não informa a saída nem o zoom.
+DEFAULT_WIDTH_PX = 1024
+
+MEDIA_TYPES = {"geojson": "application/geo+json", "topojson": "application/json"}
+
+
+class GetGeojsonLayerUseCase:
+
+    def execute(
+        self,
+        state_abbr: str,
+        year: int,
+        layer: str,
+        tier: Optional[str] = None,
+        width_px: Optional[int] = None,
+        zoom: Optional[float] = None,
+        export_format: str = "geojson",
+        precision: Optional[int] = None,
+        quantization: int = geometry_export.DEFAULT_QUANTIZATION
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Feições de `layer` de uma UF em GeoJSON ou TopoJSON, no nível de simplificação `tier`.
+
+        Sem `tier`, o nível é escolhido pelo zoom do mapa web ou pela largura da saída
+        (`width_px`) sobre a bbox da UF. No GeoJSON, `precision` arredonda as coordenadas;
+        o TopoJSON (objeto com o nome da camada) é sempre quantizado em `quantization`.
+        Devolve None quando a UF não existe e levanta ValueError para camada, nível ou
+        formato desconhecidos.
+        """
+        if export_format not in MEDIA_TYPES:
+            raise ValueError(f"Formato '{export_format}' desconhecido. Disponíveis: {sorted(MEDIA_TYPES)}")
+
+        registry = geometry_registry.get_registry()
+        bounds = registry.state_bounds(state_abbr)
+        if bounds is None:
+            print(f"❌ Falha: Estado '{state_abbr}' não encontrado.")
+            return None
+
+        if not tier:
+            tier = geometry_registry.pick_tier(geometry_registry.expand_bounds(bounds), width_px or DEFAULT_WIDTH_PX, zoom)
+        print(f" -> [{export_format}] '{layer}' de {state_abbr.upper()} ({year}) no nível '{tier}'...")
+
+        code_state = registry.code_state(state_abbr, layer, year, tier)
+        gdf = registry.layer_for_state(layer, code_state, year, tier) if code_state is not None else None
+        if gdf is None or gdf.empty:
+            return None
+
+        if export_format == "topojson":
+            content = geometry_export.dumps(geometry_export.to_topojson(gdf, layer, quantization))
+        elif precision is not None:
+            content = geometry_export.dumps(geometry_export.to_geojson(gdf, precision))
+        else:
+            content = gdf.to_json(drop_id=True)
+
+        return {
+            "content": content,
+            "media_type": MEDIA_TYPES[export_format],
+            "tier": tier,
+            "features": len(gdf),
+        }
@@ -3,7 +3,6 @@
 import io
 from typing import Optional
 import pandas as pd
-import geobr
 
 # Importa o processador
 from src.domain.processors.birthrate_processor import BirthrateDataProcessor 
@@ -1,13 +1,16 @@
 import io
 import geopandas as gpd
-import geobr
 import matplotlib.pyplot as plt
 from typing import Optional
 import matplotlib.patches as patches 
 
 
+from src.infrastructure.shared import geometry_registry
 from src.infrastructure.shared.map_styles import STYLES, GENERAL_STYLE
 
+# Largura do PNG gerado (10 pol. a 300 dpi), usada na escolha do nível de simplificação.
+OUTPUT_WIDTH_PX = 3000
+
 class GetMapStateLayersUseCase:
 
     def execute(
@@ -23,11 +26,15 @@ class GetMapStateLayersUseCase:
 
         print(f"--- PASSO 1: CARREGANDO DADOS PARA {state_abbr.upper()} ({year}) ---")
         fig = None 
+        registry = geometry_registry.get_registry()
 
         try:
-            estado_gdf = geobr.read_state(
-                code_state=state_abbr, year=year, simplified=True
-            )
+            # O detalhe das geometrias acompanha a área visível: a UF com zoom, o Brasil sem.
+            if use_zoom:
+                tier = registry.tier_for_state(state_abbr, OUTPUT_WIDTH_PX)
+            else:
+                tier = geometry_registry.pick_tier(geometry_registry.BRAZIL_BOUNDS, OUTPUT_WIDTH_PX)
+            estado_gdf = registry.states(year, tier=tier, state_abbr=state_abbr)
         except Exception as e:
             print(f"❌ Falha: Erro ao carregar dados do estado: {e}")
             return None
@@ -41,7 +48,11 @@ class GetMapStateLayersUseCase:
         
         print(" -> [Visualização] Buscando mapa do Brasil para usar como fundo e limites...")
         try:
-            brasil_gdf = geobr.read_state(code_state='all', year=2020, simplified=True) 
+            # Com zoom, só a UF e as vizinhas visíveis entram no fundo.
+            if use_zoom:
+                brasil_gdf = registry.context_states(state_abbr, geometry_registry.CONTEXT_YEAR, tier=tier)
+            else:
+                brasil_gdf = registry.get("state", geometry_registry.CONTEXT_YEAR, tier)
         except Exception as e:
             print(f"❌ Falha: Erro ao carregar mapa do Brasil: {e}")
             return None
@@ -52,20 +63,17 @@ class GetMapStateLayersUseCase:
         municipios_gdf = None
         if show_municipalities and not plot_single_state_only:
             print("Carregando dados de municípios...")
-            municipios_br = geobr.read_municipality(year=year, simplified=True)
-            municipios_gdf = municipios_br.query("code_state == @code_state")
+            municipios_gdf = registry.layer_for_state("municipality", code_state, year, tier)
 
         immediate_gdf = None
         if show_immediate and not plot_single_state_only:
             print("Carregando dados de regiões imediatas...")
-            immediate_br = geobr.read_immediate_region(year=year, simplified=True)
-            immediate_gdf = immediate_br.query("code_state == @code_state")
+            immediate_gdf = registry.layer_for_state("immediate_region", code_state, year, tier)
 
         intermediate_gdf = None
         if show_intermediate and not plot_single_state_only:
             print("Carregando dados de regiões intermediárias...")
-            intermediate_br = geobr.read_intermediate_region(year=year, simplified=True)
-            intermediate_gdf = intermediate_br.query("code_state == @code_state")
+            intermediate_gdf = registry.layer_for_state("intermediate_region", code_state, year, tier)
 
 
         
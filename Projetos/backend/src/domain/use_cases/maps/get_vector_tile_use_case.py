@@ -0,0 +1,186 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from src.infrastructure.shared import data_version, geometry_registry, vector_tiles
+
+# Atributos de cada camada levados para o tile (os que existirem na malha do geobr).
+TILE_PROPERTIES: Dict[str, List[str]] = {
+    "state": ["code_state", "abbrev_state", "name_state"],
+    "municipality": ["code_muni", "name_muni", "code_state", "abbrev_state"],
+    "immediate_region": ["code_immediate", "name_immediate", "code_state", "abbrev_state"],
+    "intermediate_region": ["code_intermediate", "name_intermediate", "code_state", "abbrev_state"],
+}
+
+# Métricas por município que podem ser anexadas à camada de municípios.
+METRIC_BIRTHS = "total_births"
+METRIC_CASES = "total_cases"
+# Variante dos tiles só com geometria (sem métricas, não dependem da versão dos dados).
+PLAIN_VARIANT = "plain"
+
+# Contagens por município de cada (sistema, grupo, ano, UF, versão dos dados): tiles vizinhos
+# da mesma UF reaproveitam o resumo em vez de recalculá-lo.
+METRIC_CACHE_SIZE = 256
+_metric_cache: "OrderedDict[Tuple[str, str, int, str, str], Dict[int, int]]" = OrderedDict()
+_metric_lock = threading.Lock()
+
+
+def _municipality_code6(code) -> Optional[int]:
+    try:
+        # Aceita '261160', 2611606 e 2611606.0 (o geobr guarda o código como float).
+        code = int(float(str(code).strip()))
+    except ValueError:
+        return None
+    # O geobr usa 7 dígitos (com o verificador); os resumos do DATASUS, 6.
+    return code // 10 if code >= 1_000_000 else code
+
+
+class GetVectorTileUseCase:
+
+    def execute(
+        self,
+        layer: str,
+        z: int,
+        x: int,
+        y: int,
+        geometry_year: int = geometry_registry.CONTEXT_YEAR,
+        year: Optional[int] = None,
+        sinasc_group: Optional[str] = None,
+        disease_code: Optional[str] = None
+    ) -> bytes:
+        """
+        Tile MVT z/x/y de `layer`, do cache em disco ou montado na hora.
+
+        Na camada de municípios, `sinasc_group` (ex.: 'DN') anexa 'total_births' e
+        `disease_code` (ex.: 'DENG') anexa 'total_cases' do `year` pedido, pelos resumos do
+        SINASC e do SINAN. Levanta ValueError para tile, camada ou parâmetros inválidos.
+        """
+        vector_tiles.check_tile(z, x, y)
+        if layer not in TILE_PROPERTIES:
+            raise ValueError(f"Camada '{layer}' desconhecida. Disponíveis: {sorted(TILE_PROPERTIES)}")
+
+        metrics = self._metric_sources(layer, year, sinasc_group, disease_code)
+        variant = self._variant(metrics, year)
+
+        cache = vector_tiles.TileCache()
+        tile = cache.get(layer, geometry_year, variant, z, x, y)
+        if tile is not None:
+            return tile
+
+        gdf = vector_tiles.tile_features(layer, z, x, y, geometry_year)
+        cacheable = True
+        if not gdf.empty:
+            columns = [column for column in TILE_PROPERTIES[layer] if column in gdf.columns]
+            gdf = gdf[columns + [gdf.geometry.name]].copy()
+            if metrics:
+                codes = gdf["code_muni"].map(_municipality_code6)
+                states = sorted(gdf["abbrev_state"].dropna().unique())
+                for metric, (system, code) in metrics.items():
+                    values = self._metric_values(system, code, year, states)
+                    if values is None:
+                        # Resumo indisponível: o tile sai com a métrica zerada, mas não é guardado.
+                        values, cacheable = {}, False
+                    gdf[metric] = codes.map(values).fillna(0).astype(int)
+
+        tile = vector_tiles.encode_tile(gdf, layer, z, x, y)
+        if cacheable:
+            cache.put(layer, geometry_year, variant, z, x, y, tile)
+        return tile
+
+    def variant(
+        self,
+        layer: str,
+        year: Optional[int] = None,
+        sinasc_group: Optional[str] = None,
+        disease_code: Optional[str] = None
+    ) -> str:
+        """
+        Variante do tile pedido: PLAIN_VARIANT, ou as métricas com a versão dos dados de cada
+        sistema (muda a cada sincronização). Levanta ValueError para parâmetros inválidos.
+        """
+        return self._variant(self._metric_sources(layer, year, sinasc_group, disease_code), year)
+
+    @staticmethod
+    def _variant(metrics: Dict[str, Tuple[str, str]], year: Optional[int]) -> str:
+        return "-".join(
+            f"{metric}-{code}-{year}-{data_version.get_token(system)}" for metric, (system, code) in metrics.items()
+        ) or PLAIN_VARIANT
+
+    def _metric_sources(
+        self,
+        layer: str,
+        year: Optional[int],
+        sinasc_group: Optional[str],
+        disease_code: Optional[str]
+    ) -> Dict[str, Tuple[str, str]]:
+        metrics: Dict[str, Tuple[str, str]] = {}
+        if sinasc_group:
+            metrics[METRIC_BIRTHS] = ("SINASC", sinasc_group.upper())
+        if disease_code:
+            metrics[METRIC_CASES] = ("SINAN", disease_code.upper())
+        if metrics and layer != "municipality":
+            raise ValueError("Métricas só podem ser anexadas à camada 'municipality'.")
+        if metrics and year is None:
+            raise ValueError("Informe 'year' para anexar métricas do SINASC/SINAN.")
+        return metrics
+
+    def _metric_values(self, system: str, code: str, year: int, states: List[str]) -> Optional[Dict[int, int]]:
+        """
+        Contagem por município (código de 6 dígitos) das UFs pedidas, com cache por UF.
+
+        Devolve None quando o resumo falhou; nesse caso nada entra no cache.
+        """
+        token = data_version.get_token(system)
+        values: Dict[int, int] = {}
+        missing = []
+        with _metric_lock:
+            for state in states:
+                cached = _metric_cache.get((system, code, year, state, token))
+                if cached is None:
+                    missing.append(state)
+                else:
+                    _metric_cache.move_to_end((system, code, year, state, token))
+                    values.update(cached)
+
+        if missing:
+            fetched = self._fetch_counts(system, code, year, missing)
+            if fetched is None:
+                return None
+            registry = geometry_registry.get_registry()
+            with _metric_lock:
+                for state in missing:
+                    code_state = registry.code_state(state)
+                    state_values = {mun: count for mun, count in fetched.items() if mun // 10_000 == code_state}
+                    _metric_cache[(system, code, year, state, token)] = state_values
+                    values.update(state_values)
+                while len(_metric_cache) > METRIC_CACHE_SIZE:
+                    _metric_cache.popitem(last=False)
+        return values
+
+    def _fetch_counts(self, system: str, code: str, year: int, states: List[str]) -> Optional[Dict[int, int]]:
+        """
+        Contagens do SINASC/SINAN por município. Sem registros (grupo, agravo ou ano sem dados),
+        devolve {} e o tile sai com a métrica zerada; None só quando o resumo do SINAN falhou.
+        """
+        # Imports locais: os resumos carregam o PySUS, desnecessário para tiles só com geometria.
+        counts: Dict[int, int] = {}
+        if system == "SINASC":
+            from src.domain.use_cases.pysus.sinasc.get_summary_sinasc_use_case import GetSummarySinascUseCase
+
+            summary = GetSummarySinascUseCase().execute(group_code=code, years=[year], states=states).get("summary", {})
+            for mun_code, details in summary.items():
+                mun = _municipality_code6(mun_code)
+                if mun is not None:
+                    counts[mun] = counts.get(mun, 0) + int(details.get("total", 0))
+        else:
+            from src.domain.use_cases.pysus.sinan.fetch_data_sinan_use_case import FetchDataSinanUseCase
+
+            result = FetchDataSinanUseCase().execute(disease_code=code, years=[year], states=states)
+            if result is None:
+                print(f" -> [Tiles] Resumo do SINAN indisponível ({code}, {year}); casos zerados neste tile.")
+                return None
+            for record in result.get("summary", []):
+                mun = _municipality_code6(record.get("municipality_code"))
+                if mun is not None:
+                    counts[mun] = counts.get(mun, 0) + int(record.get("total_cases", 0))
+        return counts
@@ -0,0 +1,234 @@
+# src/domain/use-cases/pysus/aggregate/aggregate-pysus.use-case.py
+"""
+Use case that answers any group-by / filter / measure summary of a PySUS system
+through the shared streaming summary engine.
+
+A new analysis is a new entry in SYSTEM_SOURCES, not a new use case.
+"""
+from typing import Any, Dict, List, Optional
+
+from src.domain.use_cases.pysus.cubes.build_aggregate_cube_use_case import CUBE_SOURCES
+from src.domain.use_cases.pysus.sim.fetch_data_sim_use_case import MUNICIPALITY_COLUMN as SIM_MUNICIPALITY_COLUMN
+from src.domain.use_cases.pysus.sinan.fetch_data_sinan_use_case import MUNICIPALITY_COLUMN_CANDIDATES as SINAN_MUNICIPALITY_COLUMNS
+from src.infrastructure.shared import aggregate_cube, aggregation, data_utils, datasus_store, memory_budget, parquet_reader, pysus_catalog, summary_engine
+from src.infrastructure.shared.summary_engine import dimension
+
+
+# Dimensões de cada sistema. 'states_dimension' restringe os registros às UFs pedidas pelo
+# município (como nos resumos antigos); SIH e SIA já filtram pela UF do arquivo.
+SYSTEM_SOURCES: Dict[str, Dict[str, Any]] = {
+    "SIM": {
+        "dimensions": {
+            "municipality": dimension("municipality", SIM_MUNICIPALITY_COLUMN),
+            "residence": dimension("municipality", "CODMUNRES"),
+            "sex": dimension("text", "SEXO"),
+            "race": dimension("text", "RACACOR"),
+            "place_of_death": dimension("text", "LOCOCOR"),
+            "underlying_cause": dimension("text", "CAUSABAS"),
+            # Causa básica pela CID-10 e faixa etária da IDADE codificada, por tabelas pré-calculadas.
+            "cause_chapter": dimension("icd10_chapter", "CAUSABAS"),
+            "cause_group": dimension("icd10_group", "CAUSABAS"),
+            "cause_category": dimension("icd10_category", "CAUSABAS"),
+            "age_band": dimension("sim_age_band", "IDADE"),
+            # Séries temporais pela data do óbito (DDMMAAAA).
+            "year": dimension("date_year", "DTOBITO"),
+            "month": dimension("date_month", "DTOBITO"),
+        },
+        "states_dimension": "municipality", "default_measure": None, "monthly_files": False,
+    },
+    "SINAN": {
+        "dimensions": {
+            "municipality": dimension("municipality", *SINAN_MUNICIPALITY_COLUMNS),
+            "sex": dimension("text", "CS_SEXO"),
+            "race": dimension("text", "CS_RACA"),
+            "classification": dimension("text", "CLASSI_FIN"),
+            "evolution": dimension("text", "EVOLUCAO"),
+            "age_band": dimension("sinan_age_band", "NU_IDADE_N"),
+            # Séries temporais pela notificação: data (AAAAMMDD ou AAAA-MM-DD) e semana epidemiológica (AAAASS).
+            "year": dimension("date_year", "DT_NOTIFIC", format="YMD"),
+            "month": dimension("date_month", "DT_NOTIFIC", format="YMD"),
+            "epi_week": dimension("competence", "SEM_NOT"),
+        },
+        "states_dimension": "municipality", "default_measure": None, "monthly_files": False,
+    },
+    "SINASC": {
+        "dimensions": {
+            "municipality": dimension("municipality", "CODMUNNASC"),
+            "residence": dimension("municipality", "CODMUNRES"),
+            "sex": dimension("text", "SEXO"),
+            "age_group": dimension("age_group", "IDADEMAE"),
+            "race": dimension("text", "RACACOR"),
+            "delivery": dimension("text", "PARTO"),
+            # Séries temporais pela data de nascimento (DDMMAAAA).
+            "year": dimension("date_year", "DTNASC"),
+            "month": dimension("date_month", "DTNASC"),
+        },
+        "states_dimension": "municipality", "default_measure": None, "monthly_files": False,
+    },
+    "CNES": {
+        "dimensions": {
+            "municipality": dimension("municipality", "CODUFMUN"),
+            "month": dimension("competence", "COMPETEN"),
+            "bed_type": dimension("text", "CODLEITO"),
+            "equipment": dimension("text", "CODEQUIP"),
+            "occupation": dimension("text", "CBO"),
+        },
+        "states_dimension": "municipality", "default_measure": None, "monthly_files": True,
+    },
+    "SIH": {
+        "dimensions": {
+            "municipality": dimension("municipality", "MUNIC_RES", "MUNIC_MOV"),
+            "month": dimension("year_month", "ANO_CMPT", "MES_CMPT"),
+            "procedure": dimension("text", "PROC_REA"),
+            "diagnosis": dimension("text", "DIAG_PRINC"),
+            "sex": dimension("text", "SEXO"),
+        },
+        "states_dimension": None, "default_measure": "VAL_TOT", "monthly_files": True,
+    },
+    "SIA": {
+        "dimensions": {
+            "municipality": dimension("municipality", "PA_UFMUN", "PA_MUNPCN"),
+            "month": dimension("competence", "PA_CMP"),
+            "procedure": dimension("text", "PA_PROC_ID"),
+            "diagnosis": dimension("text", "PA_CIDPRI"),
+            "sex": dimension("text", "PA_SEXO"),
+        },
+        "states_dimension": None, "default_measure": "PA_VALAPR", "monthly_files": True,
+    },
+}
+DEFAULT_GROUP_BY = ["municipality"]
+
+# Dimensões que o cubo de contagem guarda, com o nome da coluna no cubo. A faixa etária
+# do cubo é a 'age_group' no SINASC e a 'age_band' no SIM e no SINAN (ver CUBE_SOURCES).
+CUBE_DIMENSIONS = {
+    "municipality": aggregate_cube.MUNICIPALITY,
+    "sex": aggregate_cube.SEX,
+    "age_group": aggregate_cube.AGE_GROUP,
+    "age_band": aggregate_cube.AGE_GROUP,
+}
+
+
+class AggregatePysusUseCase:
+
+    def execute(
+        self,
+        system: str,
+        group_code: str,
+        years: List[int],
+        states: Optional[List[str]] = None,
+        months: Optional[List[int]] = None,
+        group_by: Optional[List[str]] = None,
+        filters: Optional[List[str]] = None,
+        measure: Optional[str] = None,
+        aggregations: Optional[List[str]] = None,
+        rename: Optional[Dict[str, str]] = None,
+        count_name: str = aggregation.COUNT_COLUMN
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Agrega os arquivos do sistema pelas dimensões pedidas e devolve só o resumo.
+
+        `filters` usa o formato 'dimensão=valor1,valor2'; `rename` e `count_name` permitem
+        manter os nomes de campo de um resumo existente (ex.: 'total_deaths' no SIM).
+        Levanta ValueError para sistemas, dimensões, filtros ou medidas inválidos e
+        memory_budget.MemoryBudgetError quando a requisição não cabe na memória;
+        devolve None se nada foi encontrado.
+        """
+        system = system.upper()
+        source = SYSTEM_SOURCES.get(system)
+        if source is None:
+            raise ValueError(f"Sistema '{system}' desconhecido. Disponíveis: {sorted(SYSTEM_SOURCES)}")
+
+        dimensions = source["dimensions"]
+        group_by = group_by or DEFAULT_GROUP_BY
+        measure = measure or source["default_measure"]
+        aggregations = aggregations or (list(aggregation.MEASURES) if measure else ["count"])
+        parsed_filters = summary_engine.parse_filters(filters, dimensions)
+        summary_engine.validate_request(dimensions, group_by, aggregations, parsed_filters)
+        if months and not source["monthly_files"]:
+            raise ValueError(f"Os arquivos do {system} são anuais; o filtro 'months' não se aplica.")
+
+        needs_value = any(agg in ("sum", "mean") for agg in aggregations)
+        if needs_value and not measure:
+            raise ValueError(f"As medidas 'sum' e 'mean' exigem o parâmetro 'measure' no {system}.")
+        engine = summary_engine.SummaryEngine(
+            dimensions, group_by, parsed_filters,
+            measure=measure if needs_value else None,
+            states=states,
+            states_dimension=source["states_dimension"],
+            budget=memory_budget.MemoryBudget()
+        )
+
+        try:
+            # Contagens por município/sexo/faixa etária saem do cubo, quando existe.
+            cube_columns = self._add_from_cube(engine, system, group_code, years, states, months, aggregations)
+            if cube_columns is not None:
+                engine.column_names = cube_columns
+            else:
+                print(f"Buscando dados no {system} para o grupo '{group_code}' para agregar...")
+                database = pysus_catalog.get_database(system)
+                files = pysus_catalog.list_files(database, system, group_code, years, states, months)
+                if not files:
+                    print(f"Nenhum arquivo do {system} encontrado para os parâmetros.")
+                    return None
+
+                download_paths = datasus_store.fetch_files(database, system, group_code, files)
+                if not download_paths:
+                    return None
+                engine.add_files(parquet_reader.list_parquet_files(download_paths))
+
+            summary_list = engine.to_records(aggregations, rename=rename, count_name=count_name)
+            print(f"Resumo do {system} gerado com {len(summary_list)} grupos.")
+
+            return {
+                "summary": summary_list,
+                "group_by": group_by,
+                "filters": parsed_filters,
+                "measure": measure if needs_value else None,
+                "total_records": engine.total(),
+                "columns": engine.column_names or []
+            }
+
+        except (memory_budget.MemoryBudgetError, summary_engine.InvalidMeasureError, datasus_store.IncompleteDownloadError):
+            raise
+
+        except Exception as e:
+            print(f"Ocorreu um erro durante a agregação de dados do {system}: {e}")
+            return None
+
+    def _add_from_cube(
+        self,
+        engine: summary_engine.SummaryEngine,
+        system: str,
+        group_code: str,
+        years: List[int],
+        states: Optional[List[str]],
+        months: Optional[List[int]],
+        aggregations: List[str]
+    ) -> Optional[List[str]]:
+        """Soma o cubo no motor quando ele responde à pergunta; devolve as colunas de origem ou None."""
+        cube_source = CUBE_SOURCES.get(system)
+        requested = set(engine.group_by) | set(engine.filters)
+        if (
+            cube_source is None
+            # O cubo do SINASC descarta registros sem sexo/idade da mãe; o motor não.
+            or cube_source["drop_incomplete"]
+            or list(aggregations) != ["count"]
+            or months
+            or not requested <= set(CUBE_DIMENSIONS)
+        ):
+            return None
+
+        # Sexo e faixa etária só saem de cubos no formato atual (ver aggregate_cube.CUBE_FORMAT).
+        min_format = aggregate_cube.CUBE_FORMAT if requested - {"municipality"} else 1
+        cube = aggregate_cube.lookup(system, group_code, years, states, min_format=min_format)
+        if cube is None:
+            return None
+        cube_counts, cube_columns = cube
+        cube_counts = data_utils.filter_table_by_states(cube_counts, states, aggregate_cube.MUNICIPALITY)
+
+        names = sorted(requested, key=list(CUBE_DIMENSIONS).index)
+        counts = aggregation.sum_counts(cube_counts, [CUBE_DIMENSIONS[name] for name in names])
+        if counts is not None:
+            counts = counts.rename_columns(names + [aggregation.COUNT_COLUMN])
+        engine.add_counts(counts)
+        return cube_columns
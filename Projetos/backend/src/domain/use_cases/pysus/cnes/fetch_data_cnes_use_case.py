@@ -1,49 +1,129 @@
-import pandas as pd
-from pysus.ftp.databases import CNES
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from typing import List, Optional, Dict
 
+from src.infrastructure.shared import aggregate_cube, aggregation, data_utils, datasus_store, memory_budget, parquet_reader, pysus_catalog
+
+# Coluna de município, presente em todos os grupos do CNES (ST, LT, EQ, PF...).
+MUNICIPALITY_COLUMN = 'CODUFMUN'
+MUNICIPALITY_KEY = 'municipality_code'
+# Competência (AAAAMM) do registro, agrupada como inteiro.
+COMPETENCE_COLUMN = 'COMPETEN'
+
 class FetchDataCnesUseCase:
     """
     Caso de uso para buscar dados do CNES e já retornar um resumo agregado por município.
+
+    Sem `columns`, conta os registros por município (o resumo de estabelecimentos do grupo ST).
+    Com `columns` (ex.: ['CODLEITO', 'COMPETEN'] no LT, ['CODEQUIP'] no EQ, ['CBO'] no PF),
+    agrupa por município × essas colunas, e `measure` soma uma coluna numérica (ex.: QT_EXIST).
     """
-    def execute(self, group_code: str, years: List[int], states: Optional[List[str]] = None, columns: Optional[List[str]] = None) -> Optional[List[Dict]]:
+    def execute(
+        self,
+        group_code: str,
+        years: List[int],
+        states: Optional[List[str]] = None,
+        columns: Optional[List[str]] = None,
+        measure: Optional[str] = None
+    ) -> Optional[List[Dict]]:
         """
         Executa a busca de dados e o processamento do resumo.
 
         Retorna:
-            Uma lista de dicionários com o total de registros por município.
+            Uma lista de dicionários com o total de registros (e a soma de `measure`) por grupo.
+        Levanta ValueError se alguma coluna pedida não existir nos arquivos ou se `measure`
+        também for uma coluna do agrupamento.
         """
+        columns = [col.upper() for col in columns or [] if col.upper() != MUNICIPALITY_COLUMN]
+        measure = measure.upper() if measure else None
+        if measure and measure in [MUNICIPALITY_COLUMN] + columns:
+            # A soma seria gravada por cima da chave do agrupamento.
+            raise ValueError(f"A coluna '{measure}' não pode ser ao mesmo tempo agrupamento e medida.")
+
         try:
+            # Anos já consolidados no cubo são respondidos sem tocar nos microdados.
+            if not columns and not measure:
+                cube = aggregate_cube.lookup("CNES", group_code, years, states)
+                if cube is not None:
+                    return self._summary_from_cube(cube[0])
+
             print(f"Buscando dados no CNES para o grupo '{group_code}' para resumir...")
-            cnes_db = CNES().load()
+            cnes_db = pysus_catalog.get_database("CNES")
             files_to_download = cnes_db.get_files(group=group_code, uf=states, year=years)
 
             if not files_to_download:
                 print("Nenhum arquivo do CNES encontrado.")
                 return None
 
-            downloaded_dataset = cnes_db.download(files_to_download)
-            if downloaded_dataset is None:
+            download_paths = datasus_store.fetch_files(cnes_db, "CNES", group_code, files_to_download)
+            if not download_paths:
                 return None
-            
-            coluna_municipio = 'CODUFMUN' # Exemplo para o grupo 'ST' (Estabelecimentos)
-            dataframe = downloaded_dataset.to_dataframe(columns=[coluna_municipio])
-            
-            if dataframe.empty:
+
+            # --- O CÁLCULO DO RESUMO É FEITO AQUI DENTRO, ROW GROUP A ROW GROUP ---
+            print(f"Calculando resumo por município × {columns or '-'}...")
+            keys = [MUNICIPALITY_COLUMN] + columns
+            read_columns = keys + ([measure] if measure else [])
+            budget = memory_budget.MemoryBudget()
+            aggregator = aggregation.GroupAggregator(
+                keys, value_column=measure, memory_limit_bytes=budget.state_bytes, spill_dir=memory_budget.SPILL_DIR
+            )
+            parquet_files = parquet_reader.list_parquet_files(download_paths)
+            for file_path in parquet_files:
+                schema_names = pq.ParquetFile(file_path).schema_arrow.names
+                missing_columns = [col for col in read_columns if col not in schema_names]
+                if missing_columns:
+                    raise ValueError(
+                        f"Colunas {missing_columns} não existem no grupo '{group_code}'. Disponíveis: {schema_names}"
+                    )
+
+            with budget.reserve(budget.estimate(parquet_files, read_columns)):
+                for file_path in parquet_files:
+                    parquet_file = pq.ParquetFile(file_path)
+                    # Apenas as colunas do agrupamento e da soma são decodificadas, em lotes dentro do orçamento.
+                    batch_rows = budget.batch_rows(parquet_file, read_columns, file_path.name)
+                    for chunk_table in parquet_reader.iter_row_groups(parquet_file, read_columns, batch_rows=batch_rows):
+                        aggregator.update(self._prepare_chunk(chunk_table, columns, measure))
+
+            if not aggregator:
                 return None
 
-            # --- O CÁLCULO DO RESUMO É FEITO AQUI DENTRO ---
-            print("Calculando resumo por município...")
-            summary_df = dataframe.groupby(coluna_municipio).size().reset_index(name='total')
-            
             # Renomeia as colunas para um formato padronizado
-            summary_df.rename(columns={coluna_municipio: 'municipality_code'}, inplace=True)
+            summary_list = aggregator.to_records(
+                measures=("count", "sum"),
+                rename={MUNICIPALITY_COLUMN: MUNICIPALITY_KEY},
+                key_types={MUNICIPALITY_COLUMN: pa.string()},
+                count_name='total'
+            )
             
-            print(f"Resumo do CNES gerado para {len(summary_df)} municípios.")
+            print(f"Resumo do CNES gerado com {len(summary_list)} grupos.")
             
             # Retornamos apenas a lista com o resumo, e não o DataFrame gigante
-            return summary_df.to_dict(orient='records')
-            
+            return summary_list
+
+        except (ValueError, datasus_store.IncompleteDownloadError):
+            raise
+
         except Exception as e:
             print(f"Ocorreu um erro durante a busca de dados do CNES: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    def _prepare_chunk(self, chunk_table: pa.Table, columns: List[str], measure: Optional[str]) -> pa.Table:
+        """Município em int32, competência em AAAAMM inteiro, códigos de tipo em texto."""
+        prepared = {MUNICIPALITY_COLUMN: data_utils.municipality_codes_as_int(chunk_table.column(MUNICIPALITY_COLUMN))}
+        for col in columns:
+            if col == COMPETENCE_COLUMN:
+                prepared[col] = pc.cast(data_utils.numeric_values(chunk_table.column(col)), pa.int32())
+            else:
+                prepared[col] = pc.utf8_trim_whitespace(pc.cast(chunk_table.column(col), pa.string()))
+        if measure:
+            prepared[measure] = data_utils.numeric_values(chunk_table.column(measure))
+        return pa.table(prepared)
+
+    def _summary_from_cube(self, cube_counts: pa.Table) -> Optional[List[Dict]]:
+        """Mesmo resumo do caminho bruto, somando as contagens do cubo por município."""
+        establishment_counter = aggregation.GroupCounter([aggregate_cube.MUNICIPALITY])
+        establishment_counter.add_counts(aggregation.sum_counts(cube_counts, [aggregate_cube.MUNICIPALITY]))
+        if not establishment_counter:
+            return None
+        return establishment_counter.to_records(count_name='total', key_types={aggregate_cube.MUNICIPALITY: pa.string()})
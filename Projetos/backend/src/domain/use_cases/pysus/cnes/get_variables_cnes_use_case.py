@@ -2,15 +2,16 @@
 """
 Use case to inspect the CNES data source and list its available data groups.
 """
-from pysus.ftp.databases import CNES
 from typing import List, Dict, Optional
 
+from src.infrastructure.shared import pysus_catalog
+
 class GetVariablesCnesUseCase:
   
     def execute(self) -> Optional[List[Dict[str, str]]]:
         
         try:
-            cnes_db = CNES().load()
+            cnes_db = pysus_catalog.get_database("CNES")
 
             if not cnes_db.groups:
                 print("Could not load CNES groups from PySUS.") # Log de erro
@@ -0,0 +1,234 @@
+# src/domain/use-cases/pysus/cubes/build-aggregate-cube.use-case.py
+"""
+Use case that materializes the count cubes read by the PySUS summary use cases.
+"""
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.domain.use_cases.pysus.sim.fetch_data_sim_use_case import MUNICIPALITY_COLUMN as SIM_MUNICIPALITY_COLUMN
+from src.domain.use_cases.pysus.sinan.fetch_data_sinan_use_case import MUNICIPALITY_COLUMN_CANDIDATES as SINAN_MUNICIPALITY_COLUMNS
+from src.infrastructure.shared import aggregate_cube, aggregation, data_utils, datasus_store, parquet_reader, pysus_catalog, summary_engine
+from src.infrastructure.shared.summary_engine import dimension
+
+
+# Como cada sistema é lido. As regras de filtragem são as mesmas dos casos de uso de resumo,
+# para que o cubo e os arquivos brutos deem exatamente o mesmo total.
+# 'sex', 'age' e 'date' são dimensões do summary_engine, calculadas registro a registro como no
+# motor de resumo (o sexo sem espaços nas pontas e nulo quando falta). Os arquivos do SIM, SINAN
+# e SINASC são anuais, então o mês sai da data do óbito/notificação/nascimento. Sem 'date'
+# (CNES, arquivos mensais), o mês vem do describe() do arquivo.
+CUBE_SOURCES: Dict[str, Dict[str, Any]] = {
+    "SIM": {
+        "group_param": "group", "national": False,
+        "municipality": [SIM_MUNICIPALITY_COLUMN], "sex": dimension("text", "SEXO"), "drop_incomplete": False,
+        "age": dimension("sim_age_band", "IDADE"), "date": dimension("date_month", "DTOBITO"),
+    },
+    "SINAN": {
+        # Os arquivos do SINAN são nacionais: não há UF no arquivo, só no município.
+        "group_param": "dis_code", "national": True,
+        "municipality": SINAN_MUNICIPALITY_COLUMNS, "sex": dimension("text", "CS_SEXO"), "drop_incomplete": False,
+        "age": dimension("sinan_age_band", "NU_IDADE_N"), "date": dimension("date_month", "DT_NOTIFIC", format="YMD"),
+    },
+    "SINASC": {
+        # O resumo do SINASC descarta registros sem sexo ou idade da mãe; o cubo também.
+        "group_param": "group", "national": False,
+        "municipality": ["CODMUNNASC"], "sex": dimension("text", "SEXO"), "drop_incomplete": True,
+        "age": dimension("age_group", "IDADEMAE"), "date": dimension("date_month", "DTNASC"),
+    },
+    "CNES": {
+        "group_param": "group", "national": False,
+        "municipality": ["CODUFMUN"], "sex": None, "drop_incomplete": False,
+        "age": None, "date": None,
+    },
+}
+
+CUBE_KEYS = [aggregate_cube.MONTH, aggregate_cube.MUNICIPALITY, aggregate_cube.SEX, aggregate_cube.AGE_GROUP]
+# O GroupCounter descarta chaves nulas, mas o motor de resumo conta um registro sem município
+# ou sem sexo quando a pergunta não usa essa dimensão. Os nulos são contados com estes marcadores
+# e voltam a ser nulos antes da gravação: o código de município nunca é negativo, e o sexo já vem
+# sem espaços nas pontas.
+NULL_KEY_MARKERS = {aggregate_cube.MUNICIPALITY: -1, aggregate_cube.SEX: " "}
+
+MONTH_NAMES = {
+    "janeiro": 1, "fevereiro": 2, "março": 3, "marco": 3, "abril": 4, "maio": 5, "junho": 6,
+    "julho": 7, "agosto": 8, "setembro": 9, "outubro": 10, "novembro": 11, "dezembro": 12,
+}
+
+
+def _month_of(description: Dict[str, Any]) -> int:
+    """Mês do arquivo pelo describe() do PySUS (número ou nome); 0 para arquivos anuais."""
+    month = description.get("month")
+    if month is None or month == "":
+        return 0
+    try:
+        return int(month)
+    except (TypeError, ValueError):
+        return MONTH_NAMES.get(str(month).strip().lower(), 0)
+
+
+def _constant_column(value: Any, length: int, data_type: pa.DataType) -> pa.Array:
+    return pa.array([value] * length, type=data_type)
+
+
+class BuildAggregateCubeUseCase:
+
+    def execute(self, system: str, group_code: str, years: List[int], states: Optional[List[str]] = None) -> List[str]:
+        """
+        Builds (or rebuilds) one cube file per year and returns the paths written.
+
+        A year whose files could not all be downloaded is skipped, so a cube is never partial.
+        """
+        system = system.upper()
+        spec = CUBE_SOURCES.get(system)
+        if spec is None:
+            raise ValueError(f"Sistema '{system}' não tem cubo. Disponíveis: {sorted(CUBE_SOURCES)}")
+
+        database = pysus_catalog.get_database(system)
+        store = datasus_store.get_store()
+        written: List[str] = []
+
+        for year in years:
+            print(f"--- [Cubo] {system}/{group_code} {year} ---")
+            params: Dict[str, Any] = {spec["group_param"]: group_code, "year": year}
+            if states and not spec["national"]:
+                params["uf"] = states
+            files = database.get_files(**params) or []
+
+            try:
+                datasus_store.fetch_files(database, system, group_code, files)
+            except datasus_store.IncompleteDownloadError as e:
+                print(f" -> [Cubo] {e}. O ano {year} não será gravado.")
+                continue
+
+            partials: List[pa.Table] = []
+            source_keys: List[str] = []
+            source_columns: Optional[List[str]] = None
+            complete = True
+            for file in files:
+                key = store.build_key(database, system, group_code, file)
+                path = store.get_path(key)
+                if path is None:
+                    print(f" -> [Cubo] Arquivo indisponível: {key}. O ano {year} não será gravado.")
+                    complete = False
+                    break
+
+                try:
+                    description = database.describe(file) or {}
+                except Exception:
+                    description = {}
+                uf = aggregate_cube.NOT_AVAILABLE if spec["national"] else str(description.get("uf") or "").upper()
+
+                file_counts, file_columns = self._count_file(path, spec, _month_of(description))
+                source_keys.append(key)
+                if source_columns is None and file_columns:
+                    source_columns = file_columns
+                if file_counts is None:
+                    continue
+
+                length = file_counts.num_rows
+                partials.append(file_counts
+                    .append_column(aggregate_cube.UF, _constant_column(uf, length, pa.string()))
+                    .append_column(aggregate_cube.YEAR, _constant_column(year, length, pa.int16())))
+
+            if not complete:
+                continue
+
+            counts = pa.concat_tables(partials) if partials else aggregate_cube.CUBE_SCHEMA.empty_table()
+            path = aggregate_cube.write_cube(
+                system, group_code, year, counts,
+                states=None if spec["national"] else states,
+                source_columns=source_columns,
+                source_keys=source_keys
+            )
+            print(f" -> [Cubo] {path} gravado ({counts.num_rows} linhas).")
+            written.append(str(path))
+
+        return written
+
+    def _count_file(self, path: Any, spec: Dict[str, Any], file_month: int) -> Tuple[Optional[pa.Table], Optional[List[str]]]:
+        """Counts one downloaded file by month × municipality × sex × age group, row group by row group."""
+        counter = aggregation.GroupCounter(CUBE_KEYS)
+        source_columns: Optional[List[str]] = None
+
+        for file_path in parquet_reader.list_parquet_files([path]):
+            parquet_file = pq.ParquetFile(file_path)
+            schema_names = parquet_file.schema_arrow.names
+            if source_columns is None:
+                source_columns = list(schema_names)
+
+            municipality_col = parquet_reader.resolve_column(schema_names, spec["municipality"])
+            if not municipality_col:
+                print(f" -> [Cubo] Nenhuma coluna de município em {file_path.name}")
+                continue
+
+            # Sexo, idade e data ausentes no arquivo viram nulo, "Ignored" e mês 0.
+            sex_cols = summary_engine.resolve_dimension(schema_names, spec["sex"]) if spec["sex"] else None
+            age_cols = summary_engine.resolve_dimension(schema_names, spec["age"]) if spec["age"] else None
+            date_cols = summary_engine.resolve_dimension(schema_names, spec["date"]) if spec["date"] else None
+
+            columns = [municipality_col] + (sex_cols or []) + (age_cols or []) + (date_cols or [])
+            for chunk_table in parquet_reader.iter_row_groups(parquet_file, list(dict.fromkeys(columns))):
+                counter.update(self._prepare_chunk(chunk_table, spec, municipality_col, sex_cols, age_cols, date_cols, file_month))
+
+        counts = counter.result()
+        if counts is not None:
+            for key, marker in NULL_KEY_MARKERS.items():
+                values = counts.column(key)
+                counts = counts.set_column(
+                    counts.schema.get_field_index(key), key,
+                    pc.if_else(pc.equal(values, marker), pa.scalar(None, values.type), values)
+                )
+        return counts, source_columns
+
+    def _prepare_chunk(
+        self,
+        chunk_table: pa.Table,
+        spec: Dict[str, Any],
+        municipality_col: str,
+        sex_cols: Optional[List[str]],
+        age_cols: Optional[List[str]],
+        date_cols: Optional[List[str]],
+        file_month: int
+    ) -> pa.Table:
+        length = chunk_table.num_rows
+        municipalities = data_utils.municipality_codes_as_int(chunk_table.column(municipality_col))
+        sexes = (
+            summary_engine.dimension_values(chunk_table, spec["sex"], sex_cols)
+            if sex_cols else pa.chunked_array([pa.nulls(length, pa.string())])
+        )
+
+        if spec["drop_incomplete"]:
+            # Só município, sexo e idade definem um registro completo; a data não.
+            ages = chunk_table.column(age_cols[0]) if age_cols else pa.nulls(length, pa.string())
+            complete = pc.and_(pc.and_(pc.is_valid(municipalities), pc.is_valid(sexes)), pc.is_valid(ages))
+            chunk_table = chunk_table.filter(complete)
+            municipalities, sexes = municipalities.filter(complete), sexes.filter(complete)
+            length = chunk_table.num_rows
+
+        if age_cols:
+            age_groups = summary_engine.dimension_values(chunk_table, spec["age"], age_cols)
+        elif spec["age"]:
+            age_groups = _constant_column(data_utils.AGE_GROUP_IGNORED, length, pa.string())
+        else:
+            age_groups = _constant_column(aggregate_cube.NOT_AVAILABLE, length, pa.string())
+
+        if date_cols:
+            # AAAAMM -> mês; data inválida continua DATE_IGNORED (0), o mês "desconhecido" do cubo.
+            year_months = summary_engine.dimension_values(chunk_table, spec["date"], date_cols)
+            months = pc.cast(pc.subtract(year_months, pc.multiply(pc.divide(year_months, 100), 100)), pa.int8())
+        elif spec["date"]:
+            months = _constant_column(data_utils.DATE_IGNORED, length, pa.int8())
+        else:
+            months = _constant_column(file_month, length, pa.int8())
+
+        return pa.table({
+            aggregate_cube.MONTH: months,
+            aggregate_cube.MUNICIPALITY: municipalities.fill_null(NULL_KEY_MARKERS[aggregate_cube.MUNICIPALITY]),
+            aggregate_cube.SEX: (
+                sexes.fill_null(NULL_KEY_MARKERS[aggregate_cube.SEX]) if spec["sex"]
+                else _constant_column(aggregate_cube.NOT_AVAILABLE, length, pa.string())
+            ),
+            aggregate_cube.AGE_GROUP: age_groups,
+        })
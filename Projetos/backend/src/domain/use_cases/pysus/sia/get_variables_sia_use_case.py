@@ -2,14 +2,15 @@
 """
 Use case to inspect the SIA data source and list its available data groups.
 """
-from pysus.ftp.databases import SIA
 from typing import List, Dict, Optional
 
+from src.infrastructure.shared import pysus_catalog
+
 class GetVariablesSiaUseCase:
     def execute(self) -> Optional[List[Dict[str, str]]]:
 
         try:
-            sia_db = SIA().load()
+            sia_db = pysus_catalog.get_database("SIA")
 
             if not sia_db.groups:
                 print("Could not load SIA groups from PySUS.") # Log de erro
@@ -1,16 +1,22 @@
 # src/domain/use_cases/pysus/sih/fetch_data_sih_use_case.py
 
-import pandas as pd
-from pysus.ftp.databases import SIH
+from pathlib import Path
 from typing import List, Optional
 
+from src.infrastructure.shared import datasus_store, parquet_reader, pysus_catalog
+
 class FetchDataSihUseCase:
  
-    def execute(self, group_code: str, years: List[int], states: Optional[List[str]] = None, months: Optional[List[int]] = None) -> Optional[pd.DataFrame]:
+    def execute(self, group_code: str, years: List[int], states: Optional[List[str]] = None, months: Optional[List[int]] = None) -> Optional[List[Path]]:
+        """
+        Baixa (ou reaproveita) os arquivos do SIH e devolve as partes parquet, sem carregá-las.
+
+        Os microdados podem ter milhões de linhas: quem consome lê as partes em streaming.
+        """
 
         try:
             print(f"Buscando dados no SIH para o grupo '{group_code}'...")
-            sih_db = SIH().load()
+            sih_db = pysus_catalog.get_database("SIH")
             
             files_to_download = sih_db.get_files(
                 group=group_code, 
@@ -23,15 +29,18 @@ class FetchDataSihUseCase:
                 print("Nenhum arquivo do SIH encontrado para os parâmetros.")
                 return None
 
-            downloaded_dataset = sih_db.download(files_to_download)
+            download_paths = datasus_store.fetch_files(sih_db, "SIH", group_code, files_to_download)
             
-            if downloaded_dataset is None:
+            if not download_paths:
                 return None
 
-            dataframe = downloaded_dataset.to_dataframe()
-            print(f"Processo do SIH concluído! {len(dataframe)} registros carregados.")
-            return dataframe
+            parquet_files = parquet_reader.list_parquet_files(download_paths)
+            print(f"Processo do SIH concluído! {len(parquet_files)} arquivo(s) parquet disponível(is).")
+            return parquet_files or None
             
+        except datasus_store.IncompleteDownloadError:
+            raise
+
         except Exception as e:
             print(f"Ocorreu um erro durante a busca de dados do SIH: {e}")
             return None
\ No newline at end of file
@@ -0,0 +1,44 @@
+# src/domain/use-cases/pysus/sih/get-summary-sih.use-case.py
+"""
+Use case to summarize SIH hospitalizations (count, sum and mean of a value column)
+without returning the microdata.
+
+The aggregation itself runs on the shared summary engine (see AggregatePysusUseCase).
+"""
+from typing import List, Dict, Any, Optional
+
+from src.domain.use_cases.pysus.aggregate.aggregate_pysus_use_case import SYSTEM_SOURCES, AggregatePysusUseCase
+
+DIMENSION_COLUMNS: Dict[str, List[str]] = {
+    name: spec["columns"] for name, spec in SYSTEM_SOURCES["SIH"]["dimensions"].items()
+}
+DEFAULT_GROUP_BY = ["municipality"]
+DEFAULT_MEASURE = "VAL_TOT"
+
+class GetSummarySihUseCase:
+
+    def execute(
+        self,
+        group_code: str,
+        years: List[int],
+        states: Optional[List[str]] = None,
+        months: Optional[List[int]] = None,
+        group_by: Optional[List[str]] = None,
+        measure: str = DEFAULT_MEASURE,
+        aggregations: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Agrega os arquivos do SIH row group a row group e devolve só o resumo.
+
+        Levanta ValueError para dimensões ou medidas desconhecidas.
+        """
+        return AggregatePysusUseCase().execute(
+            "SIH",
+            group_code,
+            years,
+            states=states,
+            months=months,
+            group_by=group_by or DEFAULT_GROUP_BY,
+            measure=measure,
+            aggregations=aggregations
+        )
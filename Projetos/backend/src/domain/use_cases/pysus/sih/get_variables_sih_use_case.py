@@ -2,15 +2,16 @@
 """
 Use case to inspect the SIH data source and list its available data groups.
 """
-from pysus.ftp.databases import SIH
 from typing import List, Dict, Optional
 
+from src.infrastructure.shared import pysus_catalog
+
 class GetVariablesSihUseCase:
 
     def execute(self) -> Optional[List[Dict[str, str]]]:
 
         try:
-            sih_db = SIH().load()
+            sih_db = pysus_catalog.get_database("SIH")
 
             if not sih_db.groups:
                 print("Could not load SIH groups from PySUS.") 
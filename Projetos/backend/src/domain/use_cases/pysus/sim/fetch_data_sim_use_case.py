@@ -1,36 +1,76 @@
 # src/domain/use-cases/pysus/sim/fetch-data-sim.use-case.py
 
-import pandas as pd
-from pysus.ftp.databases import SIM
+import pyarrow as pa
 from typing import List, Dict, Any, Optional
-from collections import Counter
 import pyarrow.parquet as pq
+import traceback
 from pathlib import Path
-import traceback 
 
-from src.infrastructure.shared import data_utils 
+from src.infrastructure.shared import aggregate_cube, aggregation, data_utils, datasus_store, memory_budget, parquet_reader, pysus_catalog
+
+MUNICIPALITY_COLUMN = 'CODMUNOCOR'
+
+
+def count_deaths_in_file(
+    file_path: Path,
+    states: Optional[List[str]] = None,
+    budget: Optional[memory_budget.MemoryBudget] = None
+) -> Optional[pa.Table]:
+    """
+    Conta os óbitos por município de um único arquivo parquet.
+
+    Função de módulo (e não método) para poder ser executada em um processo separado.
+    Com `budget`, row groups grandes demais são lidos em lotes menores.
+    """
+    print(f"  -> Processando arquivo: {Path(file_path).name}")
+    parquet_file = pq.ParquetFile(file_path)
+    death_counter = aggregation.GroupCounter([MUNICIPALITY_COLUMN])
+
+    # Row groups sem nenhum município das UFs pedidas nem chegam a ser decodificados.
+    state_predicate = data_utils.states_row_group_predicate(parquet_file, states, MUNICIPALITY_COLUMN)
+
+    batch_rows = budget.batch_rows(parquet_file, [MUNICIPALITY_COLUMN], Path(file_path).name) if budget else None
+
+    for chunk_table in parquet_reader.iter_row_groups(parquet_file, [MUNICIPALITY_COLUMN], state_predicate, batch_rows):
+        # Normaliza para int32 e filtra pela UF (código // 10000) direto na tabela Arrow.
+        municipality_codes = data_utils.municipality_codes_as_int(chunk_table.column(MUNICIPALITY_COLUMN))
+        chunk_table = pa.table({MUNICIPALITY_COLUMN: municipality_codes})
+        chunk_table = data_utils.filter_table_by_states(chunk_table, states, MUNICIPALITY_COLUMN)
+
+        death_counter.update(chunk_table)
+
+    return death_counter.result()
 
 class FetchDataSimUseCase:
     """
     Use case simplificado para o SIM, com chunking e filtragem de estado.
     """
-    def execute(self, group_code: str, years: List[int], states: Optional[List[str]] = None) -> Dict[str, Any]:
-        
-        total_counts = Counter()
+    def execute(
+        self,
+        group_code: str,
+        years: List[int],
+        states: Optional[List[str]] = None,
+        max_workers: Optional[int] = None,
+        breakdown: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Conta os óbitos por município. Com `breakdown` (ex.: ['cause_chapter', 'age_band']),
+        os óbitos de cada município são abertos também por essas dimensões.
+        """
+        if breakdown:
+            return self._breakdown_summary(group_code, years, states, breakdown)
+
         # 1. Variável do cabeçalho inicializada como None
-        column_names: Optional[List[str]] = None 
-        
+        column_names: Optional[List[str]] = None
+
         try:
-            print("Carregando banco de dados SIM...")
-            sim_db = SIM().load()
+            # Anos já consolidados no cubo são respondidos sem tocar nos microdados.
+            cube = aggregate_cube.lookup("SIM", group_code, years, states)
+            if cube is not None:
+                return self._summary_from_cube(*cube, states=states)
 
-            state_prefixes = []
-            if states:
-                
-                state_prefixes = [
-                    data_utils.STATE_ABBR_TO_IBGE_CODE.get(st) 
-                    for st in states if data_utils.STATE_ABBR_TO_IBGE_CODE.get(st)
-                ]
+            print("Carregando banco de dados SIM...")
+            sim_db = pysus_catalog.get_database("SIM")
 
             # 2. DOWNLOAD DOS ARQUIVOS
             download_params = {'group': group_code, 'year': years}
@@ -39,72 +79,40 @@ class FetchDataSimUseCase:
 
             print(f"Buscando arquivos no SIM para os parâmetros: {download_params}")
             files_to_download = sim_db.get_files(**download_params)
-            
+
             # 2. Retorno atualizado (se não houver arquivos)
-            if not files_to_download: 
+            if not files_to_download:
                 return {"summary_by_municipality": [], "columns": []}
 
-            downloaded_objects = sim_db.download(files_to_download, local_dir='/tmp')
-            
+            download_paths = datasus_store.fetch_files(sim_db, "SIM", group_code, files_to_download)
+
             # 3. Retorno atualizado (se o download falhar)
-            if not downloaded_objects: 
+            if not download_paths:
                 return {"summary_by_municipality": [], "columns": []}
-            
-            
-            if not isinstance(downloaded_objects, list):
-                download_list_items = [downloaded_objects]
-            else:
-                download_list_items = downloaded_objects
-            
-            download_paths = [
-                Path(item.path) if hasattr(item, 'path') else Path(str(item))
-                for item in download_list_items
-            ]
-            
-            for file_path in download_paths: 
-                
-                
-                parquet_files_to_process = []
-                if file_path.is_dir():
-                    parquet_files_to_process.extend(list(file_path.glob('*.parquet')))
-                elif file_path.is_file() and file_path.suffix == '.parquet':
-                    parquet_files_to_process.append(file_path)
-
-                if not parquet_files_to_process: continue
-                
-                for current_file_path in parquet_files_to_process:
-                    if not current_file_path.is_file(): continue
-                    
-                    print(f"  -> Processando arquivo: {current_file_path.name}")
-                    parquet_file = pq.ParquetFile(current_file_path)
-
-                    # 4. Lógica de captura do cabeçalho (apenas uma vez)
-                    if column_names is None:
-                        column_names = parquet_file.schema.names #ccabe
-                        print(f"-> Cabeçalho capturado: {column_names[:5]}...")
-
-                    for i in range(parquet_file.num_row_groups):
-                        chunk_table = parquet_file.read_row_group(i, columns=['CODMUNOCOR'])
-                        chunk_df = chunk_table.to_pandas()
-                        
-                        if chunk_df.empty or 'CODMUNOCOR' not in chunk_df.columns: continue
-
-                        
-                        municipality_series = chunk_df.dropna(subset=['CODMUNOCOR'])['CODMUNOCOR'].astype(str).str.split('.').str[0]
-                        
-                        if state_prefixes:
-                            municipality_prefix = municipality_series.str[0:2]
-                            mask = municipality_prefix.isin(state_prefixes)
-                            municipality_series = municipality_series[mask]
-                            
-                            if municipality_series.empty: continue
-
-                        
-                        partial_counts = municipality_series.value_counts()
-                        total_counts.update(partial_counts.to_dict())
-            
-            
-            if not total_counts:
+
+            parquet_files_to_process = parquet_reader.list_parquet_files(download_paths)
+            if not parquet_files_to_process:
+                return {"summary_by_municipality": [], "columns": []}
+
+            # 4. Lógica de captura do cabeçalho (apenas uma vez, pelos metadados do primeiro arquivo)
+            column_names = pq.ParquetFile(parquet_files_to_process[0]).schema_arrow.names
+            print(f"-> Cabeçalho capturado: {column_names[:5]}...")
+
+            # Cada arquivo (UF/ano) é agregado de forma independente e as contagens são unidas no final.
+            # Os processos dividem o orçamento de memória da requisição, conferido antes da leitura.
+            workers = min(max_workers or aggregation.DEFAULT_MAX_WORKERS, len(parquet_files_to_process))
+            budget = memory_budget.MemoryBudget(workers=workers)
+            with budget.reserve(budget.estimate(parquet_files_to_process, [MUNICIPALITY_COLUMN])):
+                death_counter = aggregation.count_files(
+                    parquet_files_to_process,
+                    count_deaths_in_file,
+                    keys=[MUNICIPALITY_COLUMN],
+                    max_workers=workers,
+                    states=states,
+                    budget=budget
+                )
+
+            if not death_counter:
                 print("Nenhum óbito encontrado após o processamento.")
                 # 5. Retorno atualizado (se não houver contagens)
                 return {
@@ -112,11 +120,12 @@ class FetchDataSimUseCase:
                     "columns": column_names if column_names else []
                 }
 
-            
-            summary_list = [
-                {"municipality_code": str(code), "total_deaths": int(count)}
-                for code, count in total_counts.items()
-            ]
+
+            summary_list = death_counter.to_records(
+                rename={MUNICIPALITY_COLUMN: "municipality_code"},
+                count_name="total_deaths",
+                key_types={MUNICIPALITY_COLUMN: pa.string()}
+            )
 
             print(f"Sumário SIM gerado para {len(summary_list)} municípios.")
 
@@ -126,13 +135,51 @@ class FetchDataSimUseCase:
                 "columns": column_names if column_names else []
             }
 
+        except (memory_budget.MemoryBudgetError, datasus_store.IncompleteDownloadError):
+            raise
+
         except Exception as e:
             traceback.print_exc()
-            print(f"Ocorreu um erro durante a busca de dados do SIM: {e}") 
-            
+            print(f"Ocorreu um erro durante a busca de dados do SIM: {e}")
+
             # 7. Retorno de exceção atualizado
             return {
                 "summary_by_municipality": [],
                 "columns": []
-                
-            }
\ No newline at end of file
+
+            }
+
+    def _summary_from_cube(self, cube_counts: pa.Table, column_names: List[str], states: Optional[List[str]]) -> Dict[str, Any]:
+        """Mesmo resumo do caminho bruto, somando as contagens do cubo por município."""
+        cube_counts = data_utils.filter_table_by_states(cube_counts, states, aggregate_cube.MUNICIPALITY)
+        death_counter = aggregation.GroupCounter([aggregate_cube.MUNICIPALITY])
+        death_counter.add_counts(aggregation.sum_counts(cube_counts, [aggregate_cube.MUNICIPALITY]))
+        return {
+            "summary_by_municipality": death_counter.to_records(
+                count_name="total_deaths",
+                key_types={aggregate_cube.MUNICIPALITY: pa.string()}
+            ),
+            "columns": column_names
+        }
+
+    def _breakdown_summary(self, group_code: str, years: List[int], states: Optional[List[str]], breakdown: List[str]) -> Dict[str, Any]:
+        """
+        Óbitos por município × dimensões extras (capítulo/grupo da CID-10, faixa etária...),
+        calculados pelo motor de resumo compartilhado. Levanta ValueError para dimensões inválidas.
+        """
+        # Import local: o caso de uso genérico importa as colunas deste módulo.
+        from src.domain.use_cases.pysus.aggregate.aggregate_pysus_use_case import AggregatePysusUseCase
+
+        result = AggregatePysusUseCase().execute(
+            "SIM",
+            group_code,
+            years,
+            states=states,
+            group_by=["municipality"] + [dim for dim in breakdown if dim != "municipality"],
+            aggregations=["count"],
+            rename={"municipality": "municipality_code"},
+            count_name="total_deaths"
+        )
+        if result is None:
+            return {"summary_by_municipality": [], "columns": []}
+        return {"summary_by_municipality": result["summary"], "columns": result["columns"]}
@@ -2,14 +2,15 @@
 """
 Use case to inspect the SIM data source and list its available data groups.
 """
-from pysus import SIM
 from typing import List, Dict, Optional
 
+from src.infrastructure.shared import pysus_catalog
+
 class GetVariablesSimUseCase:
 
     def execute(self) -> Optional[List[Dict[str, str]]]:
         try:
-            sim_db = SIM().load()
+            sim_db = pysus_catalog.get_database("SIM")
 
             if not sim_db.groups:
                 print("Could not load SIM groups from PySUS.") # Log de erro
@@ -1,76 +1,196 @@
-import pandas as pd
-from pysus.ftp.databases import SINAN
-from typing import List, Dict, Optional, Any
-from collections import Counter
+import os
+import pyarrow as pa
+import pyarrow.compute as pc
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Dict, Optional, Any, Tuple
 import pyarrow.parquet as pq
-from pathlib import Path 
-from src.infrastructure.shared import data_utils 
+from src.infrastructure.shared import aggregate_cube, aggregation, data_utils, datasus_store, memory_budget, parquet_reader, pysus_catalog
+
+# Ordem de preferência da coluna de município: residência, notificação municipal, notificação.
+MUNICIPALITY_COLUMN_CANDIDATES = ["ID_MN_RESI", "ID_MUNICIP", "ID_MN_NOT"]
+MUNICIPALITY_KEY = "municipality_code"
+# Anos buscados (catálogo + download) ao mesmo tempo enquanto os anteriores são agregados.
+YEAR_WORKERS = int(os.environ.get("SINAN_YEAR_WORKERS", 4))
 
 class FetchDataSinanUseCase:
-   
-    def execute(self, disease_code: str, years: List[int], states: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+
+    def execute(
+        self,
+        disease_code: str,
+        years: List[int],
+        states: Optional[List[str]] = None,
+        max_workers: Optional[int] = None,
+        breakdown: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Conta os casos por município no total dos anos e em cada ano ('by_year').
+
+        Os anos passam por um pipeline: até `max_workers` (SINAN_YEAR_WORKERS) anos são
+        buscados e baixados em paralelo, e cada ano é agregado assim que seus arquivos chegam,
+        enquanto os downloads dos anos seguintes continuam.
+
+        Com `breakdown` (ex.: ['epi_week'], ['year', 'sex']), os casos de cada município são
+        abertos também por essas dimensões, numa única leitura dos arquivos.
+        """
+        if breakdown:
+            return self._breakdown_summary(disease_code, years, states, breakdown)
+
         try:
+            # Anos já consolidados no cubo são respondidos sem tocar nos microdados.
+            cube = aggregate_cube.lookup("SINAN", disease_code, years, states)
+            if cube is not None:
+                return self._summary_from_cube(*cube, states=states)
+
             print(f"Buscando arquivos no SINAN para o agravo '{disease_code}'...")
-            sinan_db = SINAN().load()
-            total_counts = Counter()
-            column_names: Optional[List[str]] = None 
-            
+            sinan_db = pysus_catalog.get_database("SINAN")
+            year_counters: Dict[int, aggregation.GroupCounter] = {}
+            year_columns: Dict[int, List[str]] = {}
+            budget = memory_budget.MemoryBudget()
+
+            workers = max(1, min(max_workers or YEAR_WORKERS, len(years)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sinan-year") as executor:
+                futures = {executor.submit(self._download_year, sinan_db, disease_code, year): year for year in years}
+                for future in as_completed(futures):
+                    year = futures[future]
+                    parquet_files_paths = future.result()
+                    if not parquet_files_paths:
+                        continue
+                    print(f"Processando lote para o ano: {year}...")
+                    year_counters[year], year_columns[year] = self._count_year(parquet_files_paths, states, budget)
+
+            # Cabeçalho do primeiro ano pedido que tinha arquivos, independente da ordem de chegada.
+            column_names = next((year_columns[year] for year in years if year_columns.get(year)), [])
+            case_counter = aggregation.GroupCounter([MUNICIPALITY_KEY])
             for year in years:
-                print(f"Processando lote para o ano: {year}...")
-                
-                files_to_download = sinan_db.get_files(dis_code=disease_code, year=year)
-                if not files_to_download: continue
-
-                downloaded_obj = sinan_db.download(files_to_download, local_dir='/tmp')
-                if not downloaded_obj: continue
-
-                dir_path = Path(downloaded_obj.path)
-                print(f" -> Dados baixados na pasta: {dir_path}")
-
-                parquet_files_paths = list(dir_path.glob('*.parquet'))
-                
-                if not parquet_files_paths:
-                    print(f" -> Nenhum arquivo .parquet encontrado dentro da pasta {dir_path}")
-                    continue
-
-                for filepath in parquet_files_paths:
-                    print(f" -> Lendo arquivo de dados: {filepath.name}")
-                    parquet_file = pq.ParquetFile(filepath)
-
-                    for i in range(parquet_file.num_row_groups):
-                        chunk_df = parquet_file.read_row_group(i).to_pandas()
-                        
-                        if chunk_df.empty: continue
-
-                        if column_names is None:
-                            column_names = chunk_df.columns.tolist() 
-                            print(f"-> Cabeçalho capturado: {column_names[:5]}...")
-
-                        municipality_col = next((col for col in ["ID_MN_RESI", "ID_MUNICIP", "ID_MN_NOT"] if col in chunk_df.columns), None)
-                        if not municipality_col: continue
-                        
-                        
-                        filtered_chunk_df = data_utils.filter_dataframe_by_states(chunk_df, states, municipality_col)
-                        
-                        partial_counts = filtered_chunk_df.dropna(subset=[municipality_col])[municipality_col].value_counts()
-                        total_counts.update(partial_counts.to_dict())
-            
-            if not total_counts:
+                if year in year_counters:
+                    case_counter.merge(year_counters[year])
+
+            if not case_counter:
                  print("Nenhum registro encontrado após o processamento.")
-                 
+
                  return {
-                     "summary": [], 
-                     "columns": column_names if column_names else []
+                     "summary": [],
+                     "columns": column_names,
+                     "by_year": []
                  }
 
-            summary_list = [{"municipality_code": code, "total_cases": count} for code, count in total_counts.items()]
+            summary_list = self._to_records(case_counter)
             print(f"Resumo final do SINAN gerado para {len(summary_list)} municípios.")
-            
+
             return {
                 "summary": summary_list,
-                "columns": column_names if column_names else [] 
+                "columns": column_names,
+                "by_year": self._by_year({year: counter for year, counter in year_counters.items() if counter})
             }
-            
+
+        except (memory_budget.MemoryBudgetError, datasus_store.IncompleteDownloadError):
+            raise
+
         except Exception as e:
             print(f"Ocorreu um erro durante a busca de dados do SINAN: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    def _download_year(self, sinan_db: Any, disease_code: str, year: int) -> List[Path]:
+        """Primeira etapa do pipeline (em thread): lista e baixa os arquivos de um ano."""
+        files_to_download = sinan_db.get_files(dis_code=disease_code, year=year)
+        if not files_to_download:
+            return []
+
+        download_paths = datasus_store.fetch_files(sinan_db, "SINAN", disease_code, files_to_download)
+        if not download_paths:
+            return []
+
+        print(f" -> Dados de {year} disponíveis em: {[str(path) for path in download_paths]}")
+        parquet_files_paths = parquet_reader.list_parquet_files(download_paths)
+        if not parquet_files_paths:
+            print(f" -> Nenhum arquivo .parquet encontrado para o ano {year}")
+        return parquet_files_paths
+
+    def _count_year(
+        self,
+        parquet_files_paths: List[Path],
+        states: Optional[List[str]],
+        budget: memory_budget.MemoryBudget
+    ) -> Tuple[aggregation.GroupCounter, List[str]]:
+        """Segunda etapa do pipeline: conta os casos por município dos arquivos de um ano."""
+        case_counter = aggregation.GroupCounter([MUNICIPALITY_KEY])
+        column_names: List[str] = []
+
+        for filepath in parquet_files_paths:
+            print(f" -> Lendo arquivo de dados: {filepath.name}")
+            parquet_file = pq.ParquetFile(filepath)
+            schema_names = parquet_file.schema_arrow.names
+
+            if not column_names:
+                column_names = list(schema_names)
+                print(f"-> Cabeçalho capturado: {column_names[:5]}...")
+
+            # A coluna de município é resolvida uma única vez, pelo schema do arquivo.
+            municipality_col = parquet_reader.resolve_column(schema_names, MUNICIPALITY_COLUMN_CANDIDATES)
+            if not municipality_col:
+                print(f" -> Nenhuma coluna de município encontrada em {filepath.name}")
+                continue
+
+            # Apenas a coluna usada na agregação é decodificada, e só nos row groups das UFs pedidas.
+            state_predicate = data_utils.states_row_group_predicate(parquet_file, states, municipality_col)
+            batch_rows = budget.batch_rows(parquet_file, [municipality_col], filepath.name)
+            with budget.reserve(budget.estimate([filepath], [municipality_col])):
+                for chunk_table in parquet_reader.iter_row_groups(parquet_file, [municipality_col], state_predicate, batch_rows):
+                    # Arquivos podem usar colunas diferentes; a contagem usa sempre a mesma chave (int32).
+                    chunk_table = pa.table({MUNICIPALITY_KEY: data_utils.municipality_codes_as_int(chunk_table.column(municipality_col))})
+                    chunk_table = data_utils.filter_table_by_states(chunk_table, states, MUNICIPALITY_KEY)
+                    case_counter.update(chunk_table)
+
+        return case_counter, column_names
+
+    def _to_records(self, case_counter: aggregation.GroupCounter) -> List[Dict[str, Any]]:
+        return case_counter.to_records(count_name="total_cases", key_types={MUNICIPALITY_KEY: pa.string()})
+
+    def _by_year(self, year_counters: Dict[int, aggregation.GroupCounter]) -> List[Dict[str, Any]]:
+        """Resumo de cada ano, em ordem crescente: total de casos e casos por município."""
+        return [
+            {"year": year, "total_cases": counter.total(), "summary": self._to_records(counter)}
+            for year, counter in sorted(year_counters.items())
+        ]
+
+    def _breakdown_summary(self, disease_code: str, years: List[int], states: Optional[List[str]], breakdown: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Casos por município × dimensões extras (ano, mês, semana epidemiológica, sexo...),
+        calculados pelo motor de resumo compartilhado. Levanta ValueError para dimensões inválidas.
+        """
+        # Import local: o caso de uso genérico importa as colunas deste módulo.
+        from src.domain.use_cases.pysus.aggregate.aggregate_pysus_use_case import AggregatePysusUseCase
+
+        result = AggregatePysusUseCase().execute(
+            "SINAN",
+            disease_code,
+            years,
+            states=states,
+            group_by=["municipality"] + [dim for dim in breakdown if dim != "municipality"],
+            aggregations=["count"],
+            rename={"municipality": MUNICIPALITY_KEY},
+            count_name="total_cases"
+        )
+        if result is None:
+            return None
+        return {"summary": result["summary"], "columns": result["columns"]}
+
+    def _summary_from_cube(self, cube_counts: pa.Table, column_names: List[str], states: Optional[List[str]]) -> Dict[str, Any]:
+        """Mesmo resumo do caminho bruto, somando as contagens do cubo por município (no total e por ano)."""
+        cube_counts = data_utils.filter_table_by_states(cube_counts, states, aggregate_cube.MUNICIPALITY)
+        case_counter = aggregation.GroupCounter([MUNICIPALITY_KEY])
+        case_counter.add_counts(aggregation.sum_counts(cube_counts, [aggregate_cube.MUNICIPALITY]))
+
+        year_counters: Dict[int, aggregation.GroupCounter] = {}
+        by_year = aggregation.sum_counts(cube_counts, [aggregate_cube.YEAR, aggregate_cube.MUNICIPALITY])
+        if by_year is not None:
+            for year in sorted(set(by_year.column(aggregate_cube.YEAR).to_pylist())):
+                year_counts = by_year.filter(pc.equal(by_year.column(aggregate_cube.YEAR), year))
+                year_counters[year] = aggregation.GroupCounter([MUNICIPALITY_KEY])
+                year_counters[year].add_counts(year_counts.select([aggregate_cube.MUNICIPALITY, aggregation.COUNT_COLUMN]))
+        return {
+            "summary": self._to_records(case_counter),
+            "columns": column_names,
+            "by_year": self._by_year(year_counters)
+        }
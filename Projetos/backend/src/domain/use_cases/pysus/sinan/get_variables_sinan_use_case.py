@@ -2,15 +2,16 @@
 """
 Use case to inspect the SINAN data source and list its available diseases/conditions.
 """
-from pysus import SINAN
 from typing import List, Dict, Optional
 
+from src.infrastructure.shared import pysus_catalog
+
 class GetVariablesSinanUseCase:
  
     def execute(self) -> Optional[List[Dict[str, str]]]:
        
         try:
-            sinan_db = SINAN().load()
+            sinan_db = pysus_catalog.get_database("SINAN")
 
             if not sinan_db.diseases:
                 print("Could not load SINAN diseases list from PySUS.") # Log de erro
@@ -2,80 +2,161 @@
 """
 Use case to fetch SINASC data and return an aggregated summary of births.
 """
-import pandas as pd
-from pysus.ftp.databases import SINASC
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from typing import List, Dict, Any, Optional
 
-from src.infrastructure.shared import data_utils
+from src.infrastructure.shared import aggregate_cube, aggregation, data_utils, datasus_store, memory_budget, parquet_reader, pysus_catalog
+
+# Únicas colunas decodificadas: município de nascimento, sexo e idade da mãe.
+REQUIRED_COLUMNS = ['CODMUNNASC', 'SEXO', 'IDADEMAE']
+SUMMARY_KEYS = ['CODMUNNASC', 'SEXO', 'mother_age_group']
+# Campos dos registros planos devolvidos em "records" (layouts colunares da API).
+RECORD_FIELDS = ['municipality_code', 'sex', 'mother_age_group', 'count']
 
 class GetSummarySinascUseCase:
-    
-    def execute(self, group_code: str, years: List[int], states: Optional[List[str]] = None) -> Dict[str, Any]:
-        
+
+    def execute(
+        self,
+        group_code: str,
+        years: List[int],
+        states: Optional[List[str]] = None,
+        breakdown: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Resumo de nascidos vivos por município (total, por sexo e por faixa etária da mãe).
+
+        Com `breakdown` (ex.: ['year'], ['month', 'delivery']), devolve em vez disso os registros
+        planos por município × essas dimensões, calculados pelo motor de resumo compartilhado
+        numa única leitura dos arquivos. Levanta ValueError para dimensões inválidas.
+        """
+        if breakdown:
+            return self._breakdown_summary(group_code, years, states, breakdown)
+
         # 1. Inicializa a variável do cabeçalho
-        column_names: Optional[List[str]] = None 
-        
+        column_names: Optional[List[str]] = None
+        # Contagens parciais por (município, sexo, faixa etária da mãe), somadas row group a row group.
+        birth_counter = aggregation.GroupCounter(SUMMARY_KEYS)
+
         try:
-            
-            sinasc_db = SINASC().load()
+            # Anos já consolidados no cubo são respondidos sem tocar nos microdados.
+            cube = aggregate_cube.lookup("SINASC", group_code, years, states, min_format=aggregate_cube.CUBE_FORMAT)
+            if cube is not None:
+                cube_counts, cube_columns = cube
+                birth_counter.add_counts(self._counts_from_cube(cube_counts, states))
+                records = self._build_records(birth_counter)
+                return {"summary": self._build_summary(records), "columns": cube_columns, "records": records}
+
+            sinasc_db = pysus_catalog.get_database("SINASC")
             files_to_download = sinasc_db.get_files(group=group_code, year=years, uf=states)
 
             if not files_to_download:
                 # 2. Atualiza o retorno para o novo formato
-                return {"summary": {}, "columns": []} 
-            
-            downloaded_objects = sinasc_db.download(files_to_download)
-            if not downloaded_objects:
+                return {"summary": {}, "columns": []}
+
+            download_paths = datasus_store.fetch_files(sinasc_db, "SINASC", group_code, files_to_download)
+            if not download_paths:
                 # 2. Atualiza o retorno para o novo formato
-                return {"summary": {}, "columns": []} 
-
-            if isinstance(downloaded_objects, list):
-                list_of_dataframes = [pq.to_dataframe() for pq in downloaded_objects]
-                unfiltered_dataframe = pd.concat(list_of_dataframes, ignore_index=True) if list_of_dataframes else pd.DataFrame()
-            else:
-                unfiltered_dataframe = downloaded_objects.to_dataframe()
-
-            if unfiltered_dataframe.empty:
-                return {"summary": {}, "columns": []} 
-
-            
-            column_names = unfiltered_dataframe.columns.tolist()
-            print(f"-> Cabeçalho SINASC capturado: {column_names[:5]}...")
-            
-
-            filtered_dataframe = data_utils.filter_dataframe_by_states(
-                unfiltered_dataframe, 
-                states, 
-                municipality_code_column='CODMUNNASC'
-            )
-            
-            birth_summary = {}
-            required_cols = ['IDADEMAE', 'CODMUNNASC', 'SEXO']
-            
-            if all(col in filtered_dataframe.columns for col in required_cols):
-
-                processed_df = filtered_dataframe.dropna(subset=required_cols).copy()
-                processed_df['mother_age_group'] = processed_df['IDADEMAE'].apply(data_utils.get_age_group)
-                
-                summary_df = processed_df.groupby(['CODMUNNASC', 'SEXO', 'mother_age_group']).size().reset_index(name='count')
-                
-                for _, row in summary_df.iterrows():
-                    mun_code, sex, age_group, count = str(row['CODMUNNASC']), str(row['SEXO']), str(row['mother_age_group']), int(row['count'])
-                    
-                    if mun_code not in birth_summary:
-                        birth_summary[mun_code] = {"total": 0, "by_sex": {}, "by_mother_age_group": {}}
-                    
-                    birth_summary[mun_code]["total"] += count
-                    birth_summary[mun_code]["by_sex"][sex] = birth_summary[mun_code]["by_sex"].get(sex, 0) + count
-                    birth_summary[mun_code]["by_mother_age_group"][age_group] = birth_summary[mun_code]["by_mother_age_group"].get(age_group, 0) + count
-            
-            
+                return {"summary": {}, "columns": []}
+
+            parquet_files = parquet_reader.list_parquet_files(download_paths)
+            # Os arquivos do SINASC são os maiores entre os resumos: confere o orçamento antes de ler.
+            budget = memory_budget.MemoryBudget()
+            with budget.reserve(budget.estimate(parquet_files, REQUIRED_COLUMNS)):
+                for file_path in parquet_files:
+                    parquet_file = pq.ParquetFile(file_path)
+                    schema_names = parquet_file.schema_arrow.names
+
+                    if column_names is None:
+                        column_names = list(schema_names)
+                        print(f"-> Cabeçalho SINASC capturado: {column_names[:5]}...")
+
+                    if not all(col in schema_names for col in REQUIRED_COLUMNS):
+                        print(f" -> Arquivo {file_path.name} sem as colunas {REQUIRED_COLUMNS}. Ignorando.")
+                        continue
+
+                    print(f"  -> Processando arquivo: {file_path.name}")
+                    state_predicate = data_utils.states_row_group_predicate(parquet_file, states, 'CODMUNNASC')
+                    batch_rows = budget.batch_rows(parquet_file, REQUIRED_COLUMNS, file_path.name)
+                    for chunk_table in parquet_reader.iter_row_groups(parquet_file, REQUIRED_COLUMNS, state_predicate, batch_rows):
+                        birth_counter.update(self._prepare_chunk(chunk_table, states))
+
+            records = self._build_records(birth_counter)
+            birth_summary = self._build_summary(records)
+
             return {
                 "summary": birth_summary,
-                "columns": column_names if column_names else []
+                "columns": column_names if column_names else [],
+                "records": records
             }
 
+        except (memory_budget.MemoryBudgetError, datasus_store.IncompleteDownloadError):
+            raise
+
         except Exception as e:
-            print(f"An error occurred during SINASC summary generation: {e}") 
+            print(f"An error occurred during SINASC summary generation: {e}")
             # 5. Atualiza o retorno de exceção
-            return {"summary": {}, "columns": []}
\ No newline at end of file
+            return {"summary": {}, "columns": []}
+
+    def _breakdown_summary(self, group_code: str, years: List[int], states: Optional[List[str]], breakdown: List[str]) -> Dict[str, Any]:
+        """Nascimentos por município × dimensões extras, em registros planos (summary e records)."""
+        # Import local, como no SIM e no SINAN: o caso de uso genérico importa os casos de uso dos sistemas.
+        from src.domain.use_cases.pysus.aggregate.aggregate_pysus_use_case import AggregatePysusUseCase
+
+        result = AggregatePysusUseCase().execute(
+            "SINASC",
+            group_code,
+            years,
+            states=states,
+            group_by=["municipality"] + [dim for dim in breakdown if dim != "municipality"],
+            aggregations=["count"],
+            rename={"municipality": "municipality_code"}
+        )
+        if result is None:
+            return {"summary": {}, "columns": []}
+        return {"summary": result["summary"], "columns": result["columns"], "records": result["summary"]}
+
+    def _prepare_chunk(self, chunk_table: pa.Table, states: Optional[List[str]]) -> pa.Table:
+        """Filtra o row group e classifica a idade da mãe, mantendo tudo em Arrow."""
+        # O município vira int32 antes do filtro: a UF é comparada como inteiro (código // 10000).
+        chunk_table = chunk_table.set_column(
+            chunk_table.schema.get_field_index('CODMUNNASC'), 'CODMUNNASC', data_utils.municipality_codes_as_int(chunk_table.column('CODMUNNASC'))
+        )
+        chunk_table = chunk_table.drop_null()
+        chunk_table = data_utils.filter_table_by_states(chunk_table, states, 'CODMUNNASC')
+        return pa.table({
+            'CODMUNNASC': chunk_table.column('CODMUNNASC'),
+            # Sem espaços nas pontas, como a dimensão 'text' do summary_engine e o cubo.
+            'SEXO': pc.utf8_trim_whitespace(pc.cast(chunk_table.column('SEXO'), pa.string())),
+            'mother_age_group': data_utils.get_age_groups(chunk_table.column('IDADEMAE')),
+        })
+
+    def _counts_from_cube(self, cube_counts: pa.Table, states: Optional[List[str]]) -> Optional[pa.Table]:
+        """Soma o cubo por (município, sexo, faixa etária) com os nomes de SUMMARY_KEYS."""
+        cube_counts = data_utils.filter_table_by_states(cube_counts, states, aggregate_cube.MUNICIPALITY)
+        cube_keys = [aggregate_cube.MUNICIPALITY, aggregate_cube.SEX, aggregate_cube.AGE_GROUP]
+        counts = aggregation.sum_counts(cube_counts, cube_keys)
+        return counts.rename_columns(SUMMARY_KEYS + [aggregation.COUNT_COLUMN]) if counts is not None else None
+
+    def _build_records(self, birth_counter: aggregation.GroupCounter) -> List[Dict[str, Any]]:
+        """Contagens planas por (município, sexo, faixa etária da mãe), com os nomes de RECORD_FIELDS."""
+        return birth_counter.to_records(
+            rename=dict(zip(SUMMARY_KEYS, RECORD_FIELDS)),
+            key_types={'CODMUNNASC': pa.string()}
+        )
+
+    def _build_summary(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Monta o summary aninhado por município consumido pelo mapa de natalidade."""
+        birth_summary: Dict[str, Any] = {}
+        for row in records:
+            # As chaves do summary continuam sendo o código do município em texto.
+            mun_code, sex, age_group, count = row['municipality_code'], row['sex'], row['mother_age_group'], int(row['count'])
+            if mun_code not in birth_summary:
+                birth_summary[mun_code] = {"total": 0, "by_sex": {}, "by_mother_age_group": {}}
+
+            municipality_summary = birth_summary[mun_code]
+            municipality_summary["total"] += count
+            municipality_summary["by_sex"][sex] = municipality_summary["by_sex"].get(sex, 0) + count
+            municipality_summary["by_mother_age_group"][age_group] = municipality_summary["by_mother_age_group"].get(age_group, 0) + count
+        return birth_summary
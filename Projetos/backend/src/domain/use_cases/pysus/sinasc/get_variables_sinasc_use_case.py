@@ -2,9 +2,10 @@
 """
 Use case to inspect the SINASC data source and list its available data groups.
 """
-from pysus import SINASC
 from typing import List, Dict, Optional
 
+from src.infrastructure.shared import pysus_catalog
+
 class GetVariablesSinascUseCase:
     """
     This use case retrieves the available data groups from the SINASC
@@ -14,7 +15,7 @@ class GetVariablesSinascUseCase:
        
         try:
             
-            sinasc_db = SINASC().load()
+            sinasc_db = pysus_catalog.get_database("SINASC")
 
             if not sinasc_db.groups:
                 print("Could not load SINASC groups from PySUS.") 
@@ -0,0 +1,51 @@
+# src/domain/use-cases/pysus/sql/run-sql-query.use-case.py
+"""
+Use case that runs a read-only SQL query over the locally stored DATASUS parquet files.
+"""
+import math
+from typing import Any, Dict, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+from src.infrastructure.shared import sql_engine
+
+
+def _finite(value: Any) -> Any:
+    """NaN e infinito não existem em JSON: viram null (também dentro de listas e structs)."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_finite(item) for item in value]
+    return value
+
+
+class RunSqlQueryUseCase:
+
+    def execute(self, query: str, max_rows: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Executa a consulta no motor SQL e devolve as linhas, o schema e se o resultado foi cortado.
+
+        Levanta sql_engine.SqlQueryError (um ValueError) para consultas inválidas, proibidas
+        ou que passaram do tempo limite.
+        """
+        if not query or not query.strip():
+            raise sql_engine.SqlQueryError("A consulta está vazia.")
+
+        print("Executando consulta SQL sobre o armazenamento local do DATASUS...")
+        table, truncated, elapsed = sql_engine.get_engine().query(query, max_rows or sql_engine.SQL_MAX_ROWS)
+        print(f"Consulta SQL concluída: {table.num_rows} linhas em {elapsed:.2f} s{' (cortada)' if truncated else ''}.")
+
+        return {
+            # Datas e decimais do DuckDB viram texto/número para o JSON.
+            "rows": _finite(jsonable_encoder(table.to_pylist())),
+            "columns": [{"name": field.name, "type": str(field.type)} for field in table.schema],
+            "row_count": table.num_rows,
+            "truncated": truncated,
+            "elapsed_seconds": round(elapsed, 3),
+            "table": table,
+        }
+
+    def list_tables(self) -> List[Dict[str, Any]]:
+        return sql_engine.get_engine().list_tables()
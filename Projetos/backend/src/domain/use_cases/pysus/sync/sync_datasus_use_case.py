@@ -0,0 +1,108 @@
+# src/domain/use-cases/pysus/sync/sync-datasus.use-case.py
+"""
+Use case that brings the local DATASUS copies up to date with the FTP.
+
+DATASUS revises preliminary years (SIM/SINASC "PRELIM", SINAN updates) without notice.
+Only files already in the store whose size or modification date changed are downloaded
+again; only the cubes built from those files (or whose listing changed) are rebuilt.
+"""
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.domain.use_cases.pysus.cubes.build_aggregate_cube_use_case import CUBE_SOURCES, BuildAggregateCubeUseCase
+from src.infrastructure.shared import aggregate_cube, data_version, datasus_store, pysus_catalog
+
+
+class SyncDatasusUseCase:
+
+    def execute(self, systems: Optional[List[str]] = None, rebuild_cubes: bool = True) -> Dict[str, Any]:
+        """
+        Compares the FTP listing with the store manifest and refreshes what changed.
+
+        Returns the updated keys, the rebuilt cubes and the resulting data-version token.
+        """
+        systems = [s.upper() for s in systems] if systems else list(pysus_catalog.DATABASES)
+        store = datasus_store.get_store()
+        catalog = pysus_catalog.get_catalog()
+
+        # (sistema, grupo) -> anos presentes no store.
+        partitions: Dict[Tuple[str, str], Set[int]] = defaultdict(set)
+        for key in store.entries():
+            parts = store.parse_key(key)
+            if parts["system"] in systems and parts["year"].isdigit():
+                partitions[(parts["system"], parts["group"])].add(int(parts["year"]))
+
+        databases: Dict[str, Any] = {}
+        updated_keys: List[str] = []
+        changed_systems: Set[str] = set()
+
+        for (system, group), years in sorted(partitions.items()):
+            try:
+                if system not in databases:
+                    # Listagem nova do FTP, não a do catálogo em memória.
+                    databases[system] = catalog.refresh(system)
+                database = databases[system]
+                files = pysus_catalog.list_files(database, system, group, sorted(years))
+                updated = store.refresh(database, system, group, files)
+            except Exception as e:
+                print(f" -> [Sync] Falha ao verificar {system}/{group}: {e}")
+                continue
+            if updated:
+                updated_keys.extend(updated)
+                changed_systems.add(system)
+
+        rebuilt: List[str] = []
+        if rebuild_cubes:
+            rebuilt = self._rebuild_cubes(systems, databases, set(updated_keys), changed_systems)
+
+        if changed_systems:
+            data_version.bump(changed_systems)
+
+        print(f"[Sync] {len(updated_keys)} arquivo(s) atualizado(s), {len(rebuilt)} cubo(s) refeito(s).")
+        return {
+            "updated_files": updated_keys,
+            "rebuilt_cubes": rebuilt,
+            "changed_systems": sorted(changed_systems),
+            "data_version": data_version.get_token(),
+        }
+
+    def _rebuild_cubes(
+        self,
+        systems: List[str],
+        databases: Dict[str, Any],
+        updated_keys: Set[str],
+        changed_systems: Set[str]
+    ) -> List[str]:
+        """Rebuilds only the cube years whose source files were revised, added or removed upstream."""
+        store = datasus_store.get_store()
+        builder = BuildAggregateCubeUseCase()
+        rebuilt: List[str] = []
+
+        for cube in aggregate_cube.list_cubes():
+            system, group, year, states = cube["system"], cube["group"], cube["year"], cube["states"]
+            if system not in systems or system not in CUBE_SOURCES:
+                continue
+            try:
+                if system not in databases:
+                    databases[system] = pysus_catalog.get_catalog().refresh(system)
+                database = databases[system]
+                files = pysus_catalog.list_files(database, system, group, [year], states)
+                current_keys = {store.build_key(database, system, group, file) for file in files}
+            except Exception as e:
+                print(f" -> [Sync] Falha ao listar o cubo {system}/{group} {year}: {e}")
+                continue
+
+            source_keys = set(cube["source_keys"])
+            if current_keys == source_keys and not (source_keys & updated_keys):
+                continue
+
+            print(f" -> [Sync] Cubo {system}/{group} {year} desatualizado, refazendo.")
+            try:
+                written = builder.execute(system, group, [year], states)
+            except Exception as e:
+                print(f" -> [Sync] Falha ao refazer o cubo {system}/{group} {year}: {e}")
+                continue
+            rebuilt.extend(str(path) for path in written)
+            if written:
+                changed_systems.add(system)
+        return rebuilt
@@ -1,13 +1,22 @@
 # src/infrastructure/controllers/ibge/municipalities/fetch-data-municipalities.controller.py
+from typing import Optional
 from fastapi import HTTPException
 from src.domain.use_cases.ibge.municipalities import FetchDataMunicipalitiesUseCase
 
-def fetch_municipalities_by_state(state_abbr: str):
+def fetch_municipalities_by_state(state_abbr: str, export_format: Optional[str] = None, tier: Optional[str] = None, precision: Optional[int] = None):
     """
     Controller to handle the request for fetching data for municipalities of a specific state.
+    With `export_format` ('topojson' or 'geojson'), returns the compact export built from the cached geometry.
     """
     try:
         use_case = FetchDataMunicipalitiesUseCase()
+        if export_format:
+            options = {key: value for key, value in (("tier", tier), ("precision", precision)) if value is not None}
+            document = use_case.export(state_abbr, export_format=export_format, **options)
+            if document is None:
+                raise HTTPException(status_code=404, detail=f"No data found for state '{state_abbr.upper()}'. Please provide a valid state abbreviation.")
+            return document
+
         municipalities_features = use_case.execute(state_abbr=state_abbr)
 
         if municipalities_features is None:
@@ -19,5 +28,9 @@ def fetch_municipalities_by_state(state_abbr: str):
             "features": municipalities_features
         }
 
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"An internal server error occurred: {e}")
\ No newline at end of file
@@ -1,9 +1,15 @@
 # src/infrastructure/controllers/ibge/municipalities/routes.py
-from fastapi import APIRouter
+from typing import Optional
+from fastapi import APIRouter, Query
 from . import fetch_data_municipalities
 
 router = APIRouter()
 
 @router.get("/{state_abbr}/fetch-data", summary="Busca dados dos municípios de um estado")
-def get_municipalities_by_state_route(state_abbr: str):
-    return fetch_data_municipalities.fetch_municipalities_by_state(state_abbr)
\ No newline at end of file
+def get_municipalities_by_state_route(
+    state_abbr: str,
+    format: Optional[str] = Query(None, description="'topojson' ou 'geojson': exportação compacta a partir das geometrias em cache."),
+    tier: Optional[str] = Query(None, description="Nível de simplificação da exportação (full, high, medium, low)."),
+    precision: Optional[int] = Query(None, ge=0, le=8, description="Casas decimais das coordenadas no GeoJSON exportado.")
+):
+    return fetch_data_municipalities.fetch_municipalities_by_state(state_abbr, format, tier, precision)
\ No newline at end of file
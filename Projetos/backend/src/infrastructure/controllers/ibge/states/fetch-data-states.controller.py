@@ -1,13 +1,22 @@
 # src/infrastructure/controllers/ibge/states/fetch-data-states.controller.py
+from typing import Optional
 from fastapi import HTTPException
 from src.domain.use_cases.ibge.states import FetchDataStatesUseCase
 
-def fetch_all_states_data():
+def fetch_all_states_data(export_format: Optional[str] = None, tier: Optional[str] = None, precision: Optional[int] = None):
     """
     Controller to handle the request for fetching detailed data for all states.
+    With `export_format` ('topojson' or 'geojson'), returns the compact export built from the cached geometry.
     """
     try:
         use_case = FetchDataStatesUseCase()
+        if export_format:
+            options = {key: value for key, value in (("tier", tier), ("precision", precision)) if value is not None}
+            document = use_case.export(export_format=export_format, **options)
+            if document is None:
+                raise HTTPException(status_code=503, detail="Could not load the state geometry.")
+            return document
+
         states_features = use_case.execute()
 
         if states_features is None:
@@ -20,6 +29,10 @@ def fetch_all_states_data():
             "features": states_features
         }
 
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         # Generic error handler for any unexpected issues.
         raise HTTPException(status_code=500, detail=f"An internal server error occurred: {e}")
\ No newline at end of file
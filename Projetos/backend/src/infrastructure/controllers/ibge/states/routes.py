@@ -1,9 +1,14 @@
 # src/infrastructure/controllers/ibge/states/routes.py
-from fastapi import APIRouter
+from typing import Optional
+from fastapi import APIRouter, Query
 from . import fetch_data_states  # Importa o controller da mesma pasta
 
 router = APIRouter()
 
 @router.get("/fetch-data", summary="Busca dados detalhados de todos os estados")
-def get_states_data_route():
-    return fetch_data_states.fetch_all_states_data()
\ No newline at end of file
+def get_states_data_route(
+    format: Optional[str] = Query(None, description="'topojson' ou 'geojson': exportação compacta a partir das geometrias em cache."),
+    tier: Optional[str] = Query(None, description="Nível de simplificação da exportação (full, high, medium, low)."),
+    precision: Optional[int] = Query(None, ge=0, le=8, description="Casas decimais das coordenadas no GeoJSON exportado.")
+):
+    return fetch_data_states.fetch_all_states_data(format, tier, precision)
\ No newline at end of file
@@ -0,0 +1,57 @@
+from fastapi import HTTPException
+from fastapi.responses import Response
+from typing import Optional
+
+from src.domain.use_cases.maps.get_geojson_layer_use_case import GetGeojsonLayerUseCase
+
+
+def get_geojson_layer(
+    state_abbr: str,
+    year: int,
+    layer: str,
+    tier: Optional[str] = None,
+    width: Optional[int] = None,
+    zoom: Optional[float] = None,
+    export_format: str = "geojson",
+    precision: Optional[int] = None,
+):
+
+    print(f"--- [Controller] Recebida solicitação de {export_format} '{layer}' de {state_abbr.upper()} ({year}) ---")
+
+    try:
+        result = GetGeojsonLayerUseCase().execute(
+            state_abbr=state_abbr,
+            year=year,
+            layer=layer,
+            tier=tier,
+            width_px=width,
+            zoom=zoom,
+            export_format=export_format,
+            precision=precision,
+        )
+
+        if result is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Geometrias não encontradas para a combinação: {state_abbr}/{year}/{layer}."
+            )
+
+        # O nível usado vai no cabeçalho: o corpo é um FeatureCollection/Topology puro.
+        return Response(
+            content=result["content"],
+            media_type=result["media_type"],
+            headers={"X-Geometry-Tier": result["tier"]}
+        )
+
+    except HTTPException as h_e:
+        raise h_e
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    except Exception as e:
+        print(f"❌ ERRO INTERNO no controller: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Ocorreu um erro interno no servidor ao gerar o {export_format}: {e}"
+        )
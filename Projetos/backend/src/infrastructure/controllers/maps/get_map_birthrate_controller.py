@@ -4,6 +4,7 @@ from fastapi import HTTPException
 # Importação explícita do Response necessário para retornar imagens
 from fastapi.responses import Response # <-- Usamos Response, que é mais comum para buffers fixos como PNG
 from src.domain.use_cases.maps.get_map_birthrate_use_case import GetMapBirthrateUseCase
+from src.infrastructure.shared import datasus_store
 
 # Adicionamos 'group_code' como um novo parâmetro
 def generate_birth_rate_map(state_abbr: str, year: int, metric: str, group_code: str):
@@ -31,6 +32,9 @@ def generate_birth_rate_map(state_abbr: str, year: int, metric: str, group_code:
         # O Streamlit lida bem com o content/media_type "image/png"
         return Response(content=image_buffer.read(), media_type="image/png")
 
+    except datasus_store.IncompleteDownloadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
     except Exception as e:
         # Lança a exceção para que o FastAPI capture e retorne o erro 500
         raise HTTPException(status_code=500, detail=f"Ocorreu um erro interno no servidor: {e}")
\ No newline at end of file
@@ -1,6 +1,7 @@
 from fastapi import HTTPException
 from fastapi.responses import Response 
 from src.domain.use_cases.maps.get_map_prevalence_use_case import GetMapPrevalenceUseCase
+from src.infrastructure.shared import datasus_store
 
 def generate_prevalence_map(state_abbr: str, year: int, metric: str, disease_code: str):
     
@@ -22,5 +23,8 @@ def generate_prevalence_map(state_abbr: str, year: int, metric: str, disease_cod
         
         return Response(content=image_buffer.read(), media_type="image/png")
 
+    except datasus_store.IncompleteDownloadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ocorreu um erro interno no servidor: {e}")
\ No newline at end of file
@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Query
 from enum import Enum
+from typing import Optional
 
 from .get_map_birthrate_controller import generate_birth_rate_map
 from .get_map_state_controller import generate_state_layers_map
 # 1. IMPORTAR O NOVO CONTROLLER
 from .get_map_prevalence_controller import generate_prevalence_map
+from .get_geojson_layer_controller import get_geojson_layer
 
 class BirthRateMetric(str, Enum):
     total_births = "total_births"
@@ -20,6 +22,18 @@ class PrevalenceMetric(str, Enum):
     # O nome da métrica deve bater com o definido no 'GetMapPrevalenceUseCase'
     prevalence_per_100000 = "prevalence_per_100000" 
 
+class GeometryLayer(str, Enum):
+    state = "state"
+    municipality = "municipality"
+    immediate_region = "immediate_region"
+    intermediate_region = "intermediate_region"
+
+class GeometryTier(str, Enum):
+    full = "full"
+    high = "high"
+    medium = "medium"
+    low = "low"
+
 maps_router = APIRouter()
 
 @maps_router.get(
@@ -112,4 +126,95 @@ def get_map_state_layers_route(
         show_immediate=show_immediate,
         show_intermediate=show_intermediate,
         use_zoom=use_zoom,
-    )
\ No newline at end of file
+    )
+
+
+@maps_router.get(
+    "/{state_abbr}/{year}/geojson",
+    tags=["Mapas"],
+    summary="Devolve uma camada geográfica de um estado em GeoJSON, simplificada para o tamanho de exibição."
+)
+def get_geojson_layer_route(
+    state_abbr: str,
+    year: int,
+    layer: GeometryLayer = Query(
+        default=GeometryLayer.municipality,
+        description="Camada do geobr a ser devolvida."
+    ),
+    tier: Optional[GeometryTier] = Query(
+        default=None,
+        description="Nível de simplificação. Sem ele, o nível é escolhido pelo 'zoom' ou pela largura ('width') da saída."
+    ),
+    width: Optional[int] = Query(
+        default=None,
+        ge=1,
+        description="Largura, em pixels, em que o estado será exibido (padrão: 1024).",
+        example=1024
+    ),
+    zoom: Optional[float] = Query(
+        default=None,
+        ge=0,
+        le=22,
+        description="Zoom do mapa web (Web Mercator) em que a camada será exibida.",
+        example=7
+    ),
+    precision: Optional[int] = Query(
+        default=None,
+        ge=0,
+        le=8,
+        description="Casas decimais das coordenadas (5 ≈ 1 m). Sem ela, as coordenadas vão completas.",
+        example=5
+    )
+):
+
+    return get_geojson_layer(
+        state_abbr=state_abbr,
+        year=year,
+        layer=layer.value,
+        tier=tier.value if tier else None,
+        width=width,
+        zoom=zoom,
+        precision=precision,
+    )
+
+
+@maps_router.get(
+    "/{state_abbr}/{year}/topojson",
+    tags=["Mapas"],
+    summary="Devolve uma camada geográfica de um estado em TopoJSON (fronteiras compartilhadas e coordenadas quantizadas)."
+)
+def get_topojson_layer_route(
+    state_abbr: str,
+    year: int,
+    layer: GeometryLayer = Query(
+        default=GeometryLayer.municipality,
+        description="Camada do geobr a ser devolvida (também é o nome do objeto no TopoJSON)."
+    ),
+    tier: Optional[GeometryTier] = Query(
+        default=None,
+        description="Nível de simplificação. Sem ele, o nível é escolhido pelo 'zoom' ou pela largura ('width') da saída."
+    ),
+    width: Optional[int] = Query(
+        default=None,
+        ge=1,
+        description="Largura, em pixels, em que o estado será exibido (padrão: 1024).",
+        example=1024
+    ),
+    zoom: Optional[float] = Query(
+        default=None,
+        ge=0,
+        le=22,
+        description="Zoom do mapa web (Web Mercator) em que a camada será exibida.",
+        example=7
+    )
+):
+
+    return get_geojson_layer(
+        state_abbr=state_abbr,
+        year=year,
+        layer=layer.value,
+        tier=tier.value if tier else None,
+        width=width,
+        zoom=zoom,
+        export_format="topojson",
+    )
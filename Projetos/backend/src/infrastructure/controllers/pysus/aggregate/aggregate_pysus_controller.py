@@ -0,0 +1,87 @@
+# src/infrastructure/controllers/pysus/aggregate/aggregate_pysus_controller.py
+
+from fastapi.responses import JSONResponse
+from fastapi import status, HTTPException
+from typing import List, Optional
+
+from src.domain.use_cases.pysus.aggregate.aggregate_pysus_use_case import AggregatePysusUseCase
+from src.infrastructure.shared import datasus_store, memory_budget, summary_response
+
+def aggregate_pysus_controller(
+    system: str,
+    group_code: str,
+    years: List[int],
+    states: Optional[List[str]],
+    months: Optional[List[int]],
+    group_by: Optional[List[str]],
+    filters: Optional[List[str]],
+    measure: Optional[str],
+    aggregations: Optional[List[str]],
+    layout: Optional[str] = None,
+    accept: Optional[str] = None
+):
+    """
+    Controller do resumo genérico de qualquer sistema PySUS (dimensões, filtros e medidas).
+    """
+    try:
+        if not years:
+            raise HTTPException(status_code=400, detail="O parâmetro 'years' é obrigatório.")
+
+        try:
+            response_layout = summary_response.negotiate_layout(layout, accept)
+        except summary_response.UnsupportedLayoutError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        params = {
+            "system": system.upper(),
+            "group_code": group_code.upper(),
+            "years": years,
+            "states": [st.upper() for st in states] if states else None,
+            "months": months,
+            "group_by": [dim.lower() for dim in group_by] if group_by else None,
+            "filters": filters,
+            "measure": measure.upper() if measure else None,
+            "aggregations": [agg.lower() for agg in aggregations] if aggregations else None,
+        }
+
+        use_case = AggregatePysusUseCase()
+        try:
+            result = use_case.execute(**params)
+        except memory_budget.MemoryBudgetError as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        except datasus_store.IncompleteDownloadError as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        if result and result.get("summary"):
+            response_content = {
+                "metadata": {
+                    "system": params["system"],
+                    "parameters": params,
+                    "group_by": result["group_by"],
+                    "filters": result["filters"],
+                    "measure": result["measure"],
+                    "total_records_found": result["total_records"]
+                },
+                "columns": result.get("columns", []),
+                "summary": result["summary"]
+            }
+            return summary_response.build_response(
+                response_content, "summary", response_layout, filename=f"{params['system'].lower()}_agregado"
+            )
+        else:
+            return JSONResponse(
+                content={"message": "Nenhum dado encontrado para os parâmetros fornecidos."},
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        print(f"Erro interno ao agregar dados do {system}: {e}")
+        return JSONResponse(
+            content={"error": "Ocorreu um erro interno no servidor."},
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
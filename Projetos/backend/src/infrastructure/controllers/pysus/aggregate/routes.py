@@ -0,0 +1,44 @@
+# src/infrastructure/controllers/pysus/aggregate/routes.py
+
+from fastapi import APIRouter, Header, Query
+from typing import List, Optional
+
+from .aggregate_pysus_controller import aggregate_pysus_controller
+
+# Roteador do resumo genérico, montado em '/pysus' (a rota fica '/pysus/{system}/aggregate')
+aggregate_router = APIRouter()
+
+@aggregate_router.get(
+    "/{system}/aggregate",
+    tags=["PySUS"],
+    summary="Resumo multidimensional de qualquer sistema PySUS (SIM, SINAN, SINASC, CNES, SIH, SIA)"
+)
+def aggregate_pysus_route(
+    system: str,
+    group_code: str = Query(..., description="Código do grupo de dados (no SINAN, o código do agravo).", example="CID10"),
+    years: List[int] = Query(..., description="Lista de anos para a consulta. Ex: 2022,2023", example=[2022]),
+    states: Optional[List[str]] = Query(None, description="Lista opcional de siglas de estados (UFs) para filtrar.", example=["PE"]),
+    months: Optional[List[int]] = Query(None, description="Meses dos arquivos (só nos sistemas com arquivos mensais: CNES, SIH, SIA).", example=None),
+    group_by: Optional[List[str]] = Query(None, description="Dimensões do agrupamento (padrão: municipality). Ex: municipality, sex, month...", example=["municipality", "sex"]),
+    filters: Optional[List[str]] = Query(None, alias="filter", description="Filtros no formato 'dimensão=valor1,valor2'. Ex: sex=1", example=["sex=1"]),
+    measure: Optional[str] = Query(None, description="Coluna numérica para soma e média (padrão: VAL_TOT no SIH, PA_VALAPR no SIA).", example=None),
+    aggregations: Optional[List[str]] = Query(None, description="Medidas: count, sum, mean (padrão: count, ou todas quando há medida).", example=["count"]),
+    layout: Optional[str] = Query(None, description="Layout do resumo: rows (padrão), columns (listas paralelas) ou arrow (Arrow IPC).", example="columns"),
+    accept: Optional[str] = Header(None)
+):
+    """
+    Endpoint único de agregação: as dimensões de cada sistema estão em SYSTEM_SOURCES.
+    """
+    return aggregate_pysus_controller(
+        system=system,
+        group_code=group_code,
+        years=years,
+        states=states,
+        months=months,
+        group_by=group_by,
+        filters=filters,
+        measure=measure,
+        aggregations=aggregations,
+        layout=layout,
+        accept=accept
+    )
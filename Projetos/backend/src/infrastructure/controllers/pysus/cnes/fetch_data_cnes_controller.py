@@ -1,26 +1,48 @@
-from fastapi.responses import JSONResponse
-from fastapi import status, HTTPException
+from fastapi import HTTPException
 from typing import List, Optional
 
 from src.domain.use_cases.pysus.cnes.fetch_data_cnes_use_case import FetchDataCnesUseCase
+from src.infrastructure.shared import datasus_store, memory_budget, summary_response
 
-def fetch_cnes_data_controller(group_code: str, years: List[int], states: Optional[List[str]]):
+def fetch_cnes_data_controller(
+    group_code: str,
+    years: List[int],
+    states: Optional[List[str]],
+    columns: Optional[List[str]] = None,
+    measure: Optional[str] = None,
+    layout: Optional[str] = None,
+    accept: Optional[str] = None
+):
     """
     Controller para buscar um resumo de dados do CNES.
     """
     try:
+        try:
+            response_layout = summary_response.negotiate_layout(layout, accept)
+        except summary_response.UnsupportedLayoutError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
         params = {
             "group_code": group_code,
             "years": years,
-            "states": [st.upper() for st in states] if states else None
+            "states": [st.upper() for st in states] if states else None,
+            "columns": [col.upper() for col in columns] if columns else None,
+            "measure": measure.upper() if measure else None
         }
 
         use_case = FetchDataCnesUseCase()
         # O UseCase agora já retorna a lista de resumo pronta
-        summary_list = use_case.execute(**params)
+        try:
+            summary_list = use_case.execute(**params)
+        except memory_budget.MemoryBudgetError as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        except datasus_store.IncompleteDownloadError as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
         if summary_list:
-            summary_response = {
+            response_content = {
                 "metadata": {
                     "system": "CNES",
                     "parameters": params,
@@ -28,10 +50,15 @@ def fetch_cnes_data_controller(group_code: str, years: List[int], states: Option
                 },
                 "summary_by_municipality": summary_list
             }
-            return JSONResponse(content=summary_response, status_code=status.HTTP_200_OK)
+            return summary_response.build_response(
+                response_content, "summary_by_municipality", response_layout, filename="cnes_resumo"
+            )
         else:
             raise HTTPException(status_code=404, detail="Nenhum dado encontrado para os parâmetros fornecidos.")
 
+    except HTTPException:
+        raise
+
     except Exception as e:
         print(f"Erro interno ao buscar dados do CNES: {e}")
         raise HTTPException(status_code=500, detail="Ocorreu um erro interno no servidor.")
\ No newline at end of file
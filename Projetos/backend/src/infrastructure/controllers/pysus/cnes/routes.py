@@ -1,6 +1,6 @@
 # src/infrastructure/controllers/pysus/cnes/routes.py
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Header, Query
 from typing import List, Optional
 
 
@@ -31,11 +31,19 @@ def get_cnes_variables_route():
 def get_cnes_data_route(
     group_code: str = Query(..., description="Código do grupo de dados. Ex: 'ST' para estabelecimentos.", example="ST"),
     years: List[int] = Query(..., description="Lista de anos para a consulta. Ex: 2022,2023", example=[2023]),
-    states: Optional[List[str]] = Query(None, description="Lista opcional de siglas de estados (UFs) para filtrar. Ex: PE,SP", example=["PE", "SP"])
+    states: Optional[List[str]] = Query(None, description="Lista opcional de siglas de estados (UFs) para filtrar. Ex: PE,SP", example=["PE", "SP"]),
+    columns: Optional[List[str]] = Query(None, description="Colunas extras do agrupamento, além do município. Ex: CODLEITO e COMPETEN (LT), CODEQUIP (EQ), CBO (PF)", example=["CODLEITO", "COMPETEN"]),
+    measure: Optional[str] = Query(None, description="Coluna numérica opcional a ser somada por grupo. Ex: QT_EXIST", example="QT_EXIST"),
+    layout: Optional[str] = Query(None, description="Layout do resumo: rows (padrão), columns (listas paralelas) ou arrow (Arrow IPC). Também pode ser negociado pelo cabeçalho Accept.", example="columns"),
+    accept: Optional[str] = Header(None)
 ):
 
     return fetch_cnes_data_controller(
         group_code=group_code, 
         years=years, 
-        states=states
+        states=states,
+        columns=columns,
+        measure=measure,
+        layout=layout,
+        accept=accept
     )
\ No newline at end of file
@@ -1,11 +1,12 @@
 # src/infrastructure/controllers/pysus/sia/routes.py
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Header, Query
 from typing import List, Optional
 
-# Importa os DOIS controllers que este roteador irá usar
+# Importa os controllers que este roteador irá usar
 from .get_variables_sia_controller import get_variables_sia_controller
 from .fetch_data_sia_controller import fetch_sia_data_controller
+from .get_summary_sia_controller import get_summary_sia_controller
 
 # Define um único roteador para todas as rotas do SIA
 sia_router = APIRouter()
@@ -28,11 +29,44 @@ def get_sia_data_route(
     group_code: str = Query(..., description="Código do grupo de dados. Ex: 'PA' para Produção Ambulatorial.", example="PA"),
     years: List[int] = Query(..., description="Lista de anos para a consulta. Ex: 2022,2023", example=[2023]),
     states: Optional[List[str]] = Query(None, description="Lista opcional de siglas de estados (UFs) para filtrar. Ex: PE,SP", example=["SP"]),
-    months: Optional[List[int]] = Query(None, description="Lista opcional de meses para filtrar. Ex: 1,2,3 para Jan/Fev/Mar", example=[1, 2])
+    months: Optional[List[int]] = Query(None, description="Lista opcional de meses para filtrar. Ex: 1,2,3 para Jan/Fev/Mar", example=[1, 2]),
+    format: Optional[str] = Query(None, description="Formato da resposta: json (padrão), ndjson, arrow ou parquet. Também pode ser negociado pelo cabeçalho Accept.", example="ndjson"),
+    accept: Optional[str] = Header(None)
 ):
     return fetch_sia_data_controller(
         group_code=group_code,
         years=years,
         states=states,
-        months=months
-    )
\ No newline at end of file
+        months=months,
+        response_format=format,
+        accept=accept
+    )
+
+
+# --- Rota 3: Resumo Agregado ---
+@sia_router.get(
+    "/summary",
+    tags=["PySUS - SIA"],
+    summary="Resumo agregado do SIA (contagem, soma e média) calculado no servidor"
+)
+def get_sia_summary_route(
+    group_code: str = Query(..., description="Código do grupo de dados.", example="PA"),
+    years: List[int] = Query(..., description="Lista de anos para a consulta. Ex: 2022,2023", example=[2023]),
+    states: Optional[List[str]] = Query(None, description="Lista opcional de siglas de estados (UFs) para filtrar.", example=["SP"]),
+    months: Optional[List[int]] = Query(None, description="Lista opcional de meses para filtrar.", example=[1]),
+    group_by: Optional[List[str]] = Query(None, description="Dimensões do agrupamento: municipality (padrão), month, procedure, diagnosis.", example=["municipality", "month"]),
+    measure: Optional[str] = Query(None, description="Coluna numérica usada na soma e na média. Padrão: PA_VALAPR (Valor aprovado do procedimento).", example="PA_VALAPR"),
+    aggregations: Optional[List[str]] = Query(None, description="Medidas: count, sum, mean (padrão: todas).", example=["count", "sum"])
+):
+    """
+    Endpoint que devolve só o resumo do SIA, agregado em streaming sobre os arquivos baixados.
+    """
+    return get_summary_sia_controller(
+        group_code=group_code,
+        years=years,
+        states=states,
+        months=months,
+        group_by=group_by,
+        measure=measure,
+        aggregations=aggregations
+    )
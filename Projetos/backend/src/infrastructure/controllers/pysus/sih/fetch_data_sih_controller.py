@@ -3,17 +3,32 @@
 from fastapi.responses import JSONResponse
 from fastapi import status, HTTPException
 from typing import List, Optional
-import pandas as pd
 
 # Verifique se o import do UseCase está correto
 from src.domain.use_cases.pysus.sih.fetch_data_sih_use_case import FetchDataSihUseCase
+from src.infrastructure.shared import datasus_store, parquet_reader, streaming_response
 
 # Verifique se o nome da função está escrito exatamente assim
-def fetch_sih_data_controller(group_code: str, years: List[int], states: Optional[List[str]], months: Optional[List[int]]):
+def fetch_sih_data_controller(
+    group_code: str,
+    years: List[int],
+    states: Optional[List[str]],
+    months: Optional[List[int]],
+    response_format: Optional[str] = None,
+    accept: Optional[str] = None
+):
     """
     Controller para buscar e baixar os dados completos do SIH.
+
+    Os registros são enviados em streaming, row group a row group, no formato negociado
+    (JSON, NDJSON, Arrow IPC ou Parquet), então a memória não cresce com o tamanho do resultado.
     """
     try:
+        try:
+            fmt = streaming_response.negotiate_format(response_format, accept)
+        except streaming_response.UnsupportedFormatError as e:
+            raise HTTPException(status_code=status.HTTP_406_NOT_ACCEPTABLE, detail=str(e))
+
         if not years:
             raise HTTPException(status_code=400, detail="O parâmetro 'years' é obrigatório.")
 
@@ -25,13 +40,14 @@ def fetch_sih_data_controller(group_code: str, years: List[int], states: Optiona
         }
 
         use_case = FetchDataSihUseCase()
-        sih_data_df = use_case.execute(**params)
+        parquet_files = use_case.execute(**params)
 
-        if isinstance(sih_data_df, pd.DataFrame) and not sih_data_df.empty:
-            response_data = sih_data_df.to_dict(orient='records')
-            return JSONResponse(
-                content=response_data,
-                status_code=status.HTTP_200_OK
+        if parquet_files:
+            # Só os rodapés são lidos aqui; os dados são decodificados enquanto a resposta é enviada.
+            schema = parquet_reader.unified_schema(parquet_files)
+            batches = parquet_reader.iter_batches(parquet_files, schema, streaming_response.STREAM_BATCH_ROWS)
+            return streaming_response.stream_batches(
+                batches, schema, fmt, filename=f"sih_{params['group_code']}"
             )
         else:
             return JSONResponse(
@@ -39,6 +55,12 @@ def fetch_sih_data_controller(group_code: str, years: List[int], states: Optiona
                 status_code=status.HTTP_404_NOT_FOUND
             )
 
+    except HTTPException:
+        raise
+
+    except datasus_store.IncompleteDownloadError as e:
+        return JSONResponse(content={"error": str(e)}, status_code=e.status_code)
+
     except Exception as e:
         print(f"Erro interno ao buscar dados do SIH: {e}")
         return JSONResponse(
@@ -0,0 +1,74 @@
+# src/infrastructure/controllers/pysus/sih/get_summary_sih_controller.py
+
+from fastapi.responses import JSONResponse
+from fastapi import status, HTTPException
+from typing import List, Optional
+
+from src.domain.use_cases.pysus.sih.get_summary_sih_use_case import GetSummarySihUseCase
+from src.infrastructure.shared import datasus_store, memory_budget
+
+def get_summary_sih_controller(
+    group_code: str,
+    years: List[int],
+    states: Optional[List[str]],
+    months: Optional[List[int]],
+    group_by: Optional[List[str]],
+    measure: Optional[str],
+    aggregations: Optional[List[str]]
+):
+    """
+    Controller para o resumo agregado do SIH (contagem, soma e média por dimensão).
+    """
+    try:
+        if not years:
+            raise HTTPException(status_code=400, detail="O parâmetro 'years' é obrigatório.")
+
+        params = {
+            "group_code": group_code.upper(),
+            "years": years,
+            "states": [st.upper() for st in states] if states else None,
+            "months": months,
+            "group_by": [dim.lower() for dim in group_by] if group_by else None,
+            "aggregations": [agg.lower() for agg in aggregations] if aggregations else None,
+        }
+        if measure:
+            params["measure"] = measure.upper()
+
+        use_case = GetSummarySihUseCase()
+        try:
+            result = use_case.execute(**params)
+        except memory_budget.MemoryBudgetError as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        except datasus_store.IncompleteDownloadError as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        if result and result.get("summary"):
+            summary_response = {
+                "metadata": {
+                    "system": "SIH",
+                    "parameters": params,
+                    "group_by": result["group_by"],
+                    "measure": result["measure"],
+                    "total_records_found": result["total_records"]
+                },
+                "columns": result.get("columns", []),
+                "summary": result["summary"]
+            }
+            return JSONResponse(content=summary_response, status_code=status.HTTP_200_OK)
+        else:
+            return JSONResponse(
+                content={"message": "Nenhum dado encontrado para os parâmetros fornecidos."},
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        print(f"Erro interno ao resumir dados do SIH: {e}")
+        return JSONResponse(
+            content={"error": "Ocorreu um erro interno no servidor."},
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
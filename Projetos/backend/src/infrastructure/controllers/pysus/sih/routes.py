@@ -1,11 +1,12 @@
 # src/infrastructure/controllers/pysus/sih/routes.py
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Header, Query
 from typing import List, Optional
 
-# Importa os DOIS controllers do SIH
+# Importa os controllers do SIH
 from .get_variables_sih_controller import get_variables_sih_controller
 from .fetch_data_sih_controller import fetch_sih_data_controller
+from .get_summary_sih_controller import get_summary_sih_controller
 
 # Define um único roteador para todas as rotas do SIH
 sih_router = APIRouter()
@@ -31,7 +32,9 @@ def get_sih_data_route(
     group_code: str = Query(..., description="Código do grupo de dados. Ex: 'RD' para Autorização de Internação Hospitalar.", example="RD"),
     years: List[int] = Query(..., description="Lista de anos para a consulta. Ex: 2022,2023", example=[2023]),
     states: Optional[List[str]] = Query(None, description="Lista opcional de siglas de estados (UFs) para filtrar. Ex: PE,SP", example=["PE"]),
-    months: Optional[List[int]] = Query(None, description="Lista opcional de meses para filtrar. Ex: 1,2,3 para Jan/Fev/Mar", example=[10, 11])
+    months: Optional[List[int]] = Query(None, description="Lista opcional de meses para filtrar. Ex: 1,2,3 para Jan/Fev/Mar", example=[10, 11]),
+    format: Optional[str] = Query(None, description="Formato da resposta: json (padrão), ndjson, arrow ou parquet. Também pode ser negociado pelo cabeçalho Accept.", example="ndjson"),
+    accept: Optional[str] = Header(None)
 ):
     """
     Endpoint para buscar dados do SIH (Sistema de Informações Hospitalares).
@@ -41,5 +44,36 @@ def get_sih_data_route(
         group_code=group_code,
         years=years,
         states=states,
-        months=months
-    )
\ No newline at end of file
+        months=months,
+        response_format=format,
+        accept=accept
+    )
+
+
+# --- Rota 3: Resumo Agregado ---
+@sih_router.get(
+    "/summary",
+    tags=["PySUS - SIH"],
+    summary="Resumo agregado do SIH (contagem, soma e média) calculado no servidor"
+)
+def get_sih_summary_route(
+    group_code: str = Query(..., description="Código do grupo de dados.", example="RD"),
+    years: List[int] = Query(..., description="Lista de anos para a consulta. Ex: 2022,2023", example=[2023]),
+    states: Optional[List[str]] = Query(None, description="Lista opcional de siglas de estados (UFs) para filtrar.", example=["PE"]),
+    months: Optional[List[int]] = Query(None, description="Lista opcional de meses para filtrar.", example=[1]),
+    group_by: Optional[List[str]] = Query(None, description="Dimensões do agrupamento: municipality (padrão), month, procedure, diagnosis.", example=["municipality", "month"]),
+    measure: Optional[str] = Query(None, description="Coluna numérica usada na soma e na média. Padrão: VAL_TOT (Valor total da AIH).", example="VAL_TOT"),
+    aggregations: Optional[List[str]] = Query(None, description="Medidas: count, sum, mean (padrão: todas).", example=["count", "sum"])
+):
+    """
+    Endpoint que devolve só o resumo do SIH, agregado em streaming sobre os arquivos baixados.
+    """
+    return get_summary_sih_controller(
+        group_code=group_code,
+        years=years,
+        states=states,
+        months=months,
+        group_by=group_by,
+        measure=measure,
+        aggregations=aggregations
+    )
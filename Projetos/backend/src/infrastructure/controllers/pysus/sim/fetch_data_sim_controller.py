@@ -1,16 +1,23 @@
 # src/infrastructure/controllers/pysus/sim/fetch_data_sim_controller.py
 
-from fastapi.responses import JSONResponse
-from fastapi import status, HTTPException
+from fastapi import HTTPException
 from typing import List, Optional
 
 # --- IMPORTAÇÃO CHAVE ---
 from fastapi.concurrency import run_in_threadpool 
 
 from src.domain.use_cases.pysus.sim.fetch_data_sim_use_case import FetchDataSimUseCase
+from src.infrastructure.shared import datasus_store, memory_budget, summary_response
 
 # O controller é async def, como o do SINAN
-async def fetch_sim_data_controller(group_code: str, years: List[int], states: Optional[List[str]]):
+async def fetch_sim_data_controller(
+    group_code: str,
+    years: List[int],
+    states: Optional[List[str]],
+    breakdown: Optional[List[str]] = None,
+    layout: Optional[str] = None,
+    accept: Optional[str] = None
+):
     """
     Controller que busca um resumo de dados do SIM de forma não-bloqueante (assíncrona).
     """
@@ -18,17 +25,30 @@ async def fetch_sim_data_controller(group_code: str, years: List[int], states: O
         if not years:
             raise HTTPException(status_code=400, detail="O parâmetro 'years' é obrigatório.")
 
+        try:
+            response_layout = summary_response.negotiate_layout(layout, accept)
+        except summary_response.UnsupportedLayoutError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
         params = {
             "group_code": group_code.upper(),
             "years": years,
-            "states": [st.upper() for st in states] if states else None 
+            "states": [st.upper() for st in states] if states else None,
+            "breakdown": [dim.lower() for dim in breakdown] if breakdown else None
         }
 
         use_case = FetchDataSimUseCase()
 
         # --- CHAVE DE CORREÇÃO ---
         # AQUI usamos AWAIT run_in_threadpool para executar o Use Case SÍNCRONO em background
-        result_dict = await run_in_threadpool(use_case.execute, **params)
+        try:
+            result_dict = await run_in_threadpool(use_case.execute, **params)
+        except memory_budget.MemoryBudgetError as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        except datasus_store.IncompleteDownloadError as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
         # --- CORREÇÃO 1: Extrair AMBAS as chaves do resultado ---
         summary_list = result_dict.get("summary_by_municipality", [])
@@ -36,7 +56,7 @@ async def fetch_sim_data_controller(group_code: str, years: List[int], states: O
 
         if summary_list:
             # --- CORREÇÃO 2: Adicionar as colunas na resposta final ---
-            summary_response = {
+            response_content = {
                 "metadata": {
                     "system": "SIM",
                     "parameters": params,
@@ -46,7 +66,9 @@ async def fetch_sim_data_controller(group_code: str, years: List[int], states: O
                 "columns": columns_list, # <-- ESTAVA FALTANDO ISSO
                 "summary_by_municipality": summary_list
             }
-            return JSONResponse(content=summary_response, status_code=status.HTTP_200_OK)
+            return summary_response.build_response(
+                response_content, "summary_by_municipality", response_layout, filename="sim_resumo"
+            )
         else:
             
             raise HTTPException(status_code=404, detail="Nenhum dado encontrado para os parâmetros fornecidos.")
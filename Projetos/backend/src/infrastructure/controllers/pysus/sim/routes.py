@@ -1,6 +1,6 @@
 # src/infrastructure/controllers/pysus/sim/routes.py
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Header, Query
 from typing import List, Optional
 
 # Importa os DOIS controllers do SIM
@@ -31,7 +31,10 @@ def get_sim_variables_route():
 async def get_sim_data_route(
     group_code: str = Query(..., description="Código do grupo de dados. Ex: 'DO' para Declaração de Óbito.", example="CID10"),
     years: List[int] = Query(..., description="Lista de anos para a consulta. Ex: 2021,2022", example=[2022]),
-    states: Optional[List[str]] = Query(None, description="Lista opcional de siglas de estados (UFs) para filtrar. Ex: PE,SP", example=["PE"])
+    states: Optional[List[str]] = Query(None, description="Lista opcional de siglas de estados (UFs) para filtrar. Ex: PE,SP", example=["PE"]),
+    breakdown: Optional[List[str]] = Query(None, description="Dimensões extras além do município: year, month (data do óbito), cause_chapter, cause_group, cause_category (CID-10 da CAUSABAS), age_band, sex, race...", example=["cause_chapter", "age_band"]),
+    layout: Optional[str] = Query(None, description="Layout do resumo: rows (padrão), columns (listas paralelas) ou arrow (Arrow IPC). Também pode ser negociado pelo cabeçalho Accept.", example="columns"),
+    accept: Optional[str] = Header(None)
 ):
     """
     Endpoint para buscar dados do SIM (Sistema de Informações sobre Mortalidade).
@@ -41,5 +44,8 @@ async def get_sim_data_route(
     return await fetch_sim_data_controller(
         group_code=group_code,
         years=years,
-        states=states
+        states=states,
+        breakdown=breakdown,
+        layout=layout,
+        accept=accept
     )
\ No newline at end of file
@@ -1,24 +1,45 @@
-from fastapi.responses import JSONResponse
 from fastapi import status, HTTPException
 from typing import List, Optional, Dict, Any
 from fastapi.concurrency import run_in_threadpool
 
 from src.domain.use_cases.pysus.sinan.fetch_data_sinan_use_case import FetchDataSinanUseCase
+from src.infrastructure.shared import datasus_store, memory_budget, summary_response
 
 # A função do controller agora também é 'async def'
-async def fetch_sinan_data_controller(disease_code: str, years: List[int], states: Optional[List[str]]):
+async def fetch_sinan_data_controller(
+    disease_code: str,
+    years: List[int],
+    states: Optional[List[str]],
+    layout: Optional[str] = None,
+    accept: Optional[str] = None,
+    by_year: bool = False,
+    breakdown: Optional[List[str]] = None
+):
    
     try:
+        try:
+            response_layout = summary_response.negotiate_layout(layout, accept)
+        except summary_response.UnsupportedLayoutError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
         params = {
             "disease_code": disease_code,
             "years": years,
-            "states": states
+            "states": states,
+            "breakdown": [dim.lower() for dim in breakdown] if breakdown else None
         }
 
         use_case = FetchDataSinanUseCase()
 
         
-        result_dict: Optional[Dict[str, Any]] = await run_in_threadpool(use_case.execute, **params)
+        try:
+            result_dict: Optional[Dict[str, Any]] = await run_in_threadpool(use_case.execute, **params)
+        except memory_budget.MemoryBudgetError as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        except datasus_store.IncompleteDownloadError as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
        
         if result_dict and "summary" in result_dict:
@@ -31,22 +52,32 @@ async def fetch_sinan_data_controller(disease_code: str, years: List[int], state
                 
                 
                 total_records = sum(item['total_cases'] for item in summary_list)
+                year_summaries = result_dict.get("by_year", [])
 
-                summary_response = {
+                response_content = {
                     "metadata": {
                         "system": "SINAN",
                         "parameters": params,
                         "columns": column_names, 
-                        "total_records_found": total_records
+                        "total_records_found": total_records,
+                        "total_records_by_year": {str(item["year"]): item["total_cases"] for item in year_summaries}
                     },
                     "summary_by_municipality": summary_list
                 }
-                return JSONResponse(content=summary_response, status_code=status.HTTP_200_OK)
+                if by_year:
+                    # Casos por município de cada ano, calculados na mesma passada do total.
+                    response_content["summary_by_year"] = year_summaries
+                return summary_response.build_response(
+                    response_content, "summary_by_municipality", response_layout, filename="sinan_resumo"
+                )
             
             
             else:
-                return JSONResponse(
-                    content={"metadata": {"columns": column_names, "total_records_found": 0}, "summary_by_municipality": []},
+                return summary_response.build_response(
+                    {"metadata": {"columns": column_names, "total_records_found": 0}, "summary_by_municipality": []},
+                    "summary_by_municipality",
+                    response_layout,
+                    fields=["municipality_code", "total_cases"],
                     status_code=status.HTTP_200_OK # Retorna 200 OK com lista vazia é comum para "nenhum resultado"
                 )
 
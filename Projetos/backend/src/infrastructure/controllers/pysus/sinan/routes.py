@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Header, Query
 from typing import List, Optional
 
 # Os imports dos controllers continuam os mesmos
@@ -28,7 +28,11 @@ def get_sinan_variables_route():
 async def get_sinan_data_route(
     disease_code: str = Query(..., description="Código do agravo (doença). Ex: 'DENG' para Dengue.", example="DENG"),
     years: List[int] = Query(..., description="Lista de anos para a consulta. Ex: 2022,2023", example=[2023]),
-    states: Optional[List[str]] = Query(None, description="Lista opcional de siglas de estados (UFs) para filtrar. Ex: PE,SP", example=["PE"])
+    states: Optional[List[str]] = Query(None, description="Lista opcional de siglas de estados (UFs) para filtrar. Ex: PE,SP", example=["PE"]),
+    layout: Optional[str] = Query(None, description="Layout do resumo: rows (padrão), columns (listas paralelas) ou arrow (Arrow IPC). Também pode ser negociado pelo cabeçalho Accept.", example="columns"),
+    breakdown: Optional[List[str]] = Query(None, description="Dimensões extras além do município, numa única leitura: year, month, epi_week (semana epidemiológica), sex, race, classification, evolution.", example=["epi_week"]),
+    by_year: bool = Query(False, description="Inclui também os casos por município de cada ano ('summary_by_year').", example=False),
+    accept: Optional[str] = Header(None)
 ):
     """
     Endpoint para buscar um resumo de dados do SINAN de forma não-bloqueante.
@@ -37,5 +41,9 @@ async def get_sinan_data_route(
     return await fetch_sinan_data_controller(
         disease_code=disease_code,
         years=years,
-        states=states
+        states=states,
+        layout=layout,
+        accept=accept,
+        by_year=by_year,
+        breakdown=breakdown
     )
\ No newline at end of file
@@ -4,29 +4,59 @@ from fastapi.responses import JSONResponse
 from fastapi import status, HTTPException
 from typing import List, Optional
 
-from src.domain.use_cases.pysus.sinasc.get_summary_sinasc_use_case import GetSummarySinascUseCase
+from src.domain.use_cases.pysus.sinasc.get_summary_sinasc_use_case import GetSummarySinascUseCase, RECORD_FIELDS
+from src.infrastructure.shared import datasus_store, memory_budget, summary_response
 
 
-def get_sinasc_summary_controller(group_code: str, years: List[int], states: Optional[List[str]]):
+def get_sinasc_summary_controller(
+    group_code: str,
+    years: List[int],
+    states: Optional[List[str]],
+    layout: Optional[str] = None,
+    accept: Optional[str] = None,
+    breakdown: Optional[List[str]] = None
+):
     
     try:
+        try:
+            response_layout = summary_response.negotiate_layout(layout, accept)
+        except summary_response.UnsupportedLayoutError as e:
+            return JSONResponse(content={"error": str(e)}, status_code=status.HTTP_400_BAD_REQUEST)
+
         if not years:
             raise HTTPException(status_code=400, detail="O parâmetro 'years' é obrigatório.")
 
         params = {
             "group_code": group_code.upper(),
             "years": years,
-            "states": [st.upper() for st in states] if states else None
+            "states": [st.upper() for st in states] if states else None,
+            "breakdown": [dim.lower() for dim in breakdown] if breakdown else None
         }
 
         use_case = GetSummarySinascUseCase()
-        result_dict = use_case.execute(**params)
+        try:
+            result_dict = use_case.execute(**params)
+        except memory_budget.MemoryBudgetError as e:
+            return JSONResponse(content={"error": str(e)}, status_code=e.status_code)
+        except datasus_store.IncompleteDownloadError as e:
+            return JSONResponse(content={"error": str(e)}, status_code=e.status_code)
+        except ValueError as e:
+            return JSONResponse(content={"error": str(e)}, status_code=status.HTTP_400_BAD_REQUEST)
         summary_data = result_dict.get("summary")
+        # Registros planos (município, sexo, faixa etária, contagem), usados pelos layouts colunares.
+        records = result_dict.pop("records", [])
 
         if summary_data: 
-            return JSONResponse(
-                content=result_dict, 
-                status_code=status.HTTP_200_OK
+            if response_layout == summary_response.DEFAULT_LAYOUT:
+                return JSONResponse(
+                    content=result_dict, 
+                    status_code=status.HTTP_200_OK
+                )
+            # Nos layouts colunares o summary aninhado dá lugar aos registros planos.
+            return summary_response.build_response(
+                {**result_dict, "summary": records}, "summary", response_layout,
+                # Com breakdown, os campos vêm das dimensões pedidas.
+                fields=None if params["breakdown"] else RECORD_FIELDS, filename="sinasc_resumo"
             )
         else:
             
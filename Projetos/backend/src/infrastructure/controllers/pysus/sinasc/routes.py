@@ -1,6 +1,6 @@
 # src/infrastructure/controllers/pysus/sinasc/routes.py
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Header, Query
 from typing import List, Optional
 
 # Importa os DOIS controllers do SINASC
@@ -30,7 +30,10 @@ def get_sinasc_variables_route():
 def get_sinasc_summary_route(
     group_code: str = Query(..., description="Código do grupo de dados. Ex: 'DN' para Declaração de Nascido Vivo.", example="DN"),
     years: List[int] = Query(..., description="Lista de anos para a consulta. Ex: 2021,2022", example=[2022]),
-    states: Optional[List[str]] = Query(None, description="Lista opcional de siglas de estados (UFs) para filtrar. Ex: PE,SP", example=["PE"])
+    states: Optional[List[str]] = Query(None, description="Lista opcional de siglas de estados (UFs) para filtrar. Ex: PE,SP", example=["PE"]),
+    layout: Optional[str] = Query(None, description="Layout do resumo: rows (padrão), columns (listas paralelas) ou arrow (Arrow IPC). Também pode ser negociado pelo cabeçalho Accept.", example="columns"),
+    breakdown: Optional[List[str]] = Query(None, description="Dimensões extras além do município, numa única leitura: year, month, sex, age_group, race, delivery. Devolve registros planos em 'summary'.", example=["year"]),
+    accept: Optional[str] = Header(None)
 ):
     """
     Endpoint para buscar um sumário agregado de dados do SINASC.
@@ -39,5 +42,8 @@ def get_sinasc_summary_route(
     return get_sinasc_summary_controller(
         group_code=group_code,
         years=years,
-        states=states
+        states=states,
+        layout=layout,
+        accept=accept,
+        breakdown=breakdown
     )
\ No newline at end of file
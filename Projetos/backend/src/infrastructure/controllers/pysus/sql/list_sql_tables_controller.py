@@ -0,0 +1,21 @@
+# src/infrastructure/controllers/pysus/sql/list_sql_tables_controller.py
+
+from fastapi.responses import JSONResponse
+from fastapi import status
+
+from src.domain.use_cases.pysus.sql.run_sql_query_use_case import RunSqlQueryUseCase
+
+def list_sql_tables_controller():
+    """
+    Controller que lista as tabelas (views) disponíveis para consulta SQL, com suas colunas.
+    """
+    try:
+        tables = RunSqlQueryUseCase().list_tables()
+        return JSONResponse(content={"tables": tables}, status_code=status.HTTP_200_OK)
+
+    except Exception as e:
+        print(f"Erro de servidor ao listar as tabelas SQL: {e}")
+        return JSONResponse(
+            content={"error": "Ocorreu um erro interno ao listar as tabelas."},
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
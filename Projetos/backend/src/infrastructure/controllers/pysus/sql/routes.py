@@ -0,0 +1,38 @@
+# src/infrastructure/controllers/pysus/sql/routes.py
+
+from fastapi import APIRouter, Body, Header, Query
+from typing import Optional
+
+from .list_sql_tables_controller import list_sql_tables_controller
+from .run_sql_query_controller import run_sql_query_controller
+
+# Roteador da consulta SQL sobre o armazenamento local, montado em '/pysus/sql'
+sql_router = APIRouter()
+
+@sql_router.get(
+    "/tables",
+    tags=["PySUS"],
+    summary="Lista as tabelas disponíveis para consulta SQL (uma por sistema/grupo baixado)"
+)
+def list_sql_tables_route():
+    """
+    Cada sistema/grupo já baixado vira uma tabela (ex.: sim_cid10, sinan_deng) com todas as UFs e anos.
+    """
+    return list_sql_tables_controller()
+
+
+@sql_router.post(
+    "/query",
+    tags=["PySUS"],
+    summary="Consulta SQL somente leitura sobre os microdados locais do DATASUS"
+)
+def run_sql_query_route(
+    query: str = Body(..., embed=True, description="Uma única consulta SELECT.", example="SELECT CAUSABAS, count(*) AS total FROM sim_cid10 GROUP BY 1 ORDER BY 2 DESC"),
+    max_rows: Optional[int] = Query(None, description="Limite de linhas (no máximo SQL_MAX_ROWS).", example=1000),
+    layout: Optional[str] = Query(None, description="Layout das linhas: rows (padrão), columns (listas paralelas) ou arrow (Arrow IPC).", example="columns"),
+    accept: Optional[str] = Header(None)
+):
+    """
+    Só SELECT; leitura restrita ao armazenamento local; limites de linhas e de tempo por consulta.
+    """
+    return run_sql_query_controller(query=query, max_rows=max_rows, layout=layout, accept=accept)
@@ -0,0 +1,62 @@
+# src/infrastructure/controllers/pysus/sql/run_sql_query_controller.py
+
+from fastapi.responses import JSONResponse
+from fastapi import status, HTTPException
+from typing import Optional
+
+from src.domain.use_cases.pysus.sql.run_sql_query_use_case import RunSqlQueryUseCase
+from src.infrastructure.shared import sql_engine, summary_response
+
+def run_sql_query_controller(
+    query: str,
+    max_rows: Optional[int] = None,
+    layout: Optional[str] = None,
+    accept: Optional[str] = None
+):
+    """
+    Controller da consulta SQL somente leitura sobre os parquets locais do DATASUS.
+    """
+    try:
+        try:
+            response_layout = summary_response.negotiate_layout(layout, accept)
+        except summary_response.UnsupportedLayoutError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        if max_rows is not None and max_rows < 1:
+            raise HTTPException(status_code=400, detail="O parâmetro 'max_rows' deve ser maior que zero.")
+
+        use_case = RunSqlQueryUseCase()
+        try:
+            result = use_case.execute(query=query, max_rows=max_rows)
+        except sql_engine.SqlTimeoutError as e:
+            raise HTTPException(status_code=status.HTTP_408_REQUEST_TIMEOUT, detail=str(e))
+        except sql_engine.SqlQueryError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        response_content = {
+            "metadata": {
+                "query": query,
+                "row_count": result["row_count"],
+                "truncated": result["truncated"],
+                "max_rows": min(max_rows or sql_engine.SQL_MAX_ROWS, sql_engine.SQL_MAX_ROWS),
+                "elapsed_seconds": result["elapsed_seconds"]
+            },
+            "columns": result["columns"],
+            "rows": result["rows"]
+        }
+        return summary_response.build_response(
+            response_content, "rows", response_layout,
+            fields=[column["name"] for column in result["columns"]],
+            filename="consulta_sql",
+            table=result["table"]
+        )
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        print(f"Erro interno ao executar consulta SQL: {e}")
+        return JSONResponse(
+            content={"error": "Ocorreu um erro interno no servidor."},
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
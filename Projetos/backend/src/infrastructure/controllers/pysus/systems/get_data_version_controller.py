@@ -0,0 +1,23 @@
+# src/infrastructure/controllers/pysus/systems/get_data_version_controller.py
+
+from fastapi.responses import JSONResponse
+from fastapi import status
+
+from src.infrastructure.shared import data_version
+
+def get_data_version_controller():
+    """
+    Controller que devolve a versão dos dados locais do DATASUS (token geral e por sistema).
+    """
+    try:
+        return JSONResponse(
+            content={"data_version": data_version.get_token(), "systems": data_version.get_versions()},
+            status_code=status.HTTP_200_OK
+        )
+
+    except Exception as e:
+        print(f"Erro de servidor ao consultar a versão dos dados: {e}")
+        return JSONResponse(
+            content={"error": "Ocorreu um erro interno ao consultar a versão dos dados."},
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
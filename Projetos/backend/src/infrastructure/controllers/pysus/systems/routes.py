@@ -3,6 +3,7 @@
 from fastapi import APIRouter
 # O import do controller agora usa '.' porque está na mesma pasta
 from .get_available_systems_controller import get_available_pysus_systems_controller
+from .get_data_version_controller import get_data_version_controller
 
 # Vamos dar um nome específico para este roteador para ficar claro
 systems_router = APIRouter()
@@ -16,4 +17,16 @@ def get_pysus_systems_route():
     """
     Endpoint para obter a lista de todos os sistemas PySUS disponíveis.
     """
-    return get_available_pysus_systems_controller()
\ No newline at end of file
+    return get_available_pysus_systems_controller()
+
+@systems_router.get(
+    "/data-version",
+    tags=["PySUS"],
+    summary="Versão dos dados do DATASUS armazenados localmente"
+)
+def get_data_version_route():
+    """
+    Token que muda sempre que a sincronização com o FTP atualiza algum arquivo.
+    Use-o na chave dos caches para descartar resultados antigos.
+    """
+    return get_data_version_controller()
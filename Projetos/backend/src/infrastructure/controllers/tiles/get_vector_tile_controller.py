@@ -0,0 +1,70 @@
+import hashlib
+from fastapi import HTTPException
+from fastapi.responses import Response
+from typing import Optional
+
+from src.domain.use_cases.maps.get_vector_tile_use_case import PLAIN_VARIANT, GetVectorTileUseCase
+from src.infrastructure.shared import datasus_store, vector_tiles
+
+# Tiles só com geometria mudam apenas com a malha (o ano dela está na URL).
+PLAIN_CACHE_CONTROL = "public, max-age=86400"
+# Tiles com métricas mudam a cada sincronização sem a URL mudar: o navegador guarda o
+# tile, mas confirma pelo ETag (derivado da versão dos dados) antes de reutilizá-lo.
+METRIC_CACHE_CONTROL = "no-cache"
+
+
+def _etag(geometry_year: int, variant: str) -> str:
+    return '"' + hashlib.sha1(f"{geometry_year}/{variant}".encode()).hexdigest()[:20] + '"'
+
+
+def _etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+def get_vector_tile(
+    layer: str,
+    z: int,
+    x: int,
+    y: int,
+    geometry_year: int,
+    year: Optional[int] = None,
+    sinasc_group: Optional[str] = None,
+    disease_code: Optional[str] = None,
+    if_none_match: Optional[str] = None,
+):
+
+    try:
+        use_case = GetVectorTileUseCase()
+        variant = use_case.variant(layer, year, sinasc_group, disease_code)
+        if variant == PLAIN_VARIANT:
+            headers = {"Cache-Control": PLAIN_CACHE_CONTROL}
+        else:
+            headers = {"Cache-Control": METRIC_CACHE_CONTROL, "ETag": _etag(geometry_year, variant)}
+            if _etag_matches(headers["ETag"], if_none_match):
+                # Mesma versão dos dados que o navegador já tem: nada é montado nem enviado.
+                return Response(status_code=304, headers=headers)
+
+        tile = use_case.execute(
+            layer=layer,
+            z=z,
+            x=x,
+            y=y,
+            geometry_year=geometry_year,
+            year=year,
+            sinasc_group=sinasc_group,
+            disease_code=disease_code,
+        )
+        return Response(content=tile, media_type=vector_tiles.MEDIA_TYPE, headers=headers)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    except datasus_store.IncompleteDownloadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    except Exception as e:
+        print(f"❌ ERRO INTERNO no controller de tiles: {e}")
+        raise HTTPException(status_code=500, detail="Ocorreu um erro interno no servidor ao gerar o tile.")
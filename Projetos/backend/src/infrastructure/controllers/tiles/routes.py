@@ -0,0 +1,64 @@
+# src/infrastructure/controllers/tiles/routes.py
+
+from fastapi import APIRouter, Header, Path, Query
+from enum import Enum
+from typing import Optional
+
+from src.infrastructure.shared import geometry_registry
+from .get_vector_tile_controller import get_vector_tile
+
+class TileLayer(str, Enum):
+    state = "state"
+    municipality = "municipality"
+    immediate_region = "immediate_region"
+    intermediate_region = "intermediate_region"
+
+# Roteador dos tiles vetoriais, montado em '/tiles'
+tiles_router = APIRouter()
+
+@tiles_router.get(
+    "/{layer}/{z}/{x}/{y}.mvt",
+    tags=["Mapas"],
+    summary="Tile vetorial (Mapbox Vector Tile) de uma camada geográfica, com métricas por município opcionais"
+)
+def get_vector_tile_route(
+    layer: TileLayer,
+    z: int = Path(..., ge=0, le=22, description="Zoom (esquema XYZ do Web Mercator)."),
+    x: int = Path(..., ge=0),
+    y: int = Path(..., ge=0),
+    geometry_year: int = Query(
+        default=geometry_registry.CONTEXT_YEAR,
+        description="Ano da malha do geobr."
+    ),
+    year: Optional[int] = Query(
+        default=None,
+        description="Ano dos dados anexados (obrigatório com 'sinasc_group' ou 'disease_code').",
+        example=2022
+    ),
+    sinasc_group: Optional[str] = Query(
+        default=None,
+        description="Anexa 'total_births' do SINASC por município (ex.: 'DN'). Só na camada 'municipality'.",
+        example="DN"
+    ),
+    disease_code: Optional[str] = Query(
+        default=None,
+        description="Anexa 'total_cases' do SINAN por município (ex.: 'DENG'). Só na camada 'municipality'.",
+        example="DENG"
+    ),
+    if_none_match: Optional[str] = Header(default=None, include_in_schema=False)
+):
+    """
+    Para mapas web (MapLibre, Leaflet, OpenLayers): `.../tiles/municipality/{z}/{x}/{y}.mvt`.
+    O nível de simplificação das geometrias acompanha o zoom, e cada tile é gerado uma vez e guardado em disco.
+    """
+    return get_vector_tile(
+        layer=layer.value,
+        z=z,
+        x=x,
+        y=y,
+        geometry_year=geometry_year,
+        year=year,
+        sinasc_group=sinasc_group,
+        disease_code=disease_code,
+        if_none_match=if_none_match,
+    )
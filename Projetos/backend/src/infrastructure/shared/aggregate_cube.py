@@ -0,0 +1,220 @@
+# src/infrastructure/shared/aggregate_cube.py
+"""
+Cubos de contagem pré-calculados para os sistemas do DATASUS.
+
+Um cubo guarda, em parquet, quantos registros existem para cada combinação de
+UF do arquivo × ano × mês × município × sexo × faixa etária. Há um arquivo por
+sistema, grupo (ou agravo) e ano:
+
+    <raiz>/<SISTEMA>/<GRUPO>/<ano>.parquet
+
+Os casos de uso consultam o cubo antes de baixar os microdados; se algum ano
+pedido não tiver cubo (ou o cubo não cobrir as UFs pedidas), caem no caminho
+antigo, lendo os arquivos brutos. Os cubos são gerados pelo script
+scripts/build_cubes.py.
+
+Configuração (variáveis de ambiente):
+    DATASUS_CUBE_DIR  pasta raiz dos cubos (padrão: <DATASUS_STORE_DIR>/cubes).
+"""
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from src.infrastructure.shared import aggregation, data_utils, datasus_store
+
+CUBE_DIR = os.environ.get("DATASUS_CUBE_DIR", str(Path(datasus_store.STORE_DIR) / "cubes"))
+
+# Dimensões do cubo, na ordem em que são gravadas.
+UF = "uf"
+YEAR = "year"
+MONTH = "month"
+MUNICIPALITY = "municipality_code"
+SEX = "sex"
+AGE_GROUP = "age_group"
+DIMENSIONS = [UF, YEAR, MONTH, MUNICIPALITY, SEX, AGE_GROUP]
+COUNT = aggregation.COUNT_COLUMN
+
+# Valor gravado quando a dimensão não existe no sistema (ex.: faixa etária no CNES)
+# ou o arquivo não é separado por UF/mês (ex.: SINAN é nacional e anual).
+NOT_AVAILABLE = ""
+ALL_STATES = "ALL"
+
+CUBE_SCHEMA = pa.schema([
+    pa.field(UF, pa.string()),
+    pa.field(YEAR, pa.int16()),
+    pa.field(MONTH, pa.int8()),
+    pa.field(MUNICIPALITY, data_utils.MUNICIPALITY_CODE_TYPE),
+    pa.field(SEX, pa.string()),
+    pa.field(AGE_GROUP, pa.string()),
+    pa.field(COUNT, pa.int64()),
+])
+
+# Chaves gravadas nos metadados do parquet.
+METADATA_STATES = b"datasus.states"
+METADATA_SOURCE_COLUMNS = b"datasus.source_columns"
+METADATA_SOURCE_KEYS = b"datasus.source_keys"
+METADATA_FORMAT = b"datasus.format"
+
+# Versão do conteúdo dos cubos. Na 2, o sexo vem sem espaços nas pontas (nulo quando falta),
+# como na dimensão 'text' do summary_engine, registros sem município entram com município
+# nulo, e mês e faixa etária saem de cada registro no SIM/SINAN/SINASC. Cubos sem a chave
+# de formato são da versão 1.
+CUBE_FORMAT = 2
+
+
+def cube_path(system: str, group: str, year: int, root_dir: str = CUBE_DIR) -> Path:
+    return Path(root_dir) / system.upper() / group.upper() / f"{int(year)}.parquet"
+
+
+def write_cube(
+    system: str,
+    group: str,
+    year: int,
+    counts: pa.Table,
+    states: Optional[List[str]] = None,
+    source_columns: Optional[List[str]] = None,
+    source_keys: Optional[List[str]] = None,
+    root_dir: str = CUBE_DIR
+) -> Path:
+    """
+    Grava o cubo de um ano. `counts` precisa ter as colunas de CUBE_SCHEMA.
+
+    `states` registra quais UFs foram usadas na construção (None = todas), para que
+    uma consulta por uma UF fora do cubo não receba zero em vez de cair nos dados brutos.
+    """
+    path = cube_path(system, group, year, root_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    table = counts.select(CUBE_SCHEMA.names).cast(CUBE_SCHEMA)
+    table = table.sort_by([(UF, "ascending"), (MONTH, "ascending"), (MUNICIPALITY, "ascending")])
+    table = table.replace_schema_metadata({
+        METADATA_STATES: json.dumps(sorted(s.upper() for s in states) if states else ALL_STATES).encode(),
+        METADATA_SOURCE_COLUMNS: json.dumps(source_columns or []).encode(),
+        METADATA_SOURCE_KEYS: json.dumps(source_keys or []).encode(),
+        METADATA_FORMAT: str(CUBE_FORMAT).encode(),
+    })
+
+    # Escrita atômica: uma consulta nunca lê um cubo gravado pela metade. O nome temporário
+    # é único, para o script e a sincronização poderem gravar o mesmo cubo ao mesmo tempo.
+    fd, temp_name = tempfile.mkstemp(prefix=f"{path.name}.", suffix=".tmp", dir=path.parent)
+    os.close(fd)
+    try:
+        pq.write_table(table, temp_name)
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+    return path
+
+
+_cache: Dict[Path, Tuple[float, pa.Table, Dict[bytes, bytes]]] = {}
+_cache_lock = threading.Lock()
+
+
+def _read_cube(path: Path) -> Tuple[pa.Table, Dict[bytes, bytes]]:
+    """Lê um cubo mantendo-o em memória enquanto o arquivo não mudar (os cubos são pequenos)."""
+    modified_at = path.stat().st_mtime
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == modified_at:
+            return cached[1], cached[2]
+
+    table = pq.read_table(path)
+    metadata = table.schema.metadata or {}
+    with _cache_lock:
+        _cache[path] = (modified_at, table, metadata)
+    return table, metadata
+
+
+def _covers_states(metadata: Dict[bytes, bytes], states: Optional[List[str]]) -> bool:
+    covered = json.loads(metadata.get(METADATA_STATES, json.dumps(ALL_STATES).encode()))
+    if covered == ALL_STATES:
+        return True
+    return bool(states) and {s.upper() for s in states} <= set(covered)
+
+
+def lookup(
+    system: str,
+    group: str,
+    years: Sequence[int],
+    states: Optional[List[str]] = None,
+    root_dir: str = CUBE_DIR,
+    min_format: int = 1
+) -> Optional[Tuple[pa.Table, List[str]]]:
+    """
+    Devolve (contagens, colunas dos arquivos de origem) quando há cubo para todos os anos pedidos.
+
+    As linhas já vêm restritas aos arquivos das UFs pedidas, como o get_files(uf=...) do
+    PySUS faria; o filtro por município (filter_table_by_states) fica com o caso de uso.
+    Quem usa sexo, mês ou faixa etária pede `min_format=CUBE_FORMAT`: um cubo antigo só serve
+    para os totais por município. Retorna None quando é preciso cair nos arquivos brutos.
+    """
+    if not years:
+        return None
+
+    tables: List[pa.Table] = []
+    source_columns: List[str] = []
+    for year in years:
+        path = cube_path(system, group, year, root_dir)
+        if not path.is_file():
+            return None
+        try:
+            table, metadata = _read_cube(path)
+        except (OSError, pa.ArrowInvalid) as e:
+            print(f" -> [Cubo] Cubo ilegível em {path}, usando os arquivos brutos: {e}")
+            return None
+        if not _covers_states(metadata, states):
+            return None
+        if int(metadata.get(METADATA_FORMAT, b"1")) < min_format:
+            print(f" -> [Cubo] {path} é de um formato antigo; usando os arquivos brutos até ele ser refeito.")
+            return None
+        if not source_columns:
+            source_columns = json.loads(metadata.get(METADATA_SOURCE_COLUMNS, b"[]"))
+        tables.append(table)
+
+    counts = pa.concat_tables(tables)
+    if states:
+        # Arquivos nacionais (sem UF) valem para qualquer UF, como no get_files do PySUS.
+        file_states = pa.array([s.upper() for s in states] + [NOT_AVAILABLE])
+        counts = counts.filter(pc.is_in(counts.column(UF), value_set=file_states))
+
+    print(f" -> [Cubo] {system.upper()}/{group.upper()} {list(years)} respondido pelo cubo ({counts.num_rows} linhas).")
+    return counts, source_columns
+
+
+def source_keys(system: str, group: str, year: int, root_dir: str = CUBE_DIR) -> List[str]:
+    """Chaves do datasus_store dos arquivos usados para construir o cubo de um ano."""
+    path = cube_path(system, group, year, root_dir)
+    if not path.is_file():
+        return []
+    _, metadata = _read_cube(path)
+    return json.loads(metadata.get(METADATA_SOURCE_KEYS, b"[]"))
+
+
+def list_cubes(root_dir: str = CUBE_DIR) -> List[Dict[str, Any]]:
+    """Cubos gravados, com as UFs cobertas (None = todas) e as chaves dos arquivos de origem."""
+    cubes: List[Dict[str, Any]] = []
+    for path in sorted(Path(root_dir).glob("*/*/*.parquet")):
+        if not path.stem.isdigit():
+            continue
+        try:
+            _, metadata = _read_cube(path)
+        except (OSError, pa.ArrowInvalid) as e:
+            print(f" -> [Cubo] Cubo ilegível em {path}: {e}")
+            continue
+        states = json.loads(metadata.get(METADATA_STATES, json.dumps(ALL_STATES).encode()))
+        cubes.append({
+            "system": path.parent.parent.name,
+            "group": path.parent.name,
+            "year": int(path.stem),
+            "states": None if states == ALL_STATES else states,
+            "source_keys": json.loads(metadata.get(METADATA_SOURCE_KEYS, b"[]")),
+        })
+    return cubes
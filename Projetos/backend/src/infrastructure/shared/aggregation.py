@@ -0,0 +1,479 @@
+# src/infrastructure/shared/aggregation.py
+"""
+Arrow-native group-by counts shared by the PySUS summary use cases (SIM, SINAN, SINASC, CNES),
+plus count/sum/mean measures for the SIH and SIA summaries.
+
+Each row group is counted directly on its Arrow table with the pyarrow compute
+kernels (multi-threaded, no per-row Python objects). The partial results are small
+tables that are concatenated and re-aggregated, so they can be merged in any order,
+including results coming from other threads or processes.
+"""
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+import pyarrow as pa
+import pyarrow.compute as pc
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+COUNT_COLUMN = "count"
+# Quantidade de parciais acumuladas antes de compactá-las em uma só tabela.
+COMPACT_EVERY_PARTIALS = 64
+# Partições por faixa da primeira chave quando o estado do group-by vai para o disco.
+SPILL_PARTITIONS = 16
+# Número padrão de processos para agregar arquivos em paralelo (AGGREGATION_MAX_WORKERS).
+DEFAULT_MAX_WORKERS = int(os.environ.get("AGGREGATION_MAX_WORKERS", os.cpu_count() or 1))
+# 'spawn': um fork dentro do worker do uvicorn (cheio de threads) pode herdar travas do
+# Arrow ou de outras threads já ocupadas e travar o processo filho para sempre.
+POOL_START_METHOD = "spawn"
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _normalize_keys(table: pa.Table, keys: Sequence[str]) -> pa.Table:
+    """Casts dictionary-encoded key columns to plain values so partials from different files can be concatenated."""
+    columns = []
+    for key in keys:
+        column = table.column(key)
+        if pa.types.is_dictionary(column.type):
+            column = column.cast(column.type.value_type)
+        columns.append(column)
+    return pa.table(columns, names=list(keys))
+
+
+def count_by(table: pa.Table, keys: Sequence[str]) -> pa.Table:
+    """
+    Counts the rows of `table` for each combination of `keys`.
+
+    Rows with a null in any key are discarded, as the old dropna() + value_counts() did.
+    Returns a table with the key columns followed by a 'count' column (int64).
+    """
+    keys = list(keys)
+    key_table = _normalize_keys(table, keys).drop_null()
+    if key_table.num_rows == 0:
+        return _empty_counts(key_table.schema, keys)
+
+    grouped = key_table.group_by(keys).aggregate([
+        (keys[0], "count", pc.CountOptions(mode="all"))
+    ])
+    # A ordem das colunas de saída do group_by varia entre versões do pyarrow.
+    grouped = grouped.select(keys + [f"{keys[0]}_count"])
+    return grouped.rename_columns(keys + [COUNT_COLUMN])
+
+
+def merge_counts(partials: Sequence[pa.Table], keys: Sequence[str]) -> Optional[pa.Table]:
+    """Merges partial results of count_by() by summing the counts of equal keys."""
+    keys = list(keys)
+    partials = [partial for partial in partials if partial is not None and partial.num_rows]
+    if not partials:
+        return None
+    if len(partials) == 1:
+        return partials[0]
+
+    # Parciais de arquivos diferentes podem divergir no tipo (ex.: string x large_string).
+    schema = partials[0].schema
+    combined = pa.concat_tables([partial.cast(schema) for partial in partials])
+    merged = combined.group_by(keys).aggregate([(COUNT_COLUMN, "sum")])
+    merged = merged.select(keys + [f"{COUNT_COLUMN}_sum"])
+    return merged.rename_columns(keys + [COUNT_COLUMN])
+
+
+def sum_counts(counts: pa.Table, keys: Sequence[str]) -> Optional[pa.Table]:
+    """Rolls an already counted table (e.g. an aggregate cube) up to fewer keys, summing 'count'."""
+    keys = list(keys)
+    if counts is None or counts.num_rows == 0:
+        return None
+    rolled_up = counts.group_by(keys).aggregate([(COUNT_COLUMN, "sum")])
+    rolled_up = rolled_up.select(keys + [f"{COUNT_COLUMN}_sum"])
+    return rolled_up.rename_columns(keys + [COUNT_COLUMN])
+
+
+def _empty_counts(schema: pa.Schema, keys: Sequence[str]) -> pa.Table:
+    fields = [schema.field(key) for key in keys] + [pa.field(COUNT_COLUMN, pa.int64())]
+    return pa.schema(fields).empty_table()
+
+
+class GroupCounter:
+    """
+    Accumulates group-by counts over a stream of Arrow tables (e.g. parquet row groups).
+
+    Usage:
+        counter = GroupCounter(['CODMUNOCOR'])
+        for chunk_table in parquet_reader.iter_row_groups(parquet_file, ['CODMUNOCOR']):
+            counter.update(chunk_table)
+        rows = counter.to_records({'CODMUNOCOR': 'municipality_code'}, count_name='total_deaths')
+    """
+    def __init__(self, keys: Sequence[str]):
+        self.keys = list(keys)
+        self._partials: List[pa.Table] = []
+
+    def update(self, table: pa.Table) -> None:
+        if table is None or table.num_rows == 0:
+            return
+        self._partials.append(count_by(table, self.keys))
+        if len(self._partials) >= COMPACT_EVERY_PARTIALS:
+            self._compact()
+
+    def merge(self, other: "GroupCounter") -> None:
+        """Adds the counts of another counter to this one."""
+        self.add_counts(other.result())
+
+    def add_counts(self, counts: Optional[pa.Table]) -> None:
+        """
+        Adds an already counted table (keys + 'count'), e.g. the result of a worker process.
+
+        Rows with a null key are discarded, as in update().
+        """
+        counts = counts.drop_null() if counts is not None else None
+        if counts is not None and counts.num_rows:
+            self._partials.append(counts)
+            self._compact()
+
+    def _compact(self) -> None:
+        merged = merge_counts(self._partials, self.keys)
+        self._partials = [merged] if merged is not None else []
+
+    def result(self) -> Optional[pa.Table]:
+        """Final table with the keys and the 'count' column, or None when nothing was counted."""
+        self._compact()
+        return self._partials[0] if self._partials else None
+
+    def __bool__(self) -> bool:
+        return self.result() is not None
+
+    def total(self) -> int:
+        result = self.result()
+        return int(pc.sum(result.column(COUNT_COLUMN)).as_py()) if result is not None else 0
+
+    def to_records(
+        self,
+        rename: Optional[Dict[str, str]] = None,
+        count_name: str = COUNT_COLUMN,
+        key_types: Optional[Dict[str, pa.DataType]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Converts the result into the list-of-dicts shape returned by the API.
+
+        `key_types` casts key columns after aggregation (one value per group), e.g. the
+        int32 municipality codes back to the text codes the API has always returned.
+        """
+        result = self.result()
+        if result is None:
+            return []
+        rename = rename or {}
+        names = [rename.get(key, key) for key in self.keys] + [count_name]
+        # Ordena pelas chaves para que a resposta não dependa da ordem de processamento.
+        result = result.sort_by([(key, "ascending") for key in self.keys])
+        for key, data_type in (key_types or {}).items():
+            index = result.schema.get_field_index(key)
+            result = result.set_column(index, key, pc.cast(result.column(key), data_type))
+        return result.rename_columns(names).to_pylist()
+
+
+class SpilledPartials:
+    """
+    Partials of a group-by written to disk (Arrow IPC), split by ranges of the first key.
+
+    The ranges are fixed at the first spill, from the key values seen so far, so every
+    occurrence of a key lands in the same partition. Each partition can then be merged
+    on its own, and only one of them is in memory at a time. The folder is removed when
+    the object is garbage collected (or on close()).
+    """
+    def __init__(self, key: str, spill_dir: str, partitions: int = SPILL_PARTITIONS):
+        self.key = key
+        self.partitions = partitions
+        Path(spill_dir).mkdir(parents=True, exist_ok=True)
+        self._dir = Path(tempfile.mkdtemp(prefix="groupby-", dir=spill_dir))
+        self._finalizer = weakref.finalize(self, shutil.rmtree, str(self._dir), True)
+        self._boundaries: Optional[pa.Array] = None
+        self._files: Dict[int, List[Path]] = defaultdict(list)
+        self.spilled_bytes = 0
+
+    def _partition_ids(self, table: pa.Table) -> pa.ChunkedArray:
+        column = table.column(self.key)
+        if self._boundaries is None:
+            values = pc.unique(column)
+            values = values.take(pc.array_sort_indices(values))
+            step = len(values) / self.partitions
+            self._boundaries = pc.unique(values.take([int(step * i) for i in range(1, self.partitions)]))
+        # Partição = quantas fronteiras a chave já passou (0 .. número de fronteiras).
+        ids = None
+        for boundary in self._boundaries:
+            passed = pc.cast(pc.greater_equal(column, boundary), pa.int32())
+            ids = passed if ids is None else pc.add(ids, passed)
+        return ids
+
+    def write(self, table: pa.Table) -> None:
+        if table.num_rows == 0:
+            return
+        ids = self._partition_ids(table)
+        for partition in pc.unique(ids).to_pylist():
+            part = table.filter(pc.equal(ids, partition))
+            path = self._dir / f"part-{partition:03d}-{len(self._files[partition]):05d}.arrow"
+            with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, part.schema) as writer:
+                writer.write_table(part)
+            self._files[partition].append(path)
+            self.spilled_bytes += part.nbytes
+
+    def read(self, partition: int) -> List[pa.Table]:
+        tables = []
+        for path in self._files.get(partition, []):
+            with pa.memory_map(str(path)) as source:
+                tables.append(pa.ipc.open_file(source).read_all())
+        return tables
+
+    def partition_ids(self) -> List[int]:
+        return sorted(self._files)
+
+    def close(self) -> None:
+        self._finalizer()
+
+
+VALUE_SUM_COLUMN = "sum"
+VALUE_COUNT_COLUMN = "value_count"
+MEASURES = ("count", "sum", "mean")
+
+
+class GroupAggregator:
+    """
+    Like GroupCounter, but also accumulates the sum of a numeric value column per group
+    (e.g. VAL_TOT of the SIH), so count, sum and mean come out of the same streaming pass.
+
+    The mean is only computed at the end (sum / non-null values), which keeps the
+    partials mergeable in any order.
+
+    With `memory_limit_bytes` (see memory_budget.MemoryBudget.state_bytes), the merged state
+    goes to disk in SpilledPartials whenever it grows past the limit; the final result is
+    then merged one partition at a time.
+    """
+    def __init__(
+        self,
+        keys: Sequence[str],
+        value_column: Optional[str] = None,
+        memory_limit_bytes: Optional[int] = None,
+        spill_dir: Optional[str] = None
+    ):
+        self.keys = list(keys)
+        self.value_column = value_column
+        self.memory_limit_bytes = memory_limit_bytes
+        self.spill_dir = spill_dir or tempfile.gettempdir()
+        self._partials: List[pa.Table] = []
+        self._spilled: Optional[SpilledPartials] = None
+
+    def _measure_names(self) -> List[str]:
+        return [COUNT_COLUMN] + ([VALUE_SUM_COLUMN, VALUE_COUNT_COLUMN] if self.value_column else [])
+
+    def update(self, table: pa.Table) -> None:
+        if table is None or table.num_rows == 0:
+            return
+        key_table = _normalize_keys(table, self.keys)
+        if self.value_column:
+            key_table = key_table.append_column(self.value_column, pc.cast(table.column(self.value_column), pa.float64()))
+        # Linhas sem alguma das chaves são descartadas, como no count_by(); valor nulo não.
+        valid_keys = pc.is_valid(key_table.column(self.keys[0]))
+        for key in self.keys[1:]:
+            valid_keys = pc.and_(valid_keys, pc.is_valid(key_table.column(key)))
+        key_table = key_table.filter(valid_keys)
+        if key_table.num_rows == 0:
+            return
+
+        aggregations = [(self.keys[0], "count", pc.CountOptions(mode="all"))]
+        output_columns = [f"{self.keys[0]}_count"]
+        if self.value_column:
+            aggregations += [(self.value_column, "sum"), (self.value_column, "count")]
+            output_columns += [f"{self.value_column}_sum", f"{self.value_column}_count"]
+
+        grouped = key_table.group_by(self.keys).aggregate(aggregations)
+        grouped = grouped.select(self.keys + output_columns).rename_columns(self.keys + self._measure_names())
+        self._partials.append(grouped)
+        if len(self._partials) >= COMPACT_EVERY_PARTIALS or self._over_limit():
+            self._compact()
+            self._spill_if_needed()
+
+    def add_counts(self, counts: Optional[pa.Table]) -> None:
+        """
+        Adds an already counted table (keys + 'count'), e.g. rolled up from a cube. Only valid without a value column.
+
+        Rows with a null key are discarded, as in update().
+        """
+        if self.value_column:
+            raise ValueError("Contagens prontas não têm a coluna de valor; use update().")
+        counts = counts.select(self.keys + [COUNT_COLUMN]).drop_null() if counts is not None else None
+        if counts is not None and counts.num_rows:
+            self._partials.append(counts)
+            self._compact()
+            self._spill_if_needed()
+
+    def _merge(self, partials: Sequence[pa.Table]) -> Optional[pa.Table]:
+        partials = [partial for partial in partials if partial.num_rows]
+        if len(partials) <= 1:
+            return partials[0] if partials else None
+        schema = partials[0].schema
+        combined = pa.concat_tables([partial.cast(schema) for partial in partials])
+        measures = self._measure_names()
+        merged = combined.group_by(self.keys).aggregate([(measure, "sum") for measure in measures])
+        merged = merged.select(self.keys + [f"{measure}_sum" for measure in measures])
+        return merged.rename_columns(self.keys + measures)
+
+    def _compact(self) -> None:
+        merged = self._merge(self._partials)
+        self._partials = [merged] if merged is not None else []
+
+    def _over_limit(self) -> bool:
+        return bool(self.memory_limit_bytes) and sum(partial.nbytes for partial in self._partials) > self.memory_limit_bytes
+
+    def _spill_if_needed(self) -> None:
+        if not self._over_limit():
+            return
+        if self._spilled is None:
+            self._spilled = SpilledPartials(self.keys[0], self.spill_dir)
+            print(f" -> [Agregação] Estado do agrupamento acima de {self.memory_limit_bytes // 1024 ** 2} MB; gravando parciais em disco...")
+        for partial in self._partials:
+            self._spilled.write(partial)
+        self._partials = []
+
+    def result(self) -> Optional[pa.Table]:
+        if self._spilled is not None:
+            # Cada partição tem chaves exclusivas: junta uma por vez e concatena os resultados.
+            spilled, self._spilled = self._spilled, None
+            for partial in self._partials:
+                spilled.write(partial)
+            merged_partitions = [self._merge(spilled.read(partition)) for partition in spilled.partition_ids()]
+            spilled.close()
+            merged_partitions = [partition for partition in merged_partitions if partition is not None]
+            schema = merged_partitions[0].schema
+            self._partials = [pa.concat_tables([partition.cast(schema) for partition in merged_partitions])]
+        self._compact()
+        return self._partials[0] if self._partials else None
+
+    def __bool__(self) -> bool:
+        return self.result() is not None
+
+    def total(self) -> int:
+        result = self.result()
+        return int(pc.sum(result.column(COUNT_COLUMN)).as_py()) if result is not None else 0
+
+    def to_records(
+        self,
+        measures: Sequence[str] = MEASURES,
+        rename: Optional[Dict[str, str]] = None,
+        key_types: Optional[Dict[str, pa.DataType]] = None,
+        count_name: str = COUNT_COLUMN
+    ) -> List[Dict[str, Any]]:
+        """
+        Converts the result into API records with the requested measures.
+
+        'count' is the number of rows; 'sum' and 'mean' are named after the value column
+        (e.g. sum_VAL_TOT, mean_VAL_TOT). Groups without any value get sum 0 and mean None.
+        """
+        result = self.result()
+        if result is None:
+            return []
+        result = result.sort_by([(key, "ascending") for key in self.keys])
+        for key, data_type in (key_types or {}).items():
+            index = result.schema.get_field_index(key)
+            result = result.set_column(index, key, pc.cast(result.column(key), data_type))
+
+        rename = rename or {}
+        columns = [result.column(key) for key in self.keys]
+        names = [rename.get(key, key) for key in self.keys]
+        if "count" in measures:
+            columns.append(result.column(COUNT_COLUMN))
+            names.append(count_name)
+        if self.value_column and "sum" in measures:
+            columns.append(pc.fill_null(result.column(VALUE_SUM_COLUMN), 0.0))
+            names.append(f"sum_{self.value_column}")
+        if self.value_column and "mean" in measures:
+            value_count = result.column(VALUE_COUNT_COLUMN)
+            # Divisão por zero vira nulo: grupo sem nenhum valor numérico não tem média.
+            safe_count = pc.if_else(pc.equal(value_count, 0), pa.scalar(None, pa.int64()), value_count)
+            columns.append(pc.divide(pc.fill_null(result.column(VALUE_SUM_COLUMN), 0.0), pc.cast(safe_count, pa.float64())))
+            names.append(f"mean_{self.value_column}")
+        return pa.table(columns, names=names).to_pylist()
+
+
+def _init_worker() -> None:
+    # Cada processo usa uma única thread do Arrow: o paralelismo vem dos processos,
+    # e isso evita disputar os núcleos com os outros workers.
+    pa.set_cpu_count(1)
+    pa.set_io_thread_count(1)
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """Pool de processos único do processo, criado no primeiro uso e compartilhado pelas requisições."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=max(1, DEFAULT_MAX_WORKERS),
+                mp_context=multiprocessing.get_context(POOL_START_METHOD),
+                initializer=_init_worker
+            )
+        return _pool
+
+
+def shutdown_pool() -> None:
+    """Encerra o pool (chamado no desligamento da API); o próximo uso cria outro."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _discard_broken_pool(pool: ProcessPoolExecutor) -> None:
+    # Um processo filho morto (ex.: sem memória) inutiliza o pool: a próxima chamada cria outro.
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def count_files(
+    file_paths: Sequence[Path],
+    count_file: Callable[..., Optional[pa.Table]],
+    keys: Sequence[str],
+    max_workers: Optional[int] = None,
+    **count_file_kwargs: Any
+) -> GroupCounter:
+    """
+    Runs `count_file(path, **count_file_kwargs)` for every file and merges the partial counts.
+
+    With more than one worker the files are processed in the shared process pool (get_pool()),
+    with at most `max_workers` of this call's files in flight at once. `count_file` must be a
+    module-level function (picklable) that returns the table of a GroupCounter.result().
+    Partials are merged in the order of `file_paths`, so the result is identical to the serial path.
+    """
+    counter = GroupCounter(keys)
+    workers = min(max_workers or DEFAULT_MAX_WORKERS, len(file_paths))
+
+    if workers <= 1:
+        for file_path in file_paths:
+            counter.add_counts(count_file(file_path, **count_file_kwargs))
+        return counter
+
+    print(f" -> [Agregação] Processando {len(file_paths)} arquivos em {workers} processos...")
+    pool = get_pool()
+    in_flight: deque = deque()
+    try:
+        for file_path in file_paths:
+            if len(in_flight) >= workers:
+                counter.add_counts(in_flight.popleft().result())
+            in_flight.append(pool.submit(count_file, file_path, **count_file_kwargs))
+        while in_flight:
+            counter.add_counts(in_flight.popleft().result())
+    except BrokenProcessPool:
+        _discard_broken_pool(pool)
+        raise
+    finally:
+        for future in in_flight:
+            future.cancel()
+    return counter
@@ -1,6 +1,11 @@
 # src/infrastructure/shared/data_utils.py
 import pandas as pd
-from typing import List, Dict, Any
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from typing import List, Dict, Any, Callable, Optional, Tuple
+
+from src.infrastructure.shared import parquet_reader
 
 STATE_ABBR_TO_IBGE_CODE: Dict[str, str] = {
     "RO": "11", "AC": "12", "AM": "13", "RR": "14", "PA": "15", "AP": "16", "TO": "17",
@@ -22,17 +27,250 @@ def get_age_group(age: Any) -> str:
     except (ValueError, TypeError):
         return "Ignored"
 
+# Limite superior (inclusivo) de cada faixa de get_age_group, usado na versão vetorizada.
+AGE_GROUP_UPPER_BOUNDS = [(19, "<20"), (29, "20-29"), (39, "30-39")]
+AGE_GROUP_OLDEST = "40+"
+AGE_GROUP_IGNORED = "Ignored"
+NUMERIC_TEXT_PATTERN = r"^-?\d+(\.\d+)?$"
+
+def get_age_groups(ages: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Vectorized get_age_group: categorizes a whole Arrow column of ages at once."""
+    ages_text = pc.utf8_trim_whitespace(pc.cast(ages, pa.string()))
+    # Valores não numéricos viram nulos (e depois "Ignored"), como o try/except da versão linha a linha.
+    numeric_text = pc.if_else(
+        pc.match_substring_regex(ages_text, NUMERIC_TEXT_PATTERN), ages_text, pa.scalar(None, pa.string())
+    )
+    # floor() reproduz o int(age) da versão linha a linha (ex.: 29.5 -> "20-29").
+    numeric_ages = pc.floor(pc.cast(numeric_text, pa.float64()))
+
+    age_groups = pa.scalar(AGE_GROUP_OLDEST)
+    for upper_bound, label in reversed(AGE_GROUP_UPPER_BOUNDS):
+        age_groups = pc.if_else(pc.less_equal(numeric_ages, upper_bound), label, age_groups)
+    return pc.fill_null(age_groups, AGE_GROUP_IGNORED)
+
+# IDADE do SIM: o primeiro dígito é a unidade (0 minutos, 1 horas, 2 dias, 3 meses,
+# 4 anos, 5 anos acima de 100) e os dois seguintes, a quantidade. Ex.: 465 = 65 anos.
+SIM_AGE_UNIT_YEARS = 4
+SIM_AGE_UNIT_CENTENARIANS = 5
+# Faixas etárias usadas nas tabelas de mortalidade do Tabnet (limite inferior, rótulo).
+AGE_BANDS = [
+    (0, "<1"), (1, "1-4"), (5, "5-9"), (10, "10-14"), (15, "15-19"), (20, "20-29"),
+    (30, "30-39"), (40, "40-49"), (50, "50-59"), (60, "60-69"), (70, "70-79"), (80, "80+"),
+]
+MAX_AGE_YEARS = 130
+
+def _age_band_of(age: int) -> str:
+    label = AGE_BANDS[0][1]
+    for lower_bound, band in AGE_BANDS:
+        if age >= lower_bound:
+            label = band
+    return label
+
+# Faixa de cada idade de 0 a MAX_AGE_YEARS, calculada uma vez: classificar uma coluna é um take().
+AGE_BAND_BY_YEAR = pa.array([_age_band_of(age) for age in range(MAX_AGE_YEARS + 1)], pa.string())
+
+def sim_ages_in_years(ages: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Decodes the SIM IDADE column into whole years (under one year -> 0); ignored ages become null."""
+    encoded = pc.cast(pc.floor(numeric_values(ages)), pa.int32())
+    unit = pc.divide(encoded, 100)
+    amount = pc.subtract(encoded, pc.multiply(unit, 100))
+    years = pc.if_else(
+        pc.equal(unit, SIM_AGE_UNIT_YEARS), amount,
+        pc.if_else(
+            pc.equal(unit, SIM_AGE_UNIT_CENTENARIANS), pc.add(amount, 100),
+            pc.if_else(pc.less(unit, SIM_AGE_UNIT_YEARS), pa.scalar(0, pa.int32()), pa.scalar(None, pa.int32()))
+        )
+    )
+    return pc.cast(years, pa.int32())
+
+# NU_IDADE_N do SINAN: o primeiro dígito é a unidade (1 horas, 2 dias, 3 meses, 4 anos)
+# e os três seguintes, a quantidade. Ex.: 4025 = 25 anos.
+SINAN_AGE_UNIT_YEARS = 4
+
+def sinan_ages_in_years(ages: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Decodes the SINAN NU_IDADE_N column into whole years (under one year -> 0); ignored ages become null."""
+    encoded = pc.cast(pc.floor(numeric_values(ages)), pa.int32())
+    unit = pc.divide(encoded, 1000)
+    amount = pc.subtract(encoded, pc.multiply(unit, 1000))
+    years = pc.if_else(
+        pc.equal(unit, SINAN_AGE_UNIT_YEARS), amount,
+        pc.if_else(
+            pc.and_(pc.greater(unit, 0), pc.less(unit, SINAN_AGE_UNIT_YEARS)),
+            pa.scalar(0, pa.int32()), pa.scalar(None, pa.int32())
+        )
+    )
+    return pc.cast(years, pa.int32())
+
+def age_bands(years: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Age band (AGE_BANDS) of each age in years, by lookup in AGE_BAND_BY_YEAR; nulls become "Ignored"."""
+    # skip_nulls=False: idade ignorada continua nula (e vira "Ignored"), em vez de virar 0.
+    indices = pc.min_element_wise(pc.max_element_wise(years, 0, skip_nulls=False), MAX_AGE_YEARS, skip_nulls=False)
+    return pc.fill_null(pc.take(AGE_BAND_BY_YEAR, indices), AGE_GROUP_IGNORED)
+
+# Códigos de município do IBGE: 6 dígitos no DATASUS (7 com o dígito verificador).
+# Os dois primeiros dígitos são a UF, então a UF é o código dividido por 10^4 (ou 10^5).
+MUNICIPALITY_CODE_TYPE = pa.int32()
+STATE_DIVISOR_6DIGIT = 10_000
+STATE_DIVISOR_7DIGIT = 100_000
+FIRST_7DIGIT_CODE = 1_000_000
+# Até 9 dígitos sempre cabe em int32: um código sujo maior vira nulo em vez de derrubar o cast.
+INTEGER_TEXT_PATTERN = r"^\d{1,9}$"
+MAX_MUNICIPALITY_CODE = 999_999_999
+
+def get_state_codes(states: Optional[List[str]]) -> List[int]:
+    """Converts state abbreviations into their integer IBGE codes, ignoring unknown ones."""
+    return [int(STATE_ABBR_TO_IBGE_CODE[s.upper()]) for s in states or [] if s.upper() in STATE_ABBR_TO_IBGE_CODE]
+
+def municipality_codes_as_int(codes: pa.ChunkedArray) -> pa.ChunkedArray:
+    """
+    Normalizes municipality codes to int32.
+
+    Text codes are trimmed and lose the '.0' left by float-typed columns; anything
+    that is not a number (blank, '*', etc.) or does not fit in int32 becomes null.
+    """
+    if pa.types.is_integer(codes.type):
+        in_range = pc.and_(pc.greater_equal(codes, 0), pc.less_equal(codes, MAX_MUNICIPALITY_CODE))
+        return pc.cast(pc.if_else(in_range, codes, pa.scalar(None, codes.type)), MUNICIPALITY_CODE_TYPE)
+
+    codes_text = pc.utf8_trim_whitespace(pc.cast(codes, pa.string()))
+    codes_text = pc.replace_substring_regex(codes_text, r"\..*$", "")
+    codes_text = pc.if_else(
+        pc.match_substring_regex(codes_text, INTEGER_TEXT_PATTERN), codes_text, pa.scalar(None, pa.string())
+    )
+    return pc.cast(codes_text, MUNICIPALITY_CODE_TYPE)
+
+def state_codes_of(municipality_codes: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Integer state code of each int32 municipality code (code // 10000, or // 100000 for 7 digits)."""
+    state_codes = pc.if_else(
+        pc.greater_equal(municipality_codes, FIRST_7DIGIT_CODE),
+        pc.divide(municipality_codes, STATE_DIVISOR_7DIGIT),
+        pc.divide(municipality_codes, STATE_DIVISOR_6DIGIT),
+    )
+    return pc.cast(state_codes, MUNICIPALITY_CODE_TYPE)
+
+def numeric_values(values: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Parses a numeric column stored as text (e.g. VAL_TOT) into float64; non-numeric values become null."""
+    if pa.types.is_integer(values.type) or pa.types.is_floating(values.type) or pa.types.is_decimal(values.type):
+        return pc.cast(values, pa.float64())
+    values_text = pc.utf8_trim_whitespace(pc.cast(values, pa.string()))
+    values_text = pc.if_else(
+        pc.match_substring_regex(values_text, NUMERIC_TEXT_PATTERN), values_text, pa.scalar(None, pa.string())
+    )
+    return pc.cast(values_text, pa.float64())
+
+def competence_months(years: pa.ChunkedArray, months: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Combines separate year and month columns (e.g. ANO_CMPT, MES_CMPT) into an int32 YYYYMM key (DATE_IGNORED if missing)."""
+    competence = pc.add(
+        pc.multiply(pc.cast(numeric_values(years), pa.int32()), 100),
+        pc.cast(numeric_values(months), pa.int32())
+    )
+    return pc.fill_null(pc.cast(competence, pa.int32()), DATE_IGNORED)
+
+# Datas em texto do DATASUS: DDMMAAAA no SIM e no SINASC (DTOBITO, DTNASC), AAAAMMDD ou
+# AAAA-MM-DD no SINAN (DT_NOTIFIC). Posições (início, fim) do ano e do mês depois de tirar '-' e '/'.
+DATE_FORMATS: Dict[str, Tuple[Tuple[int, int], Tuple[int, int]]] = {
+    "DMY": ((4, 8), (2, 4)),
+    "YMD": ((0, 4), (4, 6)),
+}
+DATE_TEXT_PATTERN = r"^\d{8}$"
+# Chave de tempo das datas em branco ou inválidas: o registro continua contado (como a faixa
+# "Ignored"), e a série por ano/mês soma o mesmo que o total.
+DATE_IGNORED = 0
+
+def date_parts(values: pa.ChunkedArray, date_format: str = "DMY") -> Tuple[pa.ChunkedArray, pa.ChunkedArray]:
+    """Year and month (int32) of a date column, stored as text or as a date; invalid dates become null."""
+    if pa.types.is_date(values.type) or pa.types.is_timestamp(values.type):
+        return pc.cast(pc.year(values), pa.int32()), pc.cast(pc.month(values), pa.int32())
+
+    (year_start, year_end), (month_start, month_end) = DATE_FORMATS[date_format]
+    values_text = pc.replace_substring_regex(pc.utf8_trim_whitespace(pc.cast(values, pa.string())), r"[-/]", "")
+    values_text = pc.if_else(pc.match_substring_regex(values_text, DATE_TEXT_PATTERN), values_text, pa.scalar(None, pa.string()))
+    years = pc.cast(pc.utf8_slice_codeunits(values_text, year_start, year_end), pa.int32())
+    months = pc.cast(pc.utf8_slice_codeunits(values_text, month_start, month_end), pa.int32())
+    valid = pc.and_(pc.greater_equal(months, 1), pc.less_equal(months, 12))
+    return pc.if_else(valid, years, pa.scalar(None, pa.int32())), pc.if_else(valid, months, pa.scalar(None, pa.int32()))
+
+def date_years(values: pa.ChunkedArray, date_format: str = "DMY") -> pa.ChunkedArray:
+    """Year of each date (e.g. DTOBITO '05032022' -> 2022); invalid dates become DATE_IGNORED."""
+    return pc.fill_null(date_parts(values, date_format)[0], DATE_IGNORED)
+
+def date_months(values: pa.ChunkedArray, date_format: str = "DMY") -> pa.ChunkedArray:
+    """Int32 YYYYMM of each date (e.g. DTOBITO '05032022' -> 202203), the same key as competence_months; invalid dates become DATE_IGNORED."""
+    years, months = date_parts(values, date_format)
+    return pc.fill_null(pc.cast(pc.add(pc.multiply(years, 100), months), pa.int32()), DATE_IGNORED)
+
 def filter_dataframe_by_states(dataframe: pd.DataFrame, states: List[str], municipality_code_column: str) -> pd.DataFrame:
     """Filters a DataFrame based on a list of state abbreviations."""
     if not states or municipality_code_column not in dataframe.columns:
         return dataframe
     
-    ibge_codes = [STATE_ABBR_TO_IBGE_CODE.get(s.upper()) for s in states if s.upper() in STATE_ABBR_TO_IBGE_CODE]
-    if not ibge_codes:
+    state_codes = get_state_codes(states)
+    if not state_codes:
         # Retorna um DataFrame vazio se não houver códigos IBGE válidos para os estados fornecidos
         return pd.DataFrame(columns=dataframe.columns)
 
-    # O PONTO-CHAVE: Filtra as linhas verificando se os DOIS PRIMEIROS DÍGITOS
-    # do código do município (que representam o código do estado) estão na lista ibge_codes.
-    mask = dataframe[municipality_code_column].astype(str).str[:2].isin(ibge_codes)
-    return dataframe[mask]
\ No newline at end of file
+    # O PONTO-CHAVE: a UF é a divisão inteira do código do município, sem converter nada para texto.
+    municipality_codes = pd.to_numeric(dataframe[municipality_code_column], errors='coerce')
+    state_of_code = (municipality_codes // STATE_DIVISOR_6DIGIT).where(
+        municipality_codes < FIRST_7DIGIT_CODE, municipality_codes // STATE_DIVISOR_7DIGIT
+    )
+    return dataframe[state_of_code.isin(state_codes)]
+
+def filter_table_by_states(table: pa.Table, states: List[str], municipality_code_column: str) -> pa.Table:
+    """
+    Arrow version of filter_dataframe_by_states, evaluated without converting the rows to Python.
+
+    The municipality column is expected to be int32 (see municipality_codes_as_int); other
+    types are normalized first.
+    """
+    if not states or municipality_code_column not in table.column_names:
+        return table
+
+    state_codes = get_state_codes(states)
+    if not state_codes:
+        return table.slice(0, 0)
+
+    municipality_codes = table.column(municipality_code_column)
+    if municipality_codes.type != MUNICIPALITY_CODE_TYPE:
+        municipality_codes = municipality_codes_as_int(municipality_codes)
+    mask = pc.is_in(state_codes_of(municipality_codes), value_set=pa.array(state_codes, MUNICIPALITY_CODE_TYPE))
+    return table.filter(mask)
+
+def _state_code_of_statistic(value: Any) -> Optional[int]:
+    """State code of a row group min/max statistic, or None when it cannot be interpreted."""
+    if isinstance(value, bytes):
+        value = value.decode("utf-8", errors="ignore")
+    if isinstance(value, float):
+        value = int(value)
+    if isinstance(value, int):
+        return value // (STATE_DIVISOR_7DIGIT if value >= FIRST_7DIGIT_CODE else STATE_DIVISOR_6DIGIT)
+    text = str(value).strip()
+    return int(text[:2]) if len(text) >= 2 and text[:2].isdigit() else None
+
+def states_row_group_predicate(
+    parquet_file: pq.ParquetFile, states: Optional[List[str]], municipality_code_column: str
+) -> Optional[Callable[[int], bool]]:
+    """
+    Builds a row group predicate for parquet_reader.iter_row_groups from the column min/max statistics.
+
+    Row groups whose municipality codes fall entirely outside the requested states are
+    skipped without being decoded. Without usable statistics the row group is read.
+    """
+    state_codes = get_state_codes(states)
+    if not state_codes:
+        return None
+
+    def may_contain_states(row_group_index: int) -> bool:
+        statistics = parquet_reader.column_statistics(parquet_file, row_group_index, municipality_code_column)
+        if statistics is None:
+            return True
+        lowest, highest = statistics
+        if isinstance(lowest, (int, float)) and lowest < FIRST_7DIGIT_CODE <= highest:
+            # Códigos de 6 e 7 dígitos no mesmo row group: o intervalo numérico não diz nada sobre a UF.
+            return True
+        lowest_state, highest_state = _state_code_of_statistic(lowest), _state_code_of_statistic(highest)
+        if lowest_state is None or highest_state is None or lowest_state > highest_state:
+            return True
+        return any(lowest_state <= state_code <= highest_state for state_code in state_codes)
+
+    return may_contain_states
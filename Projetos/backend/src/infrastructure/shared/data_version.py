@@ -0,0 +1,122 @@
+# src/infrastructure/shared/data_version.py
+"""
+Versão dos dados do DATASUS guardados localmente.
+
+Cada sistema tem um contador que a sincronização (scripts/sync_datasus.py) incrementa
+quando algum arquivo foi revisado no FTP. O token derivado desses contadores vai no
+cabeçalho X-Data-Version de todas as respostas e em /pysus/systems/data-version:
+clientes e caches (como o st.cache_data do frontend) podem usá-lo na chave para
+descartar resultados calculados com a versão anterior.
+
+O arquivo é relido quando muda no disco, então processos da API enxergam a
+sincronização feita por outro processo sem reiniciar.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from src.infrastructure.shared import datasus_store
+
+try:
+    import fcntl
+except ImportError:  # Windows: só a trava entre threads do próprio processo.
+    fcntl = None
+
+VERSION_FILENAME = "data_version.json"
+VERSION_LOCK_FILENAME = "data_version.lock"
+HEADER_NAME = "X-Data-Version"
+
+_lock = threading.Lock()
+# caminho -> (mtime, versões)
+_cache: Dict[Path, Tuple[float, Dict[str, Dict[str, Any]]]] = {}
+
+
+def _version_path(store_dir: str = datasus_store.STORE_DIR) -> Path:
+    return Path(store_dir) / VERSION_FILENAME
+
+
+@contextmanager
+def _version_file_lock(store_dir: str) -> Iterator[None]:
+    """Trava entre processos (sincronizações simultâneas) durante ler-incrementar-gravar."""
+    if fcntl is None:
+        yield
+        return
+    with open(Path(store_dir) / VERSION_LOCK_FILENAME, "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def get_versions(store_dir: str = datasus_store.STORE_DIR) -> Dict[str, Dict[str, Any]]:
+    """Versão de cada sistema: {"SIM": {"version": 3, "updated_at": ...}, ...}."""
+    path = _version_path(store_dir)
+    try:
+        modified_at = path.stat().st_mtime
+    except FileNotFoundError:
+        return {}
+
+    with _lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == modified_at:
+            return dict(cached[1])
+
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            versions = json.load(handle)
+    except (OSError, ValueError) as e:
+        print(f" -> [Versão] Arquivo de versões ilegível, considerando versão inicial: {e}")
+        versions = {}
+
+    with _lock:
+        _cache[path] = (modified_at, versions)
+    return dict(versions)
+
+
+def get_token(system: Optional[str] = None, store_dir: str = datasus_store.STORE_DIR) -> str:
+    """
+    Token opaco da versão dos dados: de um sistema ou, sem `system`, de todos.
+    Muda sempre que algum contador é incrementado.
+    """
+    versions = get_versions(store_dir)
+    if system:
+        return f"{system.upper()}-{versions.get(system.upper(), {}).get('version', 0)}"
+    counters = {name: info.get("version", 0) for name, info in sorted(versions.items())}
+    return hashlib.sha1(json.dumps(counters, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def bump(systems: Iterable[str], store_dir: str = datasus_store.STORE_DIR) -> Dict[str, Dict[str, Any]]:
+    """Incrementa a versão dos sistemas cujos dados mudaram e grava o arquivo atomicamente."""
+    path = _version_path(store_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A trava de arquivo impede que duas sincronizações leiam a mesma versão e percam um incremento.
+    with _lock, _version_file_lock(store_dir):
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                versions = json.load(handle)
+        except (OSError, ValueError):
+            versions = {}
+
+        now = time.time()
+        for system in {s.upper() for s in systems}:
+            current = versions.get(system, {}).get("version", 0)
+            versions[system] = {"version": current + 1, "updated_at": now}
+
+        # Nome temporário único: duas sincronizações nunca escrevem no mesmo arquivo.
+        fd, temp_name = tempfile.mkstemp(prefix=f"{path.name}.", suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(versions, handle, indent=2, sort_keys=True)
+            os.replace(temp_name, path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        _cache.pop(path, None)
+    return versions
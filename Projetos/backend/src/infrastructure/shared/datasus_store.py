@@ -0,0 +1,595 @@
+# src/infrastructure/shared/datasus_store.py
+"""
+Armazenamento local e persistente dos arquivos baixados do DATASUS (PySUS).
+
+Os downloads ficam organizados em <raiz>/<sistema>/<grupo>/<UF>/<ano>/<mês>/ e um
+manifesto JSON registra tamanho, checksum e último acesso de cada arquivo. Uma
+consulta repetida é respondida a partir do disco, sem voltar ao FTP, e quando o
+orçamento de disco é ultrapassado os arquivos menos usados recentemente são removidos.
+
+O manifesto é compartilhado com o scripts/sync_datasus.py e com os outros workers da
+API: toda escrita relê o arquivo sob uma trava de arquivo e aplica só a própria mudança.
+Um acerto no cache não grava nada; os acessos ficam em memória e vão junto com a
+próxima escrita.
+
+Todo caminho devolvido por fetch()/get_path() ganha uma concessão (lease) de
+DATASUS_STORE_LEASE_SECONDS: enquanto ela vale, o despejo não apaga o arquivo, mesmo
+que o orçamento de disco fique estourado, porque outra requisição ainda pode estar lendo.
+
+Os arquivos ausentes são baixados em paralelo pelo download_scheduler. Cada download
+é feito numa pasta temporária (.partial-*) e só entra no manifesto depois de validado,
+então um arquivo incompleto ou corrompido nunca é tratado como cache.
+
+Configuração (variáveis de ambiente):
+    DATASUS_STORE_DIR        pasta raiz do armazenamento.
+    DATASUS_STORE_MAX_BYTES      orçamento de disco em bytes (padrão: 20 GB).
+    DATASUS_STORE_LEASE_SECONDS  tempo em que um arquivo entregue fica protegido do despejo (padrão: 3600).
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import pyarrow.parquet as pq
+
+from src.infrastructure.shared import download_scheduler, parquet_reader
+
+try:
+    import fcntl
+except ImportError:  # Windows: só a trava entre threads do próprio processo.
+    fcntl = None
+
+STORE_DIR = os.environ.get("DATASUS_STORE_DIR", str(Path.home() / ".datasus_store"))
+STORE_MAX_BYTES = int(os.environ.get("DATASUS_STORE_MAX_BYTES", 20 * 1024 ** 3))
+LEASE_SECONDS = float(os.environ.get("DATASUS_STORE_LEASE_SECONDS", 3600))
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_LOCK_FILENAME = "manifest.lock"
+MANIFEST_VERSION = 1
+CHECKSUM_CHUNK_BYTES = 1024 * 1024
+UNSPECIFIED_PARTITION = "ALL"
+PARTIAL_DIR_PREFIX = ".partial-"
+
+
+class IncompleteDownloadError(Exception):
+    """
+    Algum arquivo pedido falhou em todas as tentativas de download.
+
+    Responder só com os outros arquivos daria um total parcial com cara de completo, então
+    os controllers devolvem 502 (o FTP do DATASUS falhou, não a requisição).
+    """
+    status_code = 502
+
+    def __init__(self, missing_keys: List[str], total: int):
+        self.missing_keys = missing_keys
+        super().__init__(
+            f"{len(missing_keys)} de {total} arquivo(s) do DATASUS não puderam ser baixados; "
+            f"tente novamente mais tarde. Faltando: {', '.join(missing_keys[:5])}"
+            + (" ..." if len(missing_keys) > 5 else "")
+        )
+
+
+def _sanitize(value: Any) -> str:
+    """Transforma um valor do describe() do PySUS em um nome de pasta seguro."""
+    if value is None or value == "":
+        return UNSPECIFIED_PARTITION
+    return re.sub(r"[^\w\-]+", "_", str(value)).strip("_") or UNSPECIFIED_PARTITION
+
+
+def _paths_from_download(downloaded: Any) -> List[Path]:
+    """O PySUS devolve um objeto (ou uma lista deles) com o atributo 'path'."""
+    if not downloaded:
+        return []
+    items = downloaded if isinstance(downloaded, list) else [downloaded]
+    return [Path(item.path) if hasattr(item, "path") else Path(str(item)) for item in items]
+
+
+def _files_under(path: Path) -> List[Path]:
+    if path.is_dir():
+        return sorted(p for p in path.rglob("*") if p.is_file())
+    return [path] if path.is_file() else []
+
+
+def compute_size(path: Path) -> int:
+    return sum(file_path.stat().st_size for file_path in _files_under(path))
+
+
+def compute_checksum(path: Path) -> str:
+    """SHA-256 do conteúdo de um arquivo ou de todas as partes de uma pasta parquet."""
+    digest = hashlib.sha256()
+    for file_path in _files_under(path):
+        digest.update(file_path.name.encode())
+        with open(file_path, "rb") as handle:
+            for chunk in iter(lambda: handle.read(CHECKSUM_CHUNK_BYTES), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def validate_download(path: Path, remote: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Confere se o download está completo antes de ele entrar no manifesto.
+
+    Toda parte parquet precisa ter o rodapé legível (um arquivo truncado não tem rodapé),
+    row groups que somam o total de linhas do rodapé e cujos dados cabem no arquivo. Se o
+    FTP informa um arquivo não vazio (`remote['size']`), o download precisa ter linhas.
+    """
+    parquet_files = parquet_reader.list_parquet_files([path])
+    if not parquet_files:
+        raise ValueError(f"nenhum arquivo parquet em {path}")
+
+    total_rows = 0
+    for file_path in parquet_files:
+        file_size = file_path.stat().st_size
+        if file_size == 0:
+            raise ValueError(f"arquivo vazio: {file_path.name}")
+        metadata = pq.ParquetFile(file_path).metadata
+        if metadata.num_rows and not metadata.num_row_groups:
+            raise ValueError(f"{file_path.name}: {metadata.num_rows} linhas sem nenhum row group")
+
+        group_rows = 0
+        for index in range(metadata.num_row_groups):
+            row_group = metadata.row_group(index)
+            group_rows += row_group.num_rows
+            for column in range(row_group.num_columns):
+                chunk = row_group.column(column)
+                start = chunk.dictionary_page_offset or chunk.data_page_offset
+                if start + chunk.total_compressed_size > file_size:
+                    raise ValueError(f"{file_path.name}: row group {index} termina depois do fim do arquivo")
+        if group_rows != metadata.num_rows:
+            raise ValueError(
+                f"{file_path.name}: os row groups somam {group_rows} linhas, o rodapé informa {metadata.num_rows}"
+            )
+        total_rows += metadata.num_rows
+
+    remote_size = str((remote or {}).get("size", "")).strip()
+    if remote_size.isdigit() and int(remote_size) > 0 and total_rows == 0:
+        raise ValueError(f"o FTP informa {remote_size} bytes, mas o download não tem nenhuma linha")
+
+
+class DatasusStore:
+    """
+    Cache de arquivos do DATASUS com manifesto e despejo LRU por orçamento de disco.
+    """
+    def __init__(
+        self,
+        root_dir: str = STORE_DIR,
+        max_bytes: int = STORE_MAX_BYTES,
+        scheduler: Optional[download_scheduler.DownloadScheduler] = None,
+        lease_seconds: float = LEASE_SECONDS
+    ):
+        self._root = Path(root_dir)
+        self._root.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._scheduler = scheduler
+        self._lease_seconds = lease_seconds
+        # Chave -> instante até o qual o arquivo não pode ser despejado.
+        self._leases: Dict[str, float] = {}
+        self._manifest_path = self._root / MANIFEST_FILENAME
+        self._manifest_lock_path = self._root / MANIFEST_LOCK_FILENAME
+        self._lock = threading.RLock()
+        # Trava de cada chave em uso e quantas chamadas a usam; sai do dicionário com a última.
+        self._key_locks: Dict[str, List[Any]] = {}
+        # Acessos ainda não gravados: chave -> (último acesso, acertos desde a última escrita).
+        self._pending_access: Dict[str, Tuple[float, int]] = {}
+        self._manifest_stamp = self._stat_manifest()
+        self._entries: Dict[str, Dict[str, Any]] = self._load_manifest()
+        self._remove_partial_downloads()
+
+    # --- Manifesto ---
+
+    def _stat_manifest(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self._manifest_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @contextmanager
+    def _manifest_file_lock(self) -> Iterator[None]:
+        """Trava entre processos (API, workers do uvicorn, sync) durante ler-alterar-gravar."""
+        if fcntl is None:
+            yield
+            return
+        with open(self._manifest_lock_path, "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _refresh_entries(self) -> None:
+        """Relê o manifesto se outro processo o gravou desde a última leitura (chamar com self._lock)."""
+        stamp = self._stat_manifest()
+        if stamp != self._manifest_stamp:
+            self._entries = self._load_manifest()
+            self._manifest_stamp = stamp
+
+    def _update_manifest(self, change: Callable[[Dict[str, Dict[str, Any]]], Any]) -> None:
+        """
+        Aplica `change` sobre o manifesto atual do disco e grava (nada é gravado se `change`
+        devolver False).
+
+        Sob a trava de arquivo, registros e metadados gravados por outro processo entre a
+        última leitura e esta escrita são preservados. Os acessos pendentes entram aqui.
+        """
+        with self._lock, self._manifest_file_lock():
+            self._entries = self._load_manifest()
+            self._manifest_stamp = self._stat_manifest()
+            if change(self._entries) is False:
+                return
+            for key, (last_access, hits) in self._pending_access.items():
+                entry = self._entries.get(key)
+                if entry:
+                    entry["last_access"] = max(entry.get("last_access", 0), last_access)
+                    entry["hits"] = entry.get("hits", 0) + hits
+            self._pending_access.clear()
+            self._save_manifest()
+            self._manifest_stamp = self._stat_manifest()
+
+    def _last_access(self, key: str) -> float:
+        pending = self._pending_access.get(key)
+        stored = self._entries[key].get("last_access", 0)
+        return max(stored, pending[0]) if pending else stored
+
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        if not self._manifest_path.is_file():
+            return {}
+        try:
+            with open(self._manifest_path, "r", encoding="utf-8") as handle:
+                manifest = json.load(handle)
+            return manifest.get("entries", {})
+        except (OSError, ValueError) as e:
+            print(f" -> [Store] Manifesto ilegível, recomeçando do zero: {e}")
+            return {}
+
+    def _save_manifest(self) -> None:
+        # Escrita atômica: um processo interrompido nunca deixa o manifesto pela metade.
+        # O nome temporário é único, para dois escritores nunca dividirem o mesmo arquivo.
+        fd, temp_name = tempfile.mkstemp(prefix=f"{MANIFEST_FILENAME}.", suffix=".tmp", dir=self._root)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump({"version": MANIFEST_VERSION, "entries": self._entries}, handle, indent=1)
+            os.replace(temp_name, self._manifest_path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
+    # --- Chaves e partições ---
+
+    def build_key(self, database: Any, system: str, group: str, file: Any) -> str:
+        """Monta a chave sistema/grupo/UF/ano/mês/arquivo a partir do describe() do PySUS."""
+        try:
+            description = database.describe(file) or {}
+        except Exception:
+            description = {}
+
+        parts = [
+            _sanitize(system.upper()),
+            _sanitize(group.upper() if group else None),
+            _sanitize(description.get("uf")),
+            _sanitize(description.get("year")),
+            _sanitize(description.get("month")),
+            _sanitize(getattr(file, "name", file)),
+        ]
+        return "/".join(parts)
+
+    @contextmanager
+    def _locked_keys(self, keys: Any) -> Iterator[None]:
+        """
+        Trava as chaves sempre na mesma ordem, para duas requisições não se bloquearem
+        mutuamente. A trava de uma chave é descartada quando a última chamada a libera.
+        """
+        keys = sorted(set(keys))
+        with self._lock:
+            for key in keys:
+                self._key_locks.setdefault(key, [threading.Lock(), 0])[1] += 1
+            locks = [self._key_locks[key][0] for key in keys]
+        try:
+            with ExitStack() as stack:
+                for lock in locks:
+                    stack.enter_context(lock)
+                yield
+        finally:
+            with self._lock:
+                for key in keys:
+                    self._key_locks[key][1] -= 1
+                    if self._key_locks[key][1] == 0:
+                        del self._key_locks[key]
+
+    def _remote_info(self, database: Any, file: Any) -> Dict[str, Any]:
+        """Tamanho e data de modificação informados pelo FTP, usados para detectar revisões."""
+        try:
+            description = database.describe(file) or {}
+        except Exception:
+            description = {}
+        return {
+            "size": str(description.get("size", "")),
+            "last_update": str(description.get("last_update", "")),
+        }
+
+    # --- Consulta ---
+
+    def get_path(self, key: str) -> Optional[Path]:
+        """Retorna o caminho local de uma chave se ele ainda estiver íntegro no disco."""
+        with self._lock:
+            self._refresh_entries()
+            entry = self._entries.get(key)
+            if not entry:
+                return None
+            path = self._root / entry["path"]
+            if not path.exists() or compute_size(path) != entry["size_bytes"]:
+                # Arquivo apagado ou truncado fora do controle do manifesto.
+                self._update_manifest(lambda entries: entries.pop(key, None) is not None)
+                return None
+            # Acerto no cache: só em memória, gravado junto com a próxima escrita.
+            _, hits = self._pending_access.get(key, (0.0, 0))
+            self._pending_access[key] = (time.time(), hits + 1)
+            self.lease([key])
+            return path
+
+    def register(self, key: str, path: Path, remote: Optional[Dict[str, Any]] = None) -> Path:
+        """Registra no manifesto um arquivo já baixado para dentro da raiz do armazenamento."""
+        path = Path(path)
+        try:
+            stored_path = str(path.relative_to(self._root))
+        except ValueError:
+            stored_path = str(path)
+        entry = {
+            "path": stored_path,
+            "size_bytes": compute_size(path),
+            "checksum": compute_checksum(path),
+            "created_at": time.time(),
+            "last_access": time.time(),
+            "hits": 0,
+            "remote": remote or {},
+        }
+        self._update_manifest(lambda entries: entries.__setitem__(key, entry))
+        return path
+
+    def fetch(self, database: Any, system: str, group: str, files: Any) -> List[Path]:
+        """
+        Garante que os arquivos pedidos estejam no disco e devolve seus caminhos locais.
+
+        Apenas os arquivos ausentes do manifesto são baixados do FTP, em paralelo.
+        Levanta IncompleteDownloadError se algum arquivo falhou em todas as tentativas
+        (os que chegaram continuam registrados para a próxima requisição).
+        """
+        if not files:
+            return []
+        files = files if isinstance(files, list) else [files]
+
+        files_by_key: Dict[str, Any] = {}
+        for file in files:
+            files_by_key.setdefault(self.build_key(database, system, group, file), file)
+
+        local_paths: Dict[str, Path] = {}
+        with self._locked_keys(files_by_key):
+            missing: Dict[str, Any] = {}
+            for key, file in files_by_key.items():
+                path = self.get_path(key)
+                if path is not None:
+                    print(f" -> [Store] Usando cópia local: {key}")
+                    local_paths[key] = path
+                else:
+                    missing[key] = file
+
+            if missing:
+                print(f" -> [Store] Baixando {len(missing)} arquivo(s) do FTP...")
+                tasks = {
+                    key: (lambda key=key, file=file: self._download_file(database, file, key))
+                    for key, file in missing.items()
+                }
+                scheduler = self._scheduler or download_scheduler.get_scheduler()
+                for key, path in scheduler.run(tasks).items():
+                    local_paths[key] = self.register(key, path, self._remote_info(database, missing[key]))
+                self.lease(local_paths)
+
+        self.evict(protected_keys=set(files_by_key))
+        missing_keys = [key for key in files_by_key if key not in local_paths]
+        if missing_keys:
+            raise IncompleteDownloadError(missing_keys, len(files_by_key))
+        return [local_paths[key] for key in files_by_key]
+
+    def _download_file(self, database: Any, file: Any, key: str) -> Path:
+        """
+        Baixa um arquivo numa pasta temporária, valida e só então move para a partição.
+
+        Qualquer falha levanta exceção (o agendador tenta de novo) e apaga a pasta temporária.
+        """
+        partition_dir = self._root / key.rsplit("/", 1)[0]
+        partition_dir.mkdir(parents=True, exist_ok=True)
+        staging_dir = Path(tempfile.mkdtemp(prefix=PARTIAL_DIR_PREFIX, dir=partition_dir))
+        try:
+            print(f" -> [Store] Baixando do FTP: {key}")
+            downloaded_paths = _paths_from_download(
+                database.download([file], local_dir=str(staging_dir))
+            )
+            if not downloaded_paths:
+                raise ValueError("o PySUS não devolveu nenhum arquivo")
+            validate_download(downloaded_paths[0], self._remote_info(database, file))
+
+            final_path = partition_dir / downloaded_paths[0].name
+            # Sobra de um download antigo que não chegou ao manifesto.
+            self._delete_path(final_path)
+            os.replace(downloaded_paths[0], final_path)
+            return final_path
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+    def _remove_partial_downloads(self) -> None:
+        """Apaga pastas temporárias deixadas por um processo interrompido no meio de um download."""
+        for staging_dir in self._root.glob(f"**/{PARTIAL_DIR_PREFIX}*"):
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+    # --- Revisões no FTP ---
+
+    def is_outdated(self, key: str, remote: Dict[str, Any]) -> bool:
+        """True quando o tamanho ou a data informados pelo FTP mudaram desde o download."""
+        with self._lock:
+            self._refresh_entries()
+            entry = self._entries.get(key)
+        if not entry:
+            return False
+        stored = entry.get("remote") or {}
+        # Sem informação de um dos lados não há como comparar: o arquivo é mantido.
+        return any(
+            remote.get(field) and stored.get(field) and remote[field] != stored[field]
+            for field in ("size", "last_update")
+        )
+
+    def refresh(self, database: Any, system: str, group: str, files: Any) -> List[str]:
+        """
+        Baixa de novo apenas os arquivos já armazenados cuja versão no FTP mudou.
+
+        A cópia antiga só é substituída depois que a nova foi baixada e validada.
+        Devolve as chaves atualizadas.
+        """
+        files = files if isinstance(files, list) else [files] if files else []
+        outdated: Dict[str, Any] = {}
+        remotes: Dict[str, Dict[str, Any]] = {}
+        for file in files:
+            key = self.build_key(database, system, group, file)
+            remote = self._remote_info(database, file)
+            if self.is_outdated(key, remote):
+                outdated[key] = file
+                remotes[key] = remote
+
+        if not outdated:
+            return []
+
+        print(f" -> [Store] {len(outdated)} arquivo(s) revisado(s) no FTP: {sorted(outdated)}")
+        updated: List[str] = []
+        with self._locked_keys(outdated):
+            tasks = {
+                key: (lambda key=key, file=file: self._download_file(database, file, key))
+                for key, file in outdated.items()
+            }
+            scheduler = self._scheduler or download_scheduler.get_scheduler()
+            for key, path in scheduler.run(tasks).items():
+                self.register(key, path, remotes[key])
+                updated.append(key)
+        return sorted(updated)
+
+    # --- Despejo LRU ---
+
+    def lease(self, keys: Any, seconds: Optional[float] = None) -> None:
+        """Protege as chaves do despejo pelos próximos `seconds` (renova uma concessão ativa)."""
+        until = time.time() + (self._lease_seconds if seconds is None else seconds)
+        with self._lock:
+            for key in keys:
+                self._leases[key] = max(self._leases.get(key, 0.0), until)
+
+    def release(self, keys: Any) -> None:
+        """Encerra as concessões antes do prazo, para quem sabe que terminou de ler."""
+        with self._lock:
+            for key in keys:
+                self._leases.pop(key, None)
+
+    def _leased_keys(self) -> set:
+        now = time.time()
+        with self._lock:
+            for key in [key for key, until in self._leases.items() if until <= now]:
+                del self._leases[key]
+            return set(self._leases)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            self._refresh_entries()
+            return sum(entry["size_bytes"] for entry in self._entries.values())
+
+    def evict(self, protected_keys: Optional[set] = None) -> List[str]:
+        """
+        Remove as entradas menos usadas recentemente até caber no orçamento de disco.
+
+        Chaves com concessão ativa (arquivos que uma requisição pode estar lendo) e
+        `protected_keys` nunca são removidas.
+        """
+        protected_keys = set(protected_keys or ()) | self._leased_keys()
+        evicted: List[str] = []
+        with self._lock:
+            if self.total_bytes() <= self._max_bytes:
+                return evicted
+
+            def evict_entries(entries: Dict[str, Dict[str, Any]]) -> None:
+                # Decidido sobre o manifesto relido: inclui o que outros processos registraram.
+                total = sum(entry["size_bytes"] for entry in entries.values())
+                candidates = sorted(
+                    (key for key in entries if key not in protected_keys),
+                    key=self._last_access
+                )
+                for key in candidates:
+                    if total <= self._max_bytes:
+                        break
+                    entry = entries.pop(key)
+                    total -= entry["size_bytes"]
+                    self._delete_path(self._root / entry["path"])
+                    evicted.append(key)
+                return bool(evicted)
+
+            self._update_manifest(evict_entries)
+            if evicted:
+                print(f" -> [Store] {len(evicted)} arquivo(s) removido(s) para respeitar o orçamento de disco.")
+        return evicted
+
+    def remove(self, key: str) -> None:
+        def remove_entry(entries: Dict[str, Dict[str, Any]]) -> None:
+            entry = entries.pop(key, None)
+            if not entry:
+                return False
+            self._delete_path(self._root / entry["path"])
+
+        self._update_manifest(remove_entry)
+
+    @staticmethod
+    def _delete_path(path: Path) -> None:
+        if path.is_dir():
+            shutil.rmtree(path, ignore_errors=True)
+        elif path.exists():
+            path.unlink()
+
+    @staticmethod
+    def parse_key(key: str) -> Dict[str, str]:
+        """Separa uma chave do manifesto em sistema, grupo, UF, ano, mês e arquivo."""
+        system, group, uf, year, month, name = key.split("/", 5)
+        return {"system": system, "group": group, "uf": uf, "year": year, "month": month, "name": name}
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def local_path(self, entry: Dict[str, Any]) -> Path:
+        """Caminho no disco de uma entrada do manifesto (sem validar nem contar acesso)."""
+        return self._root / entry["path"]
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            self._refresh_entries()
+            return {key: dict(entry) for key, entry in self._entries.items()}
+
+
+_store: Optional[DatasusStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> DatasusStore:
+    """Instância única do armazenamento, compartilhada por todos os casos de uso."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = DatasusStore()
+        return _store
+
+
+def fetch_files(database: Any, system: str, group: str, files: Any) -> List[Path]:
+    """
+    Atalho usado pelos casos de uso do PySUS: baixa (ou reaproveita) e devolve os caminhos locais.
+
+    Levanta IncompleteDownloadError quando algum arquivo não pôde ser baixado.
+    """
+    return get_store().fetch(database, system, group, files)
@@ -0,0 +1,123 @@
+# src/infrastructure/shared/download_scheduler.py
+"""
+Agendador de downloads do FTP do DATASUS.
+
+Executa vários downloads ao mesmo tempo, respeitando um limite de conexões por
+servidor, e repete as tentativas que falham com espera exponencial (backoff).
+O agendador não sabe nada do PySUS: cada tarefa é só uma função sem argumentos
+que baixa (e valida) um arquivo, o que permite testá-lo contra um FTP local.
+
+Configuração (variáveis de ambiente):
+    DATASUS_FTP_HOST                 servidor usado como chave do limite de conexões.
+    DATASUS_DOWNLOAD_WORKERS         downloads simultâneos no total (padrão: 8).
+    DATASUS_DOWNLOAD_MAX_PER_HOST    conexões simultâneas por servidor (padrão: 4).
+    DATASUS_DOWNLOAD_ATTEMPTS        tentativas por arquivo (padrão: 3).
+    DATASUS_DOWNLOAD_BACKOFF_SECONDS espera antes da 2ª tentativa, dobrada a cada falha (padrão: 2).
+"""
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+DEFAULT_HOST = os.environ.get("DATASUS_FTP_HOST", "ftp.datasus.gov.br")
+MAX_WORKERS = int(os.environ.get("DATASUS_DOWNLOAD_WORKERS", 8))
+MAX_PER_HOST = int(os.environ.get("DATASUS_DOWNLOAD_MAX_PER_HOST", 4))
+MAX_ATTEMPTS = int(os.environ.get("DATASUS_DOWNLOAD_ATTEMPTS", 3))
+BACKOFF_SECONDS = float(os.environ.get("DATASUS_DOWNLOAD_BACKOFF_SECONDS", 2.0))
+
+
+class DownloadError(Exception):
+    """Todas as tentativas de baixar um arquivo falharam."""
+
+
+class DownloadScheduler:
+    """
+    Executa tarefas de download em paralelo com limite por servidor e novas tentativas.
+
+    Usage:
+        scheduler = DownloadScheduler(max_per_host=2)
+        results = scheduler.run({"SIH/RD/PE/2023/1/RDPE2301": lambda: baixar(arquivo)})
+    """
+    def __init__(
+        self,
+        max_workers: int = MAX_WORKERS,
+        max_per_host: int = MAX_PER_HOST,
+        max_attempts: int = MAX_ATTEMPTS,
+        backoff_seconds: float = BACKOFF_SECONDS,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self._max_workers = max(1, max_workers)
+        self._max_per_host = max(1, max_per_host)
+        self._max_attempts = max(1, max_attempts)
+        self._backoff_seconds = backoff_seconds
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        # Os semáforos são compartilhados entre chamadas de run(): duas requisições
+        # simultâneas juntas também não passam do limite de conexões do servidor.
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+
+    def _host_slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self._max_per_host)
+            return self._host_slots[host]
+
+    def _backoff(self, attempt: int) -> float:
+        # Espera exponencial com um pouco de ruído, para as tentativas não chegarem juntas.
+        return self._backoff_seconds * (2 ** (attempt - 1)) * random.uniform(0.8, 1.2)
+
+    def download_with_retry(self, name: str, download: Callable[[], Any], host: str = DEFAULT_HOST) -> Any:
+        """Executa `download` até dar certo ou esgotar as tentativas (DownloadError)."""
+        last_error: Optional[Exception] = None
+        for attempt in range(1, self._max_attempts + 1):
+            # A conexão só é ocupada durante o download; a espera do backoff fica fora do semáforo.
+            with self._host_slot(host):
+                try:
+                    return download()
+                except Exception as e:
+                    last_error = e
+
+            print(f" -> [Download] Falha em {name} (tentativa {attempt}/{self._max_attempts}): {last_error}")
+            if attempt < self._max_attempts:
+                self._sleep(self._backoff(attempt))
+
+        raise DownloadError(f"Não foi possível baixar {name}: {last_error}") from last_error
+
+    def run(self, tasks: Dict[str, Callable[[], Any]], host: str = DEFAULT_HOST) -> Dict[str, Any]:
+        """
+        Executa as tarefas {nome: função} em paralelo e devolve {nome: resultado}.
+
+        Tarefas que falharam em todas as tentativas ficam de fora do resultado; quem chama
+        confere as chaves que faltam (ver datasus_store.IncompleteDownloadError).
+        """
+        if not tasks:
+            return {}
+
+        results: Dict[str, Any] = {}
+        workers = min(self._max_workers, len(tasks))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="datasus-download") as executor:
+            futures = {
+                name: executor.submit(self.download_with_retry, name, download, host)
+                for name, download in tasks.items()
+            }
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except DownloadError as e:
+                    print(f" -> [Download] {e}")
+        return results
+
+
+_scheduler: Optional[DownloadScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> DownloadScheduler:
+    """Instância única do agendador, para o limite por servidor valer no processo inteiro."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = DownloadScheduler()
+        return _scheduler
@@ -1,19 +1,22 @@
 # src/infrastructure/shared/geography_utils.py
 
 import geopandas as gpd
-import geobr
 from typing import Optional
 
-def fetch_municipalities_gdf(state_abbr: str, year: int = 2020) -> Optional[gpd.GeoDataFrame]:
+from src.infrastructure.shared import geometry_registry
+
+def fetch_municipalities_gdf(state_abbr: str, year: int = 2020, tier: Optional[str] = None) -> Optional[gpd.GeoDataFrame]:
     """ 
-    Busca as geometrias dos municípios para um determinado estado e ano usando geobr.
+    Busca as geometrias dos municípios para um determinado estado e ano no registro de
+    geometrias (geobr carregado uma única vez por processo).
     
-    Centraliza a lógica de busca e pré-processamento do código municipal.
+    Centraliza a lógica de busca e pré-processamento do código municipal. Sem `tier`, o nível de
+    simplificação é escolhido pelo tamanho da UF no mapa renderizado.
     """
     print(f" -> [Geografia] Buscando geometrias municipais para {state_abbr.upper()} (Ano: {year})...")
     try:
-        # Nota: O geobr usa o código do estado ou a sigla.
-        municipalities_gdf = geobr.read_municipality(code_muni=state_abbr.upper(), year=year)
+        registry = geometry_registry.get_registry()
+        municipalities_gdf = registry.municipalities(state_abbr, year, tier or registry.tier_for_state(state_abbr))
         
         # Ajusta o código do município para 6 dígitos para compatibilidade
         municipalities_gdf['code_muni_6digit'] = municipalities_gdf['code_muni'] // 10
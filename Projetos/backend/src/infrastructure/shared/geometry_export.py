@@ -0,0 +1,184 @@
+# src/infrastructure/shared/geometry_export.py
+"""
+Exportação compacta das camadas do geometry_registry para clientes web.
+
+    - GeoJSON com precisão reduzida: coordenadas arredondadas a `precision` casas decimais
+      (5 casas ≈ 1 m, bem abaixo do que os níveis simplificados preservam).
+    - TopoJSON: cada fronteira compartilhada entre vizinhos vira um único arco, referenciado
+      pelos dois lados, e as coordenadas são quantizadas numa grade inteira de
+      `quantization` posições por eixo e gravadas como deltas.
+
+Junto com um nível de simplificação (geometry_registry.TIERS), o TopoJSON de uma UF fica
+uma ordem de grandeza menor que o GeoJSON completo.
+"""
+import json
+import math
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import geopandas as gpd
+import numpy as np
+import shapely
+from shapely.geometry import mapping
+
+DEFAULT_PRECISION = 5
+DEFAULT_QUANTIZATION = 100_000
+
+Point = Tuple[int, int]
+
+
+def _property(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def _properties(gdf: gpd.GeoDataFrame, columns: Optional[Sequence[str]]) -> List[Dict[str, Any]]:
+    names = [name for name in (columns or gdf.columns) if name in gdf.columns and name != gdf.geometry.name]
+    return [{name: _property(value) for name, value in zip(names, row)} for row in gdf[names].itertuples(index=False)]
+
+
+def to_geojson(gdf: gpd.GeoDataFrame, precision: int = DEFAULT_PRECISION, columns: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """FeatureCollection com as coordenadas arredondadas a `precision` casas decimais."""
+    geometries = shapely.transform(gdf.geometry.values, lambda coords: np.round(coords, precision))
+    features = [
+        {"type": "Feature", "properties": properties, "geometry": mapping(geometry) if geometry is not None else None}
+        for geometry, properties in zip(geometries, _properties(gdf, columns))
+    ]
+    return {"type": "FeatureCollection", "features": features}
+
+
+def _polygons(geometry) -> List[shapely.Polygon]:
+    if geometry is None or geometry.is_empty:
+        return []
+    if geometry.geom_type == "Polygon":
+        return [geometry]
+    if geometry.geom_type == "MultiPolygon":
+        return list(geometry.geoms)
+    if geometry.geom_type == "GeometryCollection":
+        return [polygon for part in geometry.geoms for polygon in _polygons(part)]
+    return []
+
+
+class _ArcBuilder:
+    """
+    Quebra os anéis quantizados em arcos nos pontos de junção (onde os vizinhos de um
+    ponto deixam de ser os mesmos) e guarda cada arco uma única vez.
+    """
+    def __init__(self):
+        self.arcs: List[List[Point]] = []
+        self._index: Dict[Tuple[Point, ...], int] = {}
+
+    @staticmethod
+    def junctions(rings: Iterable[List[Point]]) -> set:
+        neighbours: Dict[Point, Tuple[Point, Point]] = {}
+        junctions = set()
+        for ring in rings:
+            size = len(ring)
+            for i, point in enumerate(ring):
+                pair = tuple(sorted((ring[i - 1], ring[(i + 1) % size])))
+                seen = neighbours.setdefault(point, pair)
+                if seen != pair:
+                    junctions.add(point)
+        return junctions
+
+    def _arc_index(self, points: List[Point]) -> int:
+        key = tuple(points)
+        index = self._index.get(key)
+        if index is not None:
+            return index
+        # O mesmo arco percorrido no sentido contrário (o lado do vizinho) vira ~índice.
+        index = self._index.get(key[::-1])
+        if index is not None:
+            return ~index
+        self.arcs.append(points)
+        self._index[key] = len(self.arcs) - 1
+        return len(self.arcs) - 1
+
+    def ring_arcs(self, ring: List[Point], junctions: set) -> List[int]:
+        cuts = [i for i, point in enumerate(ring) if point in junctions]
+        if not cuts:
+            # Anel sem vizinhos (ilha ou enclave): começa no menor ponto, para que o mesmo
+            # anel visto dos dois lados (contorno de um, buraco do outro) vire um só arco.
+            start = ring.index(min(ring))
+            rotated = ring[start:] + ring[:start]
+            return [self._arc_index(rotated + [rotated[0]])]
+
+        rotated = ring[cuts[0]:] + ring[:cuts[0]]
+        offsets = [i - cuts[0] for i in cuts] + [len(ring)]
+        closed = rotated + [rotated[0]]
+        return [self._arc_index(closed[offsets[k]:offsets[k + 1] + 1]) for k in range(len(offsets) - 1)]
+
+
+def to_topojson(
+    gdf: gpd.GeoDataFrame,
+    object_name: str,
+    quantization: int = DEFAULT_QUANTIZATION,
+    columns: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
+    """TopoJSON com arcos compartilhados, coordenadas quantizadas e arcos em deltas."""
+    if gdf.empty:
+        return {"type": "Topology", "objects": {object_name: {"type": "GeometryCollection", "geometries": []}}, "arcs": []}
+
+    minx, miny, maxx, maxy = (float(value) for value in gdf.total_bounds)
+    scale_x = (maxx - minx) / (quantization - 1) or 1.0
+    scale_y = (maxy - miny) / (quantization - 1) or 1.0
+
+    def quantize(ring) -> List[Point]:
+        coords = np.asarray(ring.coords)[:-1]
+        points = np.column_stack((np.round((coords[:, 0] - minx) / scale_x), np.round((coords[:, 1] - miny) / scale_y))).astype(int)
+        quantized: List[Point] = []
+        for x, y in points.tolist():
+            if not quantized or quantized[-1] != (x, y):
+                quantized.append((x, y))
+        if len(quantized) > 1 and quantized[0] == quantized[-1]:
+            quantized.pop()
+        return quantized
+
+    # Polígonos de cada feição como listas de anéis quantizados (contorno + buracos).
+    shapes: List[List[List[List[Point]]]] = []
+    for geometry in gdf.geometry.values:
+        polygons = []
+        for polygon in _polygons(geometry):
+            rings = [quantize(polygon.exterior)] + [quantize(interior) for interior in polygon.interiors]
+            # Anéis que colapsam na grade (menos de 3 pontos) somem, como no topojson.
+            rings = [ring for ring in rings if len(ring) >= 3]
+            if rings:
+                polygons.append(rings)
+        shapes.append(polygons)
+
+    builder = _ArcBuilder()
+    junctions = builder.junctions(ring for polygons in shapes for rings in polygons for ring in rings)
+
+    geometries = []
+    for polygons, properties in zip(shapes, _properties(gdf, columns)):
+        arcs = [[builder.ring_arcs(ring, junctions) for ring in rings] for rings in polygons]
+        if not arcs:
+            geometries.append({"type": None, "properties": properties})
+        elif len(arcs) == 1:
+            geometries.append({"type": "Polygon", "arcs": arcs[0], "properties": properties})
+        else:
+            geometries.append({"type": "MultiPolygon", "arcs": arcs, "properties": properties})
+
+    return {
+        "type": "Topology",
+        "bbox": [minx, miny, maxx, maxy],
+        "transform": {"scale": [scale_x, scale_y], "translate": [minx, miny]},
+        "objects": {object_name: {"type": "GeometryCollection", "geometries": geometries}},
+        "arcs": [_delta_encode(arc) for arc in builder.arcs],
+    }
+
+
+def _delta_encode(arc: List[Point]) -> List[List[int]]:
+    encoded = [list(arc[0])]
+    for (x0, y0), (x1, y1) in zip(arc, arc[1:]):
+        encoded.append([x1 - x0, y1 - y0])
+    return encoded
+
+
+def dumps(document: Dict[str, Any]) -> str:
+    """JSON compacto (sem espaços), como enviado ao cliente."""
+    return json.dumps(document, separators=(",", ":"), ensure_ascii=False)
@@ -0,0 +1,436 @@
+# src/infrastructure/shared/geometry_registry.py
+"""
+Registro das geometrias do geobr compartilhado pelo processo inteiro.
+
+Cada `geobr.read_*` baixa e decodifica a malha do IBGE de novo a cada chamada. Aqui cada
+camada (layer, ano, nível) é carregada uma única vez, guardada em memória e em disco
+como GeoParquet (para sobreviver a reinicializações). Depois do primeiro uso, mapas e
+processadores recebem a geometria da memória, sem rede nem decodificação.
+
+Camadas disponíveis: state, municipality, immediate_region, intermediate_region.
+
+Níveis de simplificação (TIERS): a malha completa do geobr ('full') é simplificada com
+tolerâncias crescentes ('high', 'medium', 'low'), preservando a topologia: fronteiras
+compartilhadas são simplificadas uma única vez, sem buracos nem sobreposições entre vizinhos.
+Os níveis são gerados juntos, na primeira vez que algum deles é pedido. `pick_tier` escolhe
+o nível pela área visível e pela largura da saída (ou pelo zoom do mapa web): o detalhe
+desenhado acompanha o tamanho de um pixel, e não o do litoral.
+
+Além do arquivo nacional, cada camada é gravada particionada por UF, com um índice das
+caixas envolventes (bbox) de cada partição:
+
+    <raiz>/<layer>/<ano>_<nível>.parquet                  (Brasil inteiro)
+    <raiz>/<layer>/<ano>_<nível>/<code_state>.parquet
+    <raiz>/<layer>/<ano>_<nível>/index.json                ({code_state: abbrev, bbox, linhas})
+
+Um mapa de uma UF lê só a partição dela; o fundo vem das UFs cuja bbox cruza a área
+visível (a UF e as vizinhas), e não do Brasil inteiro.
+
+Configuração (variáveis de ambiente):
+    GEOMETRY_STORE_DIR  pasta das camadas salvas (padrão: <DATASUS_STORE_DIR>/geometry).
+"""
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import geobr
+import geopandas as gpd
+import pandas as pd
+import shapely
+
+from src.infrastructure.shared import datasus_store
+
+GEOMETRY_DIR = os.environ.get("GEOMETRY_STORE_DIR", str(Path(datasus_store.STORE_DIR) / "geometry"))
+
+# Ano da malha usada como fundo dos mapas (o Brasil inteiro, por UF).
+CONTEXT_YEAR = 2020
+# Margem em volta da UF no zoom dos mapas (fração da largura/altura da bbox).
+CONTEXT_BUFFER = 0.20
+INDEX_FILE = "index.json"
+# SIRGAS 2000, o sistema de referência das malhas do geobr.
+GEOBR_CRS = "EPSG:4674"
+
+# Tolerância de cada nível, em graus (0,001° ≈ 110 m), do mais detalhado ao mais leve.
+TIERS: Dict[str, float] = {
+    "full": 0.0,
+    "high": 0.0005,
+    "medium": 0.002,
+    "low": 0.01,
+}
+DEFAULT_TIER = "medium"
+# Largura dos PNGs gerados pelo map_plotter (12 pol. a 300 dpi).
+RENDER_WIDTH_PX = 3600
+# Lado de um tile de mapa web, em pixels.
+TILE_SIZE_PX = 256
+# Bbox do Brasil inteiro (mapas sem zoom).
+BRAZIL_BOUNDS: Tuple[float, float, float, float] = (-74.0, -33.8, -28.8, 5.3)
+
+LAYERS: Dict[str, Callable[..., gpd.GeoDataFrame]] = {
+    "state": geobr.read_state,
+    "municipality": geobr.read_municipality,
+    "immediate_region": geobr.read_immediate_region,
+    "intermediate_region": geobr.read_intermediate_region,
+}
+
+LayerKey = Tuple[str, int, str]
+Bounds = Tuple[float, float, float, float]
+
+
+def _bounds_intersect(a: Sequence[float], b: Sequence[float]) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def _empty() -> gpd.GeoDataFrame:
+    return gpd.GeoDataFrame(geometry=[], crs=GEOBR_CRS)
+
+
+def _check_layer(layer: str) -> None:
+    if layer not in LAYERS:
+        raise ValueError(f"Camada '{layer}' desconhecida. Disponíveis: {sorted(LAYERS)}")
+
+
+def _check_tier(tier: str) -> str:
+    if tier not in TIERS:
+        raise ValueError(f"Nível '{tier}' desconhecido. Disponíveis: {list(TIERS)}")
+    return tier
+
+
+def expand_bounds(bounds: Sequence[float], buffer: float = CONTEXT_BUFFER) -> Bounds:
+    """Bbox aumentada em `buffer` da largura/altura de cada lado (a área visível do zoom)."""
+    minx, miny, maxx, maxy = bounds
+    buffer_x = (maxx - minx) * buffer
+    buffer_y = (maxy - miny) * buffer
+    return minx - buffer_x, miny - buffer_y, maxx + buffer_x, maxy + buffer_y
+
+
+def simplify_layer(gdf: gpd.GeoDataFrame, tolerance: float) -> gpd.GeoDataFrame:
+    """
+    Simplifica a camada inteira como uma cobertura (shapely.coverage_simplify): cada
+    fronteira compartilhada é simplificada uma vez só, igual dos dois lados.
+    """
+    simplified = gdf.copy()
+    geometry = shapely.make_valid(gdf.geometry.values)
+    try:
+        simplified.geometry = shapely.coverage_simplify(geometry, tolerance)
+    except Exception as e:
+        # GEOS antigo ou cobertura inválida: simplificação por polígono, sem garantia entre vizinhos.
+        print(f" -> [Geometria] coverage_simplify indisponível ({e}); simplificando cada polígono.")
+        simplified.geometry = shapely.simplify(geometry, tolerance, preserve_topology=True)
+    return simplified
+
+
+def degrees_per_pixel(bounds: Optional[Sequence[float]] = None, width_px: int = RENDER_WIDTH_PX, zoom: Optional[float] = None) -> float:
+    """Tamanho de um pixel da saída, em graus: pela área visível e largura, ou pelo zoom do mapa web."""
+    if zoom is not None:
+        return 360.0 / (TILE_SIZE_PX * 2 ** zoom)
+    if bounds is None:
+        return TIERS[DEFAULT_TIER]
+    minx, miny, maxx, maxy = bounds
+    return max(maxx - minx, maxy - miny) / max(1, width_px)
+
+
+def pick_tier(bounds: Optional[Sequence[float]] = None, width_px: int = RENDER_WIDTH_PX, zoom: Optional[float] = None) -> str:
+    """Nível mais leve cuja tolerância ainda cabe em um pixel da saída."""
+    pixel = degrees_per_pixel(bounds, width_px, zoom)
+    for tier, tolerance in sorted(TIERS.items(), key=lambda item: -item[1]):
+        if tolerance <= pixel:
+            return tier
+    return "full"
+
+
+class GeometryRegistry:
+    """
+    Camadas do geobr já carregadas, com persistência em GeoParquet.
+
+    Os GeoDataFrames devolvidos por `get` são compartilhados entre as requisições e não devem
+    ser alterados; os recortes (`states`, `municipalities`, `layer_for_state`, `context_states`)
+    já são cópias.
+    """
+    def __init__(self, geometry_dir: str = GEOMETRY_DIR):
+        self._dir = Path(geometry_dir)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._layer_locks: Dict[Any, threading.Lock] = {}
+        self._layers: Dict[LayerKey, gpd.GeoDataFrame] = {}
+        # Índice de bbox de cada camada e partições (camada, UF) já lidas.
+        self._indexes: Dict[LayerKey, Dict[int, Dict[str, Any]]] = {}
+        self._partitions: Dict[Tuple[LayerKey, int], gpd.GeoDataFrame] = {}
+
+    def _path(self, key: LayerKey) -> Path:
+        layer, year, tier = key
+        return self._dir / layer / f"{year}_{tier}.parquet"
+
+    def _partition_dir(self, key: LayerKey) -> Path:
+        return self._path(key).with_suffix("")
+
+    def _layer_lock(self, key: Any) -> threading.Lock:
+        with self._lock:
+            return self._layer_locks.setdefault(key, threading.Lock())
+
+    def _load_from_geobr(self, key: LayerKey) -> gpd.GeoDataFrame:
+        layer, year, _ = key
+        print(f" -> [Geometria] Baixando '{layer}' ({year}, completa) do geobr...")
+        gdf = LAYERS[layer](year=year, simplified=False)
+        self._save(key, gdf)
+        return gdf
+
+    def _build_tiers(self, key: LayerKey) -> gpd.GeoDataFrame:
+        """Gera (e grava) todos os níveis simplificados da camada; devolve o de `key`."""
+        layer, year, tier = key
+        full = self.get(layer, year, "full")
+        result = None
+        for other_tier, tolerance in TIERS.items():
+            if other_tier == "full":
+                continue
+            other_key = (layer, year, other_tier)
+            if other_tier != tier and self._path(other_key).is_file():
+                continue
+            print(f" -> [Geometria] Simplificando '{layer}' ({year}) no nível '{other_tier}' ({tolerance:g}°)...")
+            simplified = simplify_layer(full, tolerance)
+            self._save(other_key, simplified)
+            if other_tier == tier:
+                result = simplified
+        return result
+
+    def _save(self, key: LayerKey, gdf: gpd.GeoDataFrame, path: Optional[Path] = None) -> bool:
+        # Escrita atômica, como no manifesto do datasus_store, com nome temporário único.
+        path = path or self._path(key)
+        temp_path: Optional[Path] = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(prefix=f"{path.name}.", suffix=".tmp", dir=path.parent)
+            os.close(fd)
+            temp_path = Path(temp_name)
+            gdf.to_parquet(temp_path, index=False)
+            os.replace(temp_path, path)
+            return True
+        except Exception as e:
+            # A camada continua disponível só em memória.
+            print(f" -> [Geometria] Não foi possível salvar '{path.name}': {e}")
+            if temp_path is not None:
+                temp_path.unlink(missing_ok=True)
+            return False
+
+    def _load_saved(self, key: LayerKey) -> Optional[gpd.GeoDataFrame]:
+        path = self._path(key)
+        if not path.is_file():
+            return None
+        try:
+            return gpd.read_parquet(path)
+        except Exception as e:
+            print(f" -> [Geometria] Arquivo '{path}' ilegível, gerando de novo: {e}")
+            return None
+
+    def _load_national(self, key: LayerKey) -> gpd.GeoDataFrame:
+        gdf = self._load_saved(key)
+        if gdf is None and key[2] == "full":
+            gdf = self._load_from_geobr(key)
+        elif gdf is None:
+            # Um único build de níveis por (camada, ano): quem chega depois lê o que foi gravado.
+            layer, year, _ = key
+            with self._layer_lock(("tiers", layer, year)):
+                gdf = self._load_saved(key)
+                if gdf is None:
+                    gdf = self._build_tiers(key)
+        return gdf
+
+    def get(self, layer: str, year: int = CONTEXT_YEAR, tier: str = DEFAULT_TIER) -> gpd.GeoDataFrame:
+        """
+        Camada nacional `layer` do ano `year` no nível `tier`. Só a primeira chamada do
+        processo espera pelo disco ou pelo geobr; as demais são respondidas da memória.
+        """
+        _check_layer(layer)
+        key = (layer, int(year), _check_tier(tier))
+        gdf = self._layers.get(key)
+        if gdf is None:
+            with self._layer_lock(key):
+                gdf = self._layers.get(key)
+                if gdf is None:
+                    gdf = self._load_national(key)
+                    self._layers[key] = gdf
+        return gdf
+
+    def _build_partitions(self, key: LayerKey) -> Dict[int, Dict[str, Any]]:
+        """Grava a camada nacional em uma partição por UF e devolve o índice de bbox."""
+        gdf = self._layers.get(key)
+        if gdf is None:
+            gdf = self._load_national(key)
+
+        layer, year, tier = key
+        print(f" -> [Geometria] Particionando '{layer}' ({year}, {tier}) por UF...")
+        partition_dir = self._partition_dir(key)
+        index: Dict[int, Dict[str, Any]] = {}
+        saved = True
+        for code_state, part in gdf.groupby(gdf["code_state"].astype(int), sort=True):
+            code_state = int(code_state)
+            part = part.reset_index(drop=True)
+            abbrevs = part["abbrev_state"].dropna().unique() if "abbrev_state" in part else []
+            index[code_state] = {
+                "abbrev_state": str(abbrevs[0]) if len(abbrevs) else None,
+                "bbox": [float(value) for value in part.total_bounds],
+                "rows": len(part),
+            }
+            if not self._save(key, part, partition_dir / f"{code_state}.parquet"):
+                # Sem disco, a partição fica em memória.
+                self._partitions[(key, code_state)] = part
+                saved = False
+
+        if saved:
+            # O índice é gravado por último: se ele existe, todas as partições existem.
+            self._write_index(partition_dir / INDEX_FILE, index)
+        return index
+
+    def _write_index(self, path: Path, index: Dict[int, Dict[str, Any]]) -> None:
+        temp_path: Optional[Path] = None
+        try:
+            fd, temp_name = tempfile.mkstemp(prefix=f"{path.name}.", suffix=".tmp", dir=path.parent)
+            temp_path = Path(temp_name)
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump({str(code): entry for code, entry in index.items()}, handle)
+            os.replace(temp_path, path)
+        except Exception as e:
+            print(f" -> [Geometria] Não foi possível salvar o índice '{path}': {e}")
+            if temp_path is not None:
+                temp_path.unlink(missing_ok=True)
+
+    def _load_index(self, key: LayerKey) -> Optional[Dict[int, Dict[str, Any]]]:
+        path = self._partition_dir(key) / INDEX_FILE
+        if not path.is_file():
+            return None
+        try:
+            with open(path, encoding="utf-8") as handle:
+                return {int(code): entry for code, entry in json.load(handle).items()}
+        except Exception as e:
+            print(f" -> [Geometria] Índice '{path}' ilegível, particionando de novo: {e}")
+            return None
+
+    def index(self, layer: str, year: int = CONTEXT_YEAR, tier: str = DEFAULT_TIER) -> Dict[int, Dict[str, Any]]:
+        """Índice da camada por UF: {code_state: {'abbrev_state', 'bbox', 'rows'}}."""
+        _check_layer(layer)
+        key = (layer, int(year), _check_tier(tier))
+        index = self._indexes.get(key)
+        if index is None:
+            with self._layer_lock(("index",) + key):
+                index = self._indexes.get(key)
+                if index is None:
+                    index = self._load_index(key)
+                    if index is None:
+                        index = self._build_partitions(key)
+                    self._indexes[key] = index
+        return index
+
+    def _partition(self, key: LayerKey, code_state: int) -> gpd.GeoDataFrame:
+        partition_key = (key, code_state)
+        gdf = self._partitions.get(partition_key)
+        if gdf is None:
+            with self._layer_lock(partition_key):
+                gdf = self._partitions.get(partition_key)
+                if gdf is None:
+                    gdf = gpd.read_parquet(self._partition_dir(key) / f"{code_state}.parquet")
+                    self._partitions[partition_key] = gdf
+        return gdf
+
+    def code_state(self, state_abbr: str, layer: str = "state", year: int = CONTEXT_YEAR, tier: str = DEFAULT_TIER) -> Optional[int]:
+        """Código IBGE de uma UF pela sigla (ex.: 'PE' -> 26), pelo índice de `layer`."""
+        state_abbr = state_abbr.upper()
+        for code_state, entry in self.index(layer, year, tier).items():
+            if entry.get("abbrev_state") == state_abbr:
+                return code_state
+        return None
+
+    def state_bounds(self, state_abbr: str, year: int = CONTEXT_YEAR) -> Optional[Bounds]:
+        """Bbox de uma UF (pelo índice do nível mais leve), ou None quando a UF não existe."""
+        index = self.index("state", year, "low")
+        code_state = self.code_state(state_abbr, "state", year, "low")
+        return tuple(index[code_state]["bbox"]) if code_state is not None else None
+
+    def tier_for_state(self, state_abbr: str, width_px: int = RENDER_WIDTH_PX, buffer: float = CONTEXT_BUFFER) -> str:
+        """Nível para desenhar uma UF com zoom (bbox + `buffer`) numa saída de `width_px` pixels."""
+        bounds = self.state_bounds(state_abbr)
+        return pick_tier(expand_bounds(bounds, buffer), width_px) if bounds else DEFAULT_TIER
+
+    def layer_for_state(self, layer: str, code_state: int, year: int = CONTEXT_YEAR, tier: str = DEFAULT_TIER) -> gpd.GeoDataFrame:
+        """Feições de `layer` de uma UF, pelo código IBGE do estado (ex.: 26); lê só a partição da UF."""
+        index = self.index(layer, year, tier)
+        code_state = int(code_state)
+        if code_state not in index:
+            return _empty()
+        return self._partition((layer, int(year), tier), code_state).copy()
+
+    def layer_in_bounds(self, layer: str, bounds: Sequence[float], year: int = CONTEXT_YEAR, tier: str = DEFAULT_TIER) -> gpd.GeoDataFrame:
+        """Feições de `layer` das UFs cuja bbox cruza `bounds` (minx, miny, maxx, maxy)."""
+        index = self.index(layer, year, tier)
+        key = (layer, int(year), tier)
+        parts = [
+            self._partition(key, code_state)
+            for code_state, entry in index.items()
+            if _bounds_intersect(entry["bbox"], bounds)
+        ]
+        if not parts:
+            return _empty()
+        return gpd.GeoDataFrame(pd.concat(parts, ignore_index=True), crs=parts[0].crs)
+
+    def states(self, year: int = CONTEXT_YEAR, tier: str = DEFAULT_TIER, state_abbr: Optional[str] = None) -> gpd.GeoDataFrame:
+        """UFs do Brasil, ou só `state_abbr` (ex.: 'PE')."""
+        if state_abbr is None:
+            return self.get("state", year, tier).copy()
+        code_state = self.code_state(state_abbr, "state", year, tier)
+        if code_state is None:
+            return _empty()
+        return self.layer_for_state("state", code_state, year, tier)
+
+    def context_states(
+        self,
+        state_abbr: str,
+        year: int = CONTEXT_YEAR,
+        tier: str = DEFAULT_TIER,
+        buffer: float = CONTEXT_BUFFER
+    ) -> gpd.GeoDataFrame:
+        """
+        Contorno de fundo de um mapa com zoom na UF: a UF e as vizinhas cuja bbox cruza a área
+        visível (bbox da UF + `buffer`). Vazio quando a UF não existe.
+        """
+        index = self.index("state", year, tier)
+        code_state = self.code_state(state_abbr, "state", year, tier)
+        if code_state is None:
+            return _empty()
+        return self.layer_in_bounds("state", expand_bounds(index[code_state]["bbox"], buffer), year, tier)
+
+    def municipalities(self, state_abbr: str, year: int = CONTEXT_YEAR, tier: str = DEFAULT_TIER) -> gpd.GeoDataFrame:
+        """Municípios de uma UF, pela sigla (ex.: 'PE'); lê só a partição da UF."""
+        code_state = self.code_state(state_abbr, "municipality", year, tier)
+        if code_state is None:
+            return _empty()
+        return self.layer_for_state("municipality", code_state, year, tier)
+
+    def warm_up(self, keys: Optional[List[LayerKey]] = None) -> None:
+        """Carrega as camadas antes da primeira requisição; uma falha não impede as outras."""
+        for layer, year, tier in keys or [("state", CONTEXT_YEAR, tier) for tier in TIERS]:
+            try:
+                self.get(layer, year, tier)
+                self.index(layer, year, tier)
+            except Exception as e:
+                print(f" -> [Geometria] Não foi possível pré-carregar '{layer}' ({year}, {tier}): {e}")
+
+
+_registry: Optional[GeometryRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> GeometryRegistry:
+    """Instância única do registro, compartilhada por mapas e processadores."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = GeometryRegistry()
+        return _registry
+
+
+def warm_up_in_background(keys: Optional[List[LayerKey]] = None) -> threading.Thread:
+    """Pré-carrega as camadas numa thread, sem atrasar a subida da API."""
+    thread = threading.Thread(target=get_registry().warm_up, args=(keys,), name="geometry-warm-up", daemon=True)
+    thread.start()
+    return thread
@@ -1,7 +1,7 @@
 # src/infrastructure/shared/ibge_client.py
 import requests
 import pandas as pd
-from typing import Optional
+from typing import Dict, Optional
 
 HEADERS = {'User-Agent': 'Brazil-Data-API/1.0'}
 API_TIMEOUT = 30
@@ -52,6 +52,24 @@ def fetch_geojson_mesh(locality_type: str, locality_id: str):
     base_url = "https://servicodados.ibge.gov.br/api/v2/malhas"
     return _fetch_request(f"{base_url}/{locality_id}?formato=application/vnd.geo+json")
 
+def fetch_populations(localities: str) -> Dict[str, int]:
+    """
+    Gets the 2021 population of many localities in a single request, keyed by IBGE id.
+    `localities` uses the aggregates API syntax, e.g. "N6[N3[26]]" (municipalities of PE) or "N3[all]".
+    """
+    url = f"https://servicodados.ibge.gov.br/api/v3/agregados/6579/periodos/2021/variaveis/9324?localidades={localities}"
+    data = _fetch_request(url)
+    populations: Dict[str, int] = {}
+    try:
+        for series in data[0]['resultados'][0]['series']:
+            try:
+                populations[str(series['localidade']['id'])] = int(series['serie']['2021'])
+            except (KeyError, TypeError, ValueError):
+                continue
+    except (IndexError, KeyError, TypeError):
+        pass
+    return populations
+
 def fetch_population(locality_level: str, locality_id: str) -> int:
     """Gets the population for a given level (N3=state, N6=municipality) and ID."""
     url = f"https://servicodados.ibge.gov.br/api/v3/agregados/6579/periodos/2021/variaveis/9324?localidades={locality_level}[{locality_id}]"
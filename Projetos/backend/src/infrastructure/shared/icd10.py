@@ -0,0 +1,121 @@
+# src/infrastructure/shared/icd10.py
+"""
+Tabelas da CID-10 pré-calculadas para classificar colunas inteiras de códigos
+(ex.: CAUSABAS do SIM) sem interpretar texto linha a linha.
+
+Todas as 2.600 categorias de três caracteres possíveis (A00 a Z99) são geradas uma vez,
+e o capítulo (e o grupo, quando configurado) de cada uma fica num array do Arrow na
+mesma posição. Classificar uma coluna é então um `index_in` da categoria do código
+nesse vocabulário seguido de um `take` no array do capítulo/grupo.
+
+Os grupos (blocos, ex.: "I20-I25 Doenças isquêmicas do coração") vêm da tabela oficial
+do DATASUS (CID-10-GRUPOS.CSV, colunas CATINIC;CATFIM;DESCRICAO):
+
+    CID10_GROUPS_CSV  caminho do CID-10-GRUPOS.CSV (opcional; sem ele, a dimensão de grupo fica indisponível).
+"""
+import csv
+import os
+import string
+import threading
+from typing import List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+GROUPS_CSV = os.environ.get("CID10_GROUPS_CSV")
+GROUPS_CSV_ENCODING = "latin-1"
+# Rótulo dos códigos em branco, inválidos ou fora das tabelas: a linha continua contada,
+# como a faixa etária "Ignored", e o total por capítulo/grupo bate com o total sem quebra.
+INVALID_CODE = "Ignorado/Inválido"
+
+# (número romano, primeira categoria, última categoria, descrição), como no Tabnet.
+CHAPTERS: List[Tuple[str, str, str, str]] = [
+    ("I", "A00", "B99", "Algumas doenças infecciosas e parasitárias"),
+    ("II", "C00", "D48", "Neoplasias (tumores)"),
+    ("III", "D50", "D89", "Doenças do sangue e dos órgãos hematopoéticos e alguns transtornos imunitários"),
+    ("IV", "E00", "E90", "Doenças endócrinas, nutricionais e metabólicas"),
+    ("V", "F00", "F99", "Transtornos mentais e comportamentais"),
+    ("VI", "G00", "G99", "Doenças do sistema nervoso"),
+    ("VII", "H00", "H59", "Doenças do olho e anexos"),
+    ("VIII", "H60", "H95", "Doenças do ouvido e da apófise mastóide"),
+    ("IX", "I00", "I99", "Doenças do aparelho circulatório"),
+    ("X", "J00", "J99", "Doenças do aparelho respiratório"),
+    ("XI", "K00", "K93", "Doenças do aparelho digestivo"),
+    ("XII", "L00", "L99", "Doenças da pele e do tecido subcutâneo"),
+    ("XIII", "M00", "M99", "Doenças do sistema osteomuscular e do tecido conjuntivo"),
+    ("XIV", "N00", "N99", "Doenças do aparelho geniturinário"),
+    ("XV", "O00", "O99", "Gravidez, parto e puerpério"),
+    ("XVI", "P00", "P96", "Algumas afecções originadas no período perinatal"),
+    ("XVII", "Q00", "Q99", "Malformações congênitas, deformidades e anomalias cromossômicas"),
+    ("XVIII", "R00", "R99", "Sintomas, sinais e achados anormais de exames clínicos e de laboratório"),
+    ("XIX", "S00", "T98", "Lesões, envenenamento e algumas outras conseqüências de causas externas"),
+    ("XX", "V01", "Y98", "Causas externas de morbidade e de mortalidade"),
+    ("XXI", "Z00", "Z99", "Fatores que influenciam o estado de saúde e o contato com os serviços de saúde"),
+    ("XXII", "U00", "U99", "Códigos para propósitos especiais"),
+]
+
+# Vocabulário de todas as categorias possíveis: a posição de cada uma indexa as tabelas abaixo.
+CATEGORIES: List[str] = [f"{letter}{number:02d}" for letter in string.ascii_uppercase for number in range(100)]
+CATEGORY_VOCABULARY = pa.array(CATEGORIES, pa.string())
+
+
+def _label_of(category: str, ranges: List[Tuple[str, str, str]]) -> Optional[str]:
+    # Categorias de três caracteres comparam como texto na ordem da CID (A00 < A09 < B00...).
+    for first, last, label in ranges:
+        if first <= category <= last:
+            return label
+    return None
+
+
+CHAPTER_BY_CATEGORY = pa.array(
+    [_label_of(category, [(first, last, f"{roman}. {name}") for roman, first, last, name in CHAPTERS]) for category in CATEGORIES],
+    pa.string()
+)
+
+_groups_lock = threading.Lock()
+_groups: Optional[pa.Array] = None
+
+
+def load_groups(path: str) -> pa.Array:
+    """Lê o CID-10-GRUPOS.CSV do DATASUS e monta o array de grupo por categoria."""
+    ranges: List[Tuple[str, str, str]] = []
+    with open(path, "r", encoding=GROUPS_CSV_ENCODING, newline="") as handle:
+        for row in csv.DictReader(handle, delimiter=";"):
+            first, last = row["CATINIC"].strip().upper(), row["CATFIM"].strip().upper()
+            ranges.append((first, last, f"{first}-{last} {row['DESCRICAO'].strip()}"))
+    return pa.array([_label_of(category, ranges) for category in CATEGORIES], pa.string())
+
+
+def has_groups() -> bool:
+    return bool(GROUPS_CSV) and os.path.isfile(GROUPS_CSV)
+
+
+def _group_by_category() -> pa.Array:
+    global _groups
+    with _groups_lock:
+        if _groups is None:
+            if not has_groups():
+                raise ValueError("Tabela de grupos da CID-10 indisponível: configure CID10_GROUPS_CSV com o CID-10-GRUPOS.CSV do DATASUS.")
+            _groups = load_groups(GROUPS_CSV)
+        return _groups
+
+
+def category_indices(codes: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Posição da categoria de cada código (ex.: 'I219' -> 'I21') no vocabulário; nulo se inválido."""
+    codes_text = pc.utf8_upper(pc.utf8_trim_whitespace(pc.cast(codes, pa.string())))
+    return pc.index_in(pc.utf8_slice_codeunits(codes_text, 0, 3), value_set=CATEGORY_VOCABULARY)
+
+
+def categories(codes: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Categoria de três caracteres de cada código (ex.: 'I219' -> 'I21'); INVALID_CODE se inválido."""
+    return pc.fill_null(pc.take(CATEGORY_VOCABULARY, category_indices(codes)), INVALID_CODE)
+
+
+def chapters(codes: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Capítulo de cada código (ex.: 'I219' -> 'IX. Doenças do aparelho circulatório'); INVALID_CODE se inválido."""
+    return pc.fill_null(pc.take(CHAPTER_BY_CATEGORY, category_indices(codes)), INVALID_CODE)
+
+
+def groups(codes: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Grupo (bloco) de cada código, pela tabela do CID10_GROUPS_CSV; INVALID_CODE se inválido."""
+    return pc.fill_null(pc.take(_group_by_category(), category_indices(codes)), INVALID_CODE)
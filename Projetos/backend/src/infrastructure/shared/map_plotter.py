@@ -3,8 +3,8 @@ from typing import Optional
 import geopandas as gpd
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches 
-import geobr 
 
+from src.infrastructure.shared import geometry_registry
 from src.infrastructure.shared.map_styles import STYLES 
 
 def plot_map(
@@ -24,8 +24,12 @@ def plot_map(
 
     try:
         # --- CARREGAMENTO E CONFIGURAÇÃO INICIAL ---
-        print(" -> [Visualização] Buscando mapa do Brasil para usar como fundo...")
-        brasil_gdf = geobr.read_state(code_state='all', year=2020) 
+        # Só a UF e as vizinhas que aparecem no zoom são lidas para o fundo.
+        print(" -> [Visualização] Buscando a UF e as vizinhas para usar como fundo...")
+        registry = geometry_registry.get_registry()
+        brasil_gdf = registry.context_states(state_abbr, tier=registry.tier_for_state(state_abbr))
+        if brasil_gdf.empty:
+            brasil_gdf = registry.get('state', geometry_registry.CONTEXT_YEAR, geometry_registry.pick_tier(geometry_registry.BRAZIL_BOUNDS))
         
         fig, ax = plt.subplots(1, 1, figsize=(12, 12)) 
         ax.set_aspect('equal')
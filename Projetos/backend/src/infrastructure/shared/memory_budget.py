@@ -0,0 +1,216 @@
+# src/infrastructure/shared/memory_budget.py
+"""
+Orçamento de memória por requisição dos resumos do PySUS.
+
+Antes de decodificar qualquer dado, o tamanho de cada arquivo já decodificado em Arrow é
+estimado pelos metadados do parquet (linhas, tipos e estatísticas das colunas lidas). Com
+essa estimativa:
+
+    - o tamanho do lote (linhas por leitura) é escolhido para caber em BATCH_SHARE do orçamento,
+      mesmo quando um row group inteiro não cabe;
+    - o estado do group-by pode usar até STATE_SHARE do orçamento antes de ir para o disco
+      (aggregation.GroupAggregator);
+    - a requisição reserva a sua parte da memória total do processo e espera a vez, ou é
+      recusada, quando outras requisições já ocupam tudo.
+
+Uma requisição que não cabe nem com o menor lote (MIN_BATCH_ROWS linhas) é recusada antes de
+começar, com MemoryBudgetError.
+
+Configuração (variáveis de ambiente):
+    REQUEST_MEMORY_BUDGET_MB  orçamento de cada requisição (padrão: 512).
+    MEMORY_TOTAL_BUDGET_MB    memória somada de todas as requisições simultâneas (padrão: 2048).
+    MEMORY_WAIT_SECONDS       espera por memória livre antes de recusar (padrão: 30).
+    AGGREGATION_SPILL_DIR     pasta dos resultados parciais gravados em disco (padrão: pasta temporária do sistema).
+"""
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+MB = 1024 ** 2
+REQUEST_MEMORY_BUDGET_BYTES = int(float(os.environ.get("REQUEST_MEMORY_BUDGET_MB", 512)) * MB)
+MEMORY_TOTAL_BUDGET_BYTES = int(float(os.environ.get("MEMORY_TOTAL_BUDGET_MB", 2048)) * MB)
+MEMORY_WAIT_SECONDS = float(os.environ.get("MEMORY_WAIT_SECONDS", 30))
+SPILL_DIR = os.environ.get("AGGREGATION_SPILL_DIR", tempfile.gettempdir())
+
+# Parte do orçamento para o lote decodificado e para o estado do group-by.
+BATCH_SHARE = 0.25
+STATE_SHARE = 0.5
+# O lote decodificado convive com as colunas derivadas dele (município em int32, faixas...).
+WORKING_SET_FACTOR = 3
+MIN_BATCH_ROWS = 1024
+# Offset de 4 bytes por valor das colunas de texto do Arrow.
+OFFSET_BYTES = 4
+
+
+class MemoryBudgetError(ValueError):
+    """A requisição não cabe no orçamento de memória."""
+    status_code = 413
+
+
+class MemoryBusyError(MemoryBudgetError):
+    """Outras requisições ocupam a memória total e a espera passou de MEMORY_WAIT_SECONDS."""
+    status_code = 503
+
+
+def _value_bytes(data_type: pa.DataType, statistics) -> Optional[float]:
+    """Bytes por valor decodificado; None quando só o tamanho do parquet serve de estimativa."""
+    if pa.types.is_boolean(data_type):
+        return 1 / 8
+    if pa.types.is_dictionary(data_type):
+        return data_type.index_type.bit_width / 8
+    try:
+        return data_type.bit_width / 8
+    except ValueError:
+        pass
+    if (pa.types.is_string(data_type) or pa.types.is_binary(data_type)) and statistics is not None and statistics.has_min_max:
+        # Códigos do DATASUS têm largura quase fixa: a média entre o menor e o maior basta.
+        return OFFSET_BYTES + (len(statistics.min) + len(statistics.max)) / 2
+    return None
+
+
+def estimate_decoded_bytes(parquet_file: pq.ParquetFile, columns: Sequence[str]) -> int:
+    """
+    Estimativa, só pelos metadados, do tamanho em Arrow das colunas pedidas do arquivo inteiro.
+
+    Os metadados dão o tamanho descomprimido no parquet, que subestima colunas com dicionário
+    (o caso das colunas de código do DATASUS); por isso o tamanho é estimado pelo tipo e pelas
+    estatísticas, e o do parquet vale como piso.
+    """
+    metadata = parquet_file.metadata
+    schema = parquet_file.schema_arrow
+    wanted = set(columns)
+    total = 0.0
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        for j in range(row_group.num_columns):
+            column_chunk = row_group.column(j)
+            name = column_chunk.path_in_schema
+            if name not in wanted or schema.get_field_index(name) < 0:
+                continue
+            value_bytes = _value_bytes(schema.field(name).type, column_chunk.statistics)
+            decoded = row_group.num_rows * (value_bytes if value_bytes is not None else OFFSET_BYTES)
+            total += max(decoded, column_chunk.total_uncompressed_size)
+    return int(total)
+
+
+def estimate_row_bytes(parquet_file: pq.ParquetFile, columns: Sequence[str]) -> float:
+    num_rows = parquet_file.metadata.num_rows
+    return estimate_decoded_bytes(parquet_file, columns) / num_rows if num_rows else 0.0
+
+
+def _format_mb(num_bytes: float) -> str:
+    return f"{num_bytes / MB:.1f} MB"
+
+
+class MemoryBudget:
+    """
+    Orçamento de memória de uma requisição.
+
+    `workers` divide a parte dos lotes entre processos que leem arquivos ao mesmo tempo
+    (aggregation.count_files).
+    """
+    def __init__(self, limit_bytes: int = REQUEST_MEMORY_BUDGET_BYTES, workers: int = 1):
+        self.limit_bytes = int(limit_bytes)
+        self.workers = max(1, int(workers))
+
+    @property
+    def batch_bytes(self) -> int:
+        return int(self.limit_bytes * BATCH_SHARE / self.workers)
+
+    @property
+    def state_bytes(self) -> int:
+        return int(self.limit_bytes * STATE_SHARE)
+
+    def batch_rows(self, parquet_file: pq.ParquetFile, columns: Sequence[str], name: str = "") -> Optional[int]:
+        """
+        Linhas por lote para ler `columns` do arquivo dentro do orçamento.
+
+        None quando o maior row group já cabe inteiro (leitura normal, sem fatiar).
+        Levanta MemoryBudgetError quando nem MIN_BATCH_ROWS linhas cabem.
+        """
+        row_bytes = estimate_row_bytes(parquet_file, columns) * WORKING_SET_FACTOR
+        if row_bytes <= 0:
+            return None
+        rows = int(self.batch_bytes // row_bytes)
+        if rows < MIN_BATCH_ROWS:
+            raise MemoryBudgetError(
+                f"O arquivo {name or 'pedido'} precisa de ~{_format_mb(row_bytes * MIN_BATCH_ROWS)} por lote de "
+                f"{MIN_BATCH_ROWS} linhas, acima do orçamento de {_format_mb(self.batch_bytes)} por lote "
+                f"(REQUEST_MEMORY_BUDGET_MB = {self.limit_bytes // MB}). Peça menos colunas ou aumente o orçamento."
+            )
+        metadata = parquet_file.metadata
+        largest_row_group = max((metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)), default=0)
+        return None if rows >= largest_row_group else rows
+
+    def estimate(self, file_paths: Iterable[Path], columns: Sequence[str]) -> int:
+        """
+        Confere todos os arquivos antes de ler qualquer dado (levanta MemoryBudgetError se algum
+        não couber) e devolve a memória que a requisição deve reservar.
+        """
+        decoded = 0
+        for file_path in file_paths:
+            parquet_file = pq.ParquetFile(file_path)
+            self.batch_rows(parquet_file, columns, Path(file_path).name)
+            decoded += estimate_decoded_bytes(parquet_file, columns) * WORKING_SET_FACTOR
+        return min(self.limit_bytes, decoded)
+
+    @contextmanager
+    def reserve(self, estimated_bytes: Optional[int] = None) -> Iterator[None]:
+        """Reserva a memória da requisição (no máximo o orçamento) durante o bloco."""
+        amount = self.limit_bytes if estimated_bytes is None else min(self.limit_bytes, int(estimated_bytes))
+        with get_governor().reserve(amount):
+            yield
+
+
+class MemoryGovernor:
+    """Memória total das requisições simultâneas do processo: quem não cabe espera ou é recusado."""
+    def __init__(self, total_bytes: int = MEMORY_TOTAL_BUDGET_BYTES, wait_seconds: float = MEMORY_WAIT_SECONDS):
+        self.total_bytes = int(total_bytes)
+        self.wait_seconds = wait_seconds
+        self._in_use = 0
+        self._condition = threading.Condition()
+
+    @property
+    def in_use(self) -> int:
+        with self._condition:
+            return self._in_use
+
+    @contextmanager
+    def reserve(self, amount: int) -> Iterator[None]:
+        if amount > self.total_bytes:
+            raise MemoryBudgetError(
+                f"A requisição precisa de ~{_format_mb(amount)}, acima da memória total de "
+                f"{_format_mb(self.total_bytes)} (MEMORY_TOTAL_BUDGET_MB)."
+            )
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._in_use + amount <= self.total_bytes, timeout=self.wait_seconds):
+                raise MemoryBusyError(
+                    f"Servidor ocupado: {_format_mb(self._in_use)} de {_format_mb(self.total_bytes)} em uso por outras "
+                    f"requisições. Tente novamente em instantes."
+                )
+            self._in_use += amount
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._in_use -= amount
+                self._condition.notify_all()
+
+
+_governor: Optional[MemoryGovernor] = None
+_governor_lock = threading.Lock()
+
+
+def get_governor() -> MemoryGovernor:
+    """Instância única do controle de memória, compartilhada pelas requisições."""
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = MemoryGovernor()
+        return _governor
@@ -0,0 +1,138 @@
+# src/infrastructure/shared/parquet_reader.py
+"""
+Helpers to read the parquet files downloaded from DATASUS (PySUS).
+
+PySUS converts each .dbc file into a folder of parquet parts (e.g. DOPE2022.parquet/),
+so every helper here accepts either a single parquet file or one of those folders.
+"""
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+def list_parquet_files(paths: Iterable[Path]) -> List[Path]:
+    """Expands folders into their parquet parts, keeping plain parquet files as they are."""
+    parquet_files: List[Path] = []
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            parquet_files.extend(sorted(path.glob('*.parquet')))
+        elif path.is_file() and path.suffix == '.parquet':
+            parquet_files.append(path)
+    return [file_path for file_path in parquet_files if file_path.is_file()]
+
+
+def read_dataframe(paths: Iterable[Path], columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Reads every parquet part into a single DataFrame.
+
+    Only the columns present in each file are requested, so a missing column
+    does not break the whole read.
+    """
+    dataframes = []
+    for file_path in list_parquet_files(paths):
+        parquet_file = pq.ParquetFile(file_path)
+        available_columns = parquet_file.schema_arrow.names
+        selected_columns = [col for col in columns if col in available_columns] if columns else None
+        dataframes.append(parquet_file.read(columns=selected_columns).to_pandas())
+
+    if not dataframes:
+        return pd.DataFrame(columns=columns or [])
+    return pd.concat(dataframes, ignore_index=True)
+
+
+def resolve_column(schema_names: Sequence[str], candidates: Sequence[str]) -> Optional[str]:
+    """Returns the first candidate column that exists in the schema (e.g. ID_MN_RESI > ID_MUNICIP > ID_MN_NOT)."""
+    return next((col for col in candidates if col in schema_names), None)
+
+
+def column_statistics(parquet_file: pq.ParquetFile, row_group_index: int, column: str) -> Optional[Tuple[Any, Any]]:
+    """(min, max) of a column in one row group, or None when the file has no statistics for it."""
+    row_group = parquet_file.metadata.row_group(row_group_index)
+    for i in range(row_group.num_columns):
+        column_chunk = row_group.column(i)
+        if column_chunk.path_in_schema != column:
+            continue
+        statistics = column_chunk.statistics
+        if statistics is None or not statistics.has_min_max:
+            return None
+        return statistics.min, statistics.max
+    return None
+
+
+def iter_row_groups(
+    parquet_file: pq.ParquetFile,
+    columns: Sequence[str],
+    row_group_predicate: Optional[Callable[[int], bool]] = None,
+    batch_rows: Optional[int] = None
+) -> Iterator[pa.Table]:
+    """
+    Streams the row groups of a file decoding only the requested columns.
+
+    Columns missing from the file are dropped from the projection instead of failing.
+    Row groups for which `row_group_predicate(index)` is False are skipped before decoding.
+    Row groups larger than `batch_rows` (see memory_budget.MemoryBudget.batch_rows) are
+    streamed in slices of at most that many rows instead of being decoded whole.
+    """
+    schema_names = parquet_file.schema_arrow.names
+    projected_columns = [col for col in columns if col in schema_names]
+    if not projected_columns:
+        return
+
+    for i in range(parquet_file.num_row_groups):
+        if row_group_predicate is not None and not row_group_predicate(i):
+            continue
+        if batch_rows and parquet_file.metadata.row_group(i).num_rows > batch_rows:
+            for batch in parquet_file.iter_batches(batch_size=batch_rows, row_groups=[i], columns=projected_columns):
+                if batch.num_rows:
+                    yield pa.Table.from_batches([batch])
+            continue
+        chunk_table = parquet_file.read_row_group(i, columns=projected_columns)
+        if chunk_table.num_rows:
+            yield chunk_table
+
+
+def unified_schema(parquet_files: Sequence[Path]) -> pa.Schema:
+    """
+    Common schema for a set of parquet parts, read from the footers only.
+
+    Columns missing from some parts are kept (they come back as nulls). When two parts
+    disagree on a column type, every column falls back to text.
+    """
+    schemas = [pq.ParquetFile(file_path).schema_arrow.remove_metadata() for file_path in parquet_files]
+    if not schemas:
+        return pa.schema([])
+    try:
+        return pa.unify_schemas(schemas)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        names = list(dict.fromkeys(name for schema in schemas for name in schema.names))
+        return pa.schema([pa.field(name, pa.string()) for name in names])
+
+
+def conform_batch(batch: pa.RecordBatch, schema: pa.Schema) -> pa.RecordBatch:
+    """Reorders, casts and null-fills a batch so every part can be written with the same schema."""
+    columns = []
+    for field in schema:
+        index = batch.schema.get_field_index(field.name)
+        if index < 0:
+            columns.append(pa.nulls(batch.num_rows, field.type))
+        else:
+            column = batch.column(index)
+            columns.append(column if column.type == field.type else column.cast(field.type))
+    return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+
+def iter_batches(parquet_files: Sequence[Path], schema: pa.Schema, batch_size: int) -> Iterator[pa.RecordBatch]:
+    """
+    Streams every part as record batches of at most `batch_size` rows, all with `schema`.
+
+    Only one row group is decoded at a time, so memory does not grow with the number of rows.
+    """
+    for file_path in parquet_files:
+        parquet_file = pq.ParquetFile(file_path)
+        columns = [name for name in schema.names if name in parquet_file.schema_arrow.names]
+        for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+            if batch.num_rows:
+                yield conform_batch(batch, schema)
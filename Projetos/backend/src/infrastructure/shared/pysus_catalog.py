@@ -0,0 +1,204 @@
+# src/infrastructure/shared/pysus_catalog.py
+"""
+Catálogo dos bancos do PySUS compartilhado pelo processo inteiro.
+
+O `<Sistema>().load()` do PySUS lista os diretórios do FTP do DATASUS antes de qualquer
+consulta. Aqui cada banco é carregado uma única vez, guardado em memória e em disco
+(para sobreviver a reinicializações) e atualizado em segundo plano quando passa do TTL:
+as requisições continuam usando a listagem anterior enquanto a nova é carregada.
+O `get_files(...)` dos casos de uso passa a ser respondido da memória.
+
+Configuração (variáveis de ambiente):
+    DATASUS_CATALOG_DIR          pasta das listagens salvas (padrão: <DATASUS_STORE_DIR>/catalog).
+    DATASUS_CATALOG_TTL_SECONDS  idade máxima de uma listagem antes de atualizá-la (padrão: 6 horas).
+"""
+import os
+import pickle
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from pysus.ftp.databases import CNES, SIA, SIH, SIM, SINAN, SINASC
+
+from src.infrastructure.shared import datasus_store
+
+CATALOG_DIR = os.environ.get("DATASUS_CATALOG_DIR", str(Path(datasus_store.STORE_DIR) / "catalog"))
+CATALOG_TTL_SECONDS = float(os.environ.get("DATASUS_CATALOG_TTL_SECONDS", 6 * 60 * 60))
+
+DATABASES = {
+    "SIM": SIM,
+    "SINAN": SINAN,
+    "SINASC": SINASC,
+    "CNES": CNES,
+    "SIH": SIH,
+    "SIA": SIA,
+}
+
+# Nome do parâmetro de grupo no get_files de cada sistema (o SINAN usa o código do agravo).
+GROUP_PARAMS = {"SINAN": "dis_code"}
+# Sistemas cujos arquivos são nacionais, sem separação por UF.
+NATIONAL_SYSTEMS = {"SINAN"}
+
+
+class PysusCatalog:
+    """
+    Bancos do PySUS já carregados, com persistência em disco e atualização por TTL.
+    """
+    def __init__(self, catalog_dir: str = CATALOG_DIR, ttl_seconds: float = CATALOG_TTL_SECONDS):
+        self._dir = Path(catalog_dir)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._system_locks: Dict[str, threading.Lock] = {system: threading.Lock() for system in DATABASES}
+        # sistema -> (banco carregado, momento da listagem)
+        self._databases: Dict[str, Tuple[Any, float]] = {}
+        self._refreshing: set = set()
+
+    def _snapshot_path(self, system: str) -> Path:
+        return self._dir / f"{system}.pickle"
+
+    def _load_from_ftp(self, system: str) -> Tuple[Any, float]:
+        print(f" -> [Catálogo] Listando o FTP do {system}...")
+        database = DATABASES[system]().load()
+        loaded_at = time.time()
+        self._save_snapshot(system, database, loaded_at)
+        return database, loaded_at
+
+    def _save_snapshot(self, system: str, database: Any, loaded_at: float) -> None:
+        # Escrita atômica, como no manifesto do datasus_store, com nome temporário único.
+        path = self._snapshot_path(system)
+        temp_path: Optional[Path] = None
+        try:
+            fd, temp_name = tempfile.mkstemp(prefix=f"{path.name}.", suffix=".tmp", dir=path.parent)
+            temp_path = Path(temp_name)
+            with os.fdopen(fd, "wb") as handle:
+                pickle.dump({"loaded_at": loaded_at, "database": database}, handle)
+            os.replace(temp_path, path)
+        except Exception as e:
+            # O catálogo continua funcionando só em memória.
+            print(f" -> [Catálogo] Não foi possível salvar a listagem do {system}: {e}")
+            if temp_path is not None:
+                temp_path.unlink(missing_ok=True)
+
+    def _load_snapshot(self, system: str) -> Optional[Tuple[Any, float]]:
+        path = self._snapshot_path(system)
+        if not path.is_file():
+            return None
+        try:
+            with open(path, "rb") as handle:
+                snapshot = pickle.load(handle)
+            return snapshot["database"], float(snapshot["loaded_at"])
+        except Exception as e:
+            print(f" -> [Catálogo] Listagem salva do {system} ilegível, listando de novo: {e}")
+            return None
+
+    def get_database(self, system: str) -> Any:
+        """
+        Devolve o banco carregado de `system` (SIM, SINAN, SINASC, CNES, SIH, SIA).
+
+        Só a primeira chamada do processo espera pela listagem (do disco ou do FTP);
+        listagens vencidas são atualizadas em segundo plano.
+        """
+        system = system.upper()
+        if system not in DATABASES:
+            raise ValueError(f"Sistema '{system}' desconhecido. Disponíveis: {sorted(DATABASES)}")
+
+        cached = self._databases.get(system)
+        if cached is None:
+            with self._system_locks[system]:
+                cached = self._databases.get(system)
+                if cached is None:
+                    cached = self._load_snapshot(system) or self._load_from_ftp(system)
+                    self._databases[system] = cached
+
+        database, loaded_at = cached
+        if time.time() - loaded_at > self._ttl_seconds:
+            self.refresh_in_background(system)
+        return database
+
+    def refresh(self, system: str) -> Any:
+        """Lista o FTP de novo e troca a listagem em memória (as consultas em andamento não são afetadas)."""
+        system = system.upper()
+        try:
+            database, loaded_at = self._load_from_ftp(system)
+            self._databases[system] = (database, loaded_at)
+            return database
+        finally:
+            with self._lock:
+                self._refreshing.discard(system)
+
+    def refresh_in_background(self, system: str) -> bool:
+        """Agenda uma atualização, a não ser que já haja uma em andamento para o sistema."""
+        with self._lock:
+            if system in self._refreshing:
+                return False
+            self._refreshing.add(system)
+
+        def run():
+            try:
+                self.refresh(system)
+            except Exception as e:
+                print(f" -> [Catálogo] Falha ao atualizar o {system}, mantendo a listagem anterior: {e}")
+
+        threading.Thread(target=run, name=f"catalog-refresh-{system}", daemon=True).start()
+        return True
+
+    def loaded_at(self, system: str) -> Optional[float]:
+        cached = self._databases.get(system.upper())
+        return cached[1] if cached else None
+
+    def warm_up(self, systems: Optional[List[str]] = None) -> None:
+        """Carrega os bancos antes da primeira requisição; uma falha não impede os outros."""
+        for system in systems or list(DATABASES):
+            try:
+                self.get_database(system)
+            except Exception as e:
+                print(f" -> [Catálogo] Não foi possível pré-carregar o {system}: {e}")
+
+
+_catalog: Optional[PysusCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> PysusCatalog:
+    """Instância única do catálogo, compartilhada por todos os casos de uso."""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = PysusCatalog()
+        return _catalog
+
+
+def get_database(system: str) -> Any:
+    """Atalho usado pelos casos de uso no lugar de `<Sistema>().load()`."""
+    return get_catalog().get_database(system)
+
+
+def list_files(
+    database: Any,
+    system: str,
+    group: str,
+    years: Optional[List[int]] = None,
+    states: Optional[List[str]] = None,
+    months: Optional[List[int]] = None
+) -> List[Any]:
+    """`get_files` com o parâmetro de grupo certo para cada sistema."""
+    system = system.upper()
+    params: Dict[str, Any] = {GROUP_PARAMS.get(system, "group"): group}
+    if years:
+        params["year"] = years
+    if states and system not in NATIONAL_SYSTEMS:
+        params["uf"] = states
+    if months:
+        params["month"] = months
+    files = database.get_files(**params) or []
+    return files if isinstance(files, list) else [files]
+
+
+def warm_up_in_background(systems: Optional[List[str]] = None) -> threading.Thread:
+    """Pré-carrega os catálogos numa thread, sem atrasar a subida da API."""
+    thread = threading.Thread(target=get_catalog().warm_up, args=(systems,), name="catalog-warm-up", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,199 @@
+# src/infrastructure/shared/sql_engine.py
+"""
+Motor SQL embutido (DuckDB, no próprio processo) sobre os parquets já baixados no
+datasus_store, para recortes pontuais que os endpoints não cobrem.
+
+Cada sistema/grupo do armazenamento vira uma view somente leitura, ex.:
+
+    sim_cid10, sinan_deng, sinasc_dn, cnes_st, sih_rd, sia_pa
+
+A view lê todos os arquivos baixados do grupo (UFs e anos) com read_parquet(union_by_name):
+o DuckDB varre os arquivos em várias threads, lê só as colunas usadas e descarta
+row groups pelas estatísticas do parquet (predicate pushdown).
+
+Proteções:
+    - só uma instrução, e do tipo SELECT (o parser do DuckDB decide, não uma regex);
+    - acesso a arquivos restrito às pastas dos parquets das views e configuração travada,
+      então read_csv('/etc/passwd'), read_text do manifesto ou dos cubos, COPY, ATTACH,
+      INSTALL e SET são recusados;
+    - limite de linhas e de tempo por consulta (a consulta é interrompida no limite).
+
+Configuração (variáveis de ambiente):
+    SQL_MAX_ROWS         limite de linhas devolvidas (padrão: 10000).
+    SQL_TIMEOUT_SECONDS  tempo máximo de uma consulta (padrão: 30).
+    SQL_THREADS          threads do DuckDB (padrão: número de núcleos).
+    SQL_MEMORY_LIMIT     memória máxima do DuckDB (padrão: 2GB).
+"""
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+import duckdb
+import pyarrow as pa
+
+from src.infrastructure.shared import datasus_store, parquet_reader
+
+SQL_MAX_ROWS = int(os.environ.get("SQL_MAX_ROWS", 10_000))
+SQL_TIMEOUT_SECONDS = float(os.environ.get("SQL_TIMEOUT_SECONDS", 30))
+SQL_THREADS = int(os.environ.get("SQL_THREADS", os.cpu_count() or 1))
+SQL_MEMORY_LIMIT = os.environ.get("SQL_MEMORY_LIMIT", "2GB")
+
+
+class SqlQueryError(ValueError):
+    """Consulta inválida ou não permitida (erro do usuário, não do servidor)."""
+
+
+class SqlTimeoutError(SqlQueryError):
+    """A consulta passou de SQL_TIMEOUT_SECONDS e foi interrompida."""
+
+
+def view_name(system: str, group: str) -> str:
+    return re.sub(r"[^a-z0-9_]", "_", f"{system}_{group}".lower())
+
+
+def _quote_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+class SqlEngine:
+    """
+    Banco DuckDB em memória com uma view por sistema/grupo do datasus_store.
+
+    As views são recriadas quando o conteúdo do armazenamento muda; cada consulta usa
+    seu próprio cursor, então consultas simultâneas não se bloqueiam.
+    """
+    def __init__(
+        self,
+        store: Optional[datasus_store.DatasusStore] = None,
+        threads: int = SQL_THREADS,
+        memory_limit: str = SQL_MEMORY_LIMIT
+    ):
+        self._store = store
+        self._threads = threads
+        self._memory_limit = memory_limit
+        self._lock = threading.Lock()
+        self._connection: Optional[duckdb.DuckDBPyConnection] = None
+        self._signature: Optional[FrozenSet[Tuple[str, str]]] = None
+        self._tables: Dict[str, Dict[str, Any]] = {}
+
+    def _files_by_view(self) -> Tuple[FrozenSet[Tuple[str, str]], Dict[str, Dict[str, Any]]]:
+        store = self._store or datasus_store.get_store()
+        entries = store.entries()
+        paths: Dict[Tuple[str, str], List[Any]] = defaultdict(list)
+        for key, entry in entries.items():
+            parts = store.parse_key(key)
+            paths[(parts["system"], parts["group"])].append(store.local_path(entry))
+
+        views: Dict[str, Dict[str, Any]] = {}
+        for (system, group), group_paths in sorted(paths.items()):
+            files = parquet_reader.list_parquet_files(group_paths)
+            if files:
+                views[view_name(system, group)] = {"system": system, "group": group, "files": [str(f) for f in files]}
+        # Chave + checksum: um arquivo baixado de novo pela sincronização também recria as views.
+        return frozenset((key, entry.get("checksum", "")) for key, entry in entries.items()), views
+
+    def _connect(self, views: Dict[str, Dict[str, Any]]) -> duckdb.DuckDBPyConnection:
+        connection = duckdb.connect(":memory:", config={"threads": self._threads, "memory_limit": self._memory_limit})
+        for name, view in views.items():
+            file_list = ", ".join(_quote_literal(path) for path in view["files"])
+            connection.execute(f"CREATE VIEW {name} AS SELECT * FROM read_parquet([{file_list}], union_by_name = true)")
+        # A partir daqui só as pastas dos parquets das views podem ser lidas (não a raiz do
+        # armazenamento, com o manifesto, a versão dos dados e os cubos), e nada mais pode ser reconfigurado.
+        data_dirs = sorted({os.path.dirname(path) for view in views.values() for path in view["files"]})
+        connection.execute(f"SET allowed_directories = [{', '.join(_quote_literal(path) for path in data_dirs)}]")
+        connection.execute("SET enable_external_access = false")
+        connection.execute("SET lock_configuration = true")
+        return connection
+
+    def _current_connection(self) -> Tuple[duckdb.DuckDBPyConnection, Dict[str, Dict[str, Any]]]:
+        """Conexão em uso e as views dela, lidas juntas para não misturar duas montagens."""
+        signature, views = self._files_by_view()
+        with self._lock:
+            if self._connection is None or signature != self._signature:
+                print(f" -> [SQL] Montando {len(views)} view(s) sobre o datasus_store...")
+                # A conexão antiga não é fechada: cursores de consultas em andamento ainda a usam,
+                # e o DuckDB a libera quando o último deles for fechado.
+                self._connection = self._connect(views)
+                self._signature = signature
+                self._tables = views
+            return self._connection, self._tables
+
+    def list_tables(self) -> List[Dict[str, Any]]:
+        """Views disponíveis, com sistema, grupo, quantidade de arquivos e colunas."""
+        connection, views = self._current_connection()
+        cursor = connection.cursor()
+        try:
+            tables = []
+            for name, view in views.items():
+                columns = cursor.execute(f"DESCRIBE {name}").fetchall()
+                tables.append({
+                    "table": name,
+                    "system": view["system"],
+                    "group": view["group"],
+                    "files": len(view["files"]),
+                    "columns": [{"name": column[0], "type": column[1]} for column in columns],
+                })
+            return tables
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _single_select(cursor: duckdb.DuckDBPyConnection, sql: str) -> str:
+        try:
+            statements = cursor.extract_statements(sql)
+        except duckdb.Error as e:
+            raise SqlQueryError(f"Erro de sintaxe: {e}")
+        if len(statements) != 1:
+            raise SqlQueryError("Envie exatamente uma consulta.")
+        if statements[0].type != duckdb.StatementType.SELECT:
+            raise SqlQueryError("Apenas consultas SELECT são permitidas.")
+        return statements[0].query.strip().rstrip(";")
+
+    def query(
+        self,
+        sql: str,
+        max_rows: int = SQL_MAX_ROWS,
+        timeout_seconds: float = SQL_TIMEOUT_SECONDS
+    ) -> Tuple[pa.Table, bool, float]:
+        """
+        Executa uma consulta somente leitura e devolve (resultado, truncado?, segundos).
+
+        Levanta SqlQueryError para consultas inválidas ou proibidas e SqlTimeoutError no limite de tempo.
+        """
+        max_rows = max(1, min(int(max_rows), SQL_MAX_ROWS))
+        connection, _ = self._current_connection()
+        cursor = connection.cursor()
+        timer = threading.Timer(timeout_seconds, cursor.interrupt)
+        start = time.perf_counter()
+        try:
+            select = self._single_select(cursor, sql)
+            timer.start()
+            # Uma linha além do limite indica que o resultado foi cortado.
+            result = cursor.execute(f"SELECT * FROM ({select}) AS query LIMIT {max_rows + 1}").fetch_arrow_table()
+        except duckdb.InterruptException:
+            raise SqlTimeoutError(f"A consulta passou de {timeout_seconds:g} s e foi interrompida.")
+        except (duckdb.ParserException, duckdb.BinderException, duckdb.CatalogException,
+                duckdb.PermissionException, duckdb.InvalidInputException, duckdb.ConversionException) as e:
+            raise SqlQueryError(str(e))
+        finally:
+            timer.cancel()
+            cursor.close()
+
+        truncated = result.num_rows > max_rows
+        return result.slice(0, max_rows), truncated, time.perf_counter() - start
+
+
+_engine: Optional[SqlEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> SqlEngine:
+    """Instância única do motor SQL, compartilhada pelas requisições."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = SqlEngine()
+        return _engine
@@ -0,0 +1,167 @@
+# src/infrastructure/shared/streaming_response.py
+"""
+Respostas em streaming para os microdados (SIH, SIA): os registros são enviados
+lote a lote, enquanto os row groups são lidos, sem montar a resposta inteira na memória.
+
+Formatos (parâmetro 'format' ou cabeçalho Accept):
+    json     lista JSON de registros, o formato original da API (padrão).
+    ndjson   um registro JSON por linha.
+    arrow    Arrow IPC stream.
+    parquet  arquivo parquet.
+"""
+import json
+from typing import Any, Iterator, List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi.responses import StreamingResponse
+
+STREAM_BATCH_ROWS = 10_000
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+DEFAULT_FORMAT = "json"
+
+# Apelidos aceitos no Accept, além dos MEDIA_TYPES.
+ACCEPT_ALIASES = {
+    "application/jsonl": "ndjson",
+    "application/x-jsonlines": "ndjson",
+    "application/vnd.apache.arrow.file": "arrow",
+    "application/x-parquet": "parquet",
+    "application/octet-stream": "parquet",
+}
+
+
+class UnsupportedFormatError(ValueError):
+    """O formato pedido não é um dos MEDIA_TYPES."""
+
+
+def negotiate_format(format_param: Optional[str] = None, accept: Optional[str] = None) -> str:
+    """
+    Escolhe o formato da resposta: o parâmetro explícito vence, depois o Accept (na ordem
+    de preferência 'q'), e por fim o JSON de sempre.
+    """
+    if format_param:
+        fmt = format_param.strip().lower()
+        if fmt not in MEDIA_TYPES:
+            raise UnsupportedFormatError(f"Formato '{format_param}' inválido. Use um de: {sorted(MEDIA_TYPES)}")
+        return fmt
+
+    if not accept:
+        return DEFAULT_FORMAT
+
+    media_type_to_format = {media_type: fmt for fmt, media_type in MEDIA_TYPES.items()}
+    media_type_to_format.update(ACCEPT_ALIASES)
+
+    candidates = []
+    for position, item in enumerate(accept.split(",")):
+        media_type, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if media_type.lower() in media_type_to_format and quality > 0:
+            candidates.append((-quality, position, media_type_to_format[media_type.lower()]))
+
+    return min(candidates)[2] if candidates else DEFAULT_FORMAT
+
+
+class _ChunkSink:
+    """Destino de escrita do pyarrow que acumula os bytes até o próximo envio."""
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self.closed = False
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        return len(chunk)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _json_default(value: Any) -> str:
+    # Datas, decimais e bytes do parquet viram texto, como no JSONResponse com pandas.
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return str(value)
+
+
+def _iter_json(batches: Iterator[pa.RecordBatch]) -> Iterator[bytes]:
+    yield b"["
+    first = True
+    for batch in batches:
+        rows = [json.dumps(row, default=_json_default, ensure_ascii=False) for row in batch.to_pylist()]
+        if not rows:
+            continue
+        yield ((b"" if first else b",") + ",".join(rows).encode("utf-8"))
+        first = False
+    yield b"]"
+
+
+def _iter_ndjson(batches: Iterator[pa.RecordBatch]) -> Iterator[bytes]:
+    for batch in batches:
+        lines = [json.dumps(row, default=_json_default, ensure_ascii=False) for row in batch.to_pylist()]
+        if lines:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _iter_arrow(batches: Iterator[pa.RecordBatch], schema: pa.Schema) -> Iterator[bytes]:
+    sink = _ChunkSink()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        yield sink.drain()
+        for batch in batches:
+            writer.write_batch(batch)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def _iter_parquet(batches: Iterator[pa.RecordBatch], schema: pa.Schema) -> Iterator[bytes]:
+    sink = _ChunkSink()
+    # Cada lote vira um row group, então o escritor nunca guarda mais que um lote.
+    with pq.ParquetWriter(sink, schema) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def stream_batches(
+    batches: Iterator[pa.RecordBatch],
+    schema: pa.Schema,
+    fmt: str,
+    filename: str = "dados"
+) -> StreamingResponse:
+    """Monta a StreamingResponse no formato negociado a partir de um iterador de lotes."""
+    if fmt == "ndjson":
+        body = _iter_ndjson(batches)
+    elif fmt == "arrow":
+        body = _iter_arrow(batches, schema)
+    elif fmt == "parquet":
+        body = _iter_parquet(batches, schema)
+    else:
+        body = _iter_json(batches)
+
+    headers = {}
+    if fmt in ("arrow", "parquet"):
+        extension = "arrows" if fmt == "arrow" else "parquet"
+        headers["Content-Disposition"] = f'attachment; filename="{filename}.{extension}"'
+
+    # Geradores síncronos são consumidos pelo Starlette numa thread, sem travar o event loop.
+    return StreamingResponse((chunk for chunk in body if chunk), media_type=MEDIA_TYPES[fmt], headers=headers)
@@ -0,0 +1,304 @@
+# src/infrastructure/shared/summary_engine.py
+"""
+Motor de resumo genérico dos microdados do DATASUS: agrupa por dimensões, aplica
+filtros e calcula contagem, soma e média lendo os arquivos row group a row group.
+
+Cada dimensão é descrita por um dicionário:
+
+    {"kind": "municipality", "columns": ["CODMUNOCOR"]}
+
+onde 'columns' são as colunas candidatas (a primeira presente no arquivo é usada) e
+'kind' diz como os valores viram a chave do agrupamento:
+
+    municipality  código do município (int32, devolvido em texto como sempre foi na API).
+    text          valor em texto, sem espaços nas pontas.
+    competence    competência AAAAMM numa única coluna (ex.: COMPETEN, PA_CMP); serve também para
+                  a semana epidemiológica AAAASS do SINAN (SEM_NOT).
+    year_month    competência AAAAMM a partir de duas colunas, ano e mês (todas obrigatórias).
+    date_year, date_month
+                  ano (AAAA) ou mês (AAAAMM) de uma data (data_utils.date_parts); 'format' diz a
+                  ordem da data em texto: "DMY" (padrão, ex.: DTOBITO) ou "YMD" (ex.: DT_NOTIFIC).
+    age_group     faixa etária a partir de uma idade em anos (data_utils.get_age_groups).
+    sim_age_band  faixa etária do Tabnet a partir da IDADE codificada do SIM (data_utils.age_bands).
+    sinan_age_band
+                  a mesma faixa a partir da NU_IDADE_N codificada do SINAN.
+    icd10_chapter, icd10_group, icd10_category
+                  capítulo, grupo ou categoria da CID-10 de um código (icd10), por tabela pré-calculada.
+
+As dimensões de tempo entram no agrupamento como qualquer outra, então uma série de vários
+anos (ou meses) sai da mesma leitura de cada arquivo. Uma data ou competência em branco ou
+inválida vira a chave data_utils.DATE_IGNORED (0), em vez de sumir do agrupamento.
+
+Só as colunas das dimensões pedidas (agrupamento e filtros) e da medida são lidas,
+e os row groups de outras UFs são descartados pelas estatísticas do parquet. Com um
+memory_budget.MemoryBudget, o tamanho dos lotes e o estado do agrupamento ficam dentro do
+orçamento da requisição, e todos os arquivos são conferidos antes de qualquer leitura.
+"""
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from src.infrastructure.shared import aggregation, data_utils, icd10, memory_budget, parquet_reader
+
+KINDS = (
+    "municipality", "text", "competence", "year_month", "date_year", "date_month", "age_group",
+    "sim_age_band", "sinan_age_band", "icd10_chapter", "icd10_group", "icd10_category",
+)
+DEFAULT_DATE_FORMAT = "DMY"
+# Tipos em que todas as colunas da lista são necessárias (nos outros, são candidatas).
+MULTI_COLUMN_KINDS = {"year_month"}
+MUNICIPALITY_DIMENSION = "municipality"
+
+
+def dimension(kind: str, *columns: str, **options: Any) -> Dict[str, Any]:
+    """Declara uma dimensão: dimension("date_month", "DT_NOTIFIC", format="YMD")."""
+    return {"kind": kind, "columns": list(columns), **options}
+
+
+class InvalidMeasureError(ValueError):
+    """A medida pedida não é uma coluna dos arquivos (vira 400 nos controllers, como os outros ValueError)."""
+
+
+def resolve_dimension(schema_names: Sequence[str], spec: Dict[str, Any]) -> Optional[List[str]]:
+    """Colunas do arquivo usadas pela dimensão, ou None se o arquivo não as tiver."""
+    if spec["kind"] in MULTI_COLUMN_KINDS:
+        return list(spec["columns"]) if all(col in schema_names for col in spec["columns"]) else None
+    column = parquet_reader.resolve_column(schema_names, spec["columns"])
+    return [column] if column else None
+
+
+def dimension_values(chunk_table: pa.Table, spec: Dict[str, Any], columns: List[str]) -> pa.ChunkedArray:
+    """Converte as colunas de origem de uma dimensão na chave do agrupamento, sem sair do Arrow."""
+    kind = spec["kind"]
+    if kind == "municipality":
+        return data_utils.municipality_codes_as_int(chunk_table.column(columns[0]))
+    if kind == "competence":
+        competence = pc.cast(data_utils.numeric_values(chunk_table.column(columns[0])), pa.int32())
+        return pc.fill_null(competence, data_utils.DATE_IGNORED)
+    if kind == "year_month":
+        return data_utils.competence_months(chunk_table.column(columns[0]), chunk_table.column(columns[1]))
+    if kind == "date_year":
+        return data_utils.date_years(chunk_table.column(columns[0]), spec.get("format", DEFAULT_DATE_FORMAT))
+    if kind == "date_month":
+        return data_utils.date_months(chunk_table.column(columns[0]), spec.get("format", DEFAULT_DATE_FORMAT))
+    if kind == "age_group":
+        return data_utils.get_age_groups(chunk_table.column(columns[0]))
+    if kind == "sim_age_band":
+        return data_utils.age_bands(data_utils.sim_ages_in_years(chunk_table.column(columns[0])))
+    if kind == "sinan_age_band":
+        return data_utils.age_bands(data_utils.sinan_ages_in_years(chunk_table.column(columns[0])))
+    if kind == "icd10_chapter":
+        return icd10.chapters(chunk_table.column(columns[0]))
+    if kind == "icd10_group":
+        return icd10.groups(chunk_table.column(columns[0]))
+    if kind == "icd10_category":
+        return icd10.categories(chunk_table.column(columns[0]))
+    return pc.utf8_trim_whitespace(pc.cast(chunk_table.column(columns[0]), pa.string()))
+
+
+def output_key_types(dimensions: Dict[str, Dict[str, Any]], group_by: Sequence[str]) -> Dict[str, pa.DataType]:
+    """Municípios voltam a ser texto na resposta, como nos demais resumos da API."""
+    return {dim: pa.string() for dim in group_by if dimensions[dim]["kind"] == "municipality"}
+
+
+def parse_filters(filters: Optional[Iterable[str]], dimensions: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+    """
+    Lê filtros no formato 'dimensão=valor1,valor2' (ex.: 'sex=1', 'municipality=261160,260790').
+
+    Levanta ValueError para filtros mal formados ou dimensões desconhecidas.
+    """
+    parsed: Dict[str, List[str]] = {}
+    for item in filters or []:
+        name, separator, values = item.partition("=")
+        name = name.strip().lower()
+        if not separator or not values.strip():
+            raise ValueError(f"Filtro '{item}' inválido. Use 'dimensão=valor1,valor2'.")
+        if name not in dimensions:
+            raise ValueError(f"Filtro por dimensão inválida: '{name}'. Use: {list(dimensions)}")
+        parsed.setdefault(name, []).extend(value.strip() for value in values.split(",") if value.strip())
+    return parsed
+
+
+def filter_mask(table: pa.Table, filters: Dict[str, List[str]]) -> Optional[pa.ChunkedArray]:
+    """Máscara das linhas cujas dimensões estão entre os valores pedidos (comparados como texto)."""
+    mask = None
+    for name, values in filters.items():
+        column = table.column(name)
+        if not pa.types.is_string(column.type):
+            column = pc.cast(column, pa.string())
+        condition = pc.fill_null(pc.is_in(column, value_set=pa.array(values, pa.string())), False)
+        mask = condition if mask is None else pc.and_(mask, condition)
+    return mask
+
+
+class SummaryEngine:
+    """
+    Agrega arquivos parquet por um conjunto de dimensões, com filtros e uma medida opcional.
+
+    `states_dimension` é a dimensão usada para restringir os registros às UFs pedidas
+    (pelo código do município); None quando os arquivos já vêm separados por UF e o
+    município não deve ser usado como filtro (ex.: SIH, SIA).
+
+    `budget` limita a memória da agregação (lotes e estado do agrupamento); sem ele, os row
+    groups são lidos inteiros e o estado fica todo em memória, como antes.
+    """
+    def __init__(
+        self,
+        dimensions: Dict[str, Dict[str, Any]],
+        group_by: Sequence[str],
+        filters: Optional[Dict[str, List[str]]] = None,
+        measure: Optional[str] = None,
+        states: Optional[List[str]] = None,
+        states_dimension: Optional[str] = None,
+        budget: Optional[memory_budget.MemoryBudget] = None
+    ):
+        self.dimensions = dimensions
+        self.group_by = list(group_by)
+        self.filters = filters or {}
+        self.measure = measure
+        self.states = states
+        self.states_dimension = states_dimension if states else None
+        self.budget = budget
+        self.aggregator = aggregation.GroupAggregator(
+            self.group_by, value_column=measure,
+            memory_limit_bytes=budget.state_bytes if budget else None,
+            spill_dir=memory_budget.SPILL_DIR
+        )
+        self.column_names: Optional[List[str]] = None
+
+    def _needed_dimensions(self) -> List[str]:
+        needed = list(self.group_by)
+        for name in list(self.filters) + ([self.states_dimension] if self.states_dimension else []):
+            if name not in needed:
+                needed.append(name)
+        return needed
+
+    def _plan_file(self, file_path: Path) -> Optional[Tuple[pq.ParquetFile, Dict[str, List[str]], List[str]]]:
+        """
+        Arquivo aberto, colunas de cada dimensão e colunas lidas; None se faltar alguma dimensão.
+
+        Levanta InvalidMeasureError se a medida não for uma coluna do arquivo: somar uma coluna
+        inexistente daria soma 0 e média nula, sem nenhum aviso.
+        """
+        parquet_file = pq.ParquetFile(file_path)
+        schema_names = parquet_file.schema_arrow.names
+        if self.column_names is None:
+            self.column_names = list(schema_names)
+
+        resolved: Dict[str, List[str]] = {}
+        for name in self._needed_dimensions():
+            columns = resolve_dimension(schema_names, self.dimensions[name])
+            if columns is None:
+                print(f" -> Arquivo {file_path.name} sem as colunas da dimensão '{name}'. Ignorando.")
+                return None
+            resolved[name] = columns
+
+        if self.measure and self.measure not in schema_names:
+            raise InvalidMeasureError(
+                f"A medida '{self.measure}' não é uma coluna do arquivo {Path(file_path).name}."
+            )
+
+        columns = list(dict.fromkeys(col for cols in resolved.values() for col in cols))
+        if self.measure and self.measure not in columns:
+            columns.append(self.measure)
+        return parquet_file, resolved, columns
+
+    def add_file(self, file_path: Path) -> bool:
+        """Agrega um arquivo; devolve False se ele não tiver as colunas das dimensões pedidas."""
+        plan = self._plan_file(Path(file_path))
+        if plan is None:
+            return False
+        parquet_file, resolved, columns = plan
+
+        predicate = None
+        if self.states_dimension:
+            predicate = data_utils.states_row_group_predicate(parquet_file, self.states, resolved[self.states_dimension][0])
+        batch_rows = self.budget.batch_rows(parquet_file, columns, Path(file_path).name) if self.budget else None
+
+        print(f"  -> Processando arquivo: {Path(file_path).name}")
+        for chunk_table in parquet_reader.iter_row_groups(parquet_file, columns, predicate, batch_rows):
+            self.aggregator.update(self._prepare_chunk(chunk_table, resolved))
+        return True
+
+    def estimate_files(self, file_paths: Iterable[Path]) -> int:
+        """
+        Confere, só pelos metadados, se todos os arquivos cabem no orçamento e devolve a memória a reservar.
+
+        Levanta memory_budget.MemoryBudgetError antes de qualquer dado ser lido.
+        """
+        if self.budget is None:
+            return 0
+        estimated = 0
+        for file_path in file_paths:
+            plan = self._plan_file(Path(file_path))
+            if plan is not None:
+                estimated += self.budget.estimate([file_path], plan[2])
+        return min(self.budget.limit_bytes, estimated)
+
+    def add_files(self, file_paths: Iterable[Path]) -> None:
+        file_paths = list(file_paths)
+        if self.budget is None:
+            for file_path in file_paths:
+                self.add_file(file_path)
+            return
+        with self.budget.reserve(self.estimate_files(file_paths)):
+            for file_path in file_paths:
+                self.add_file(file_path)
+
+    def _prepare_chunk(self, chunk_table: pa.Table, resolved: Dict[str, List[str]]) -> pa.Table:
+        table = pa.table({
+            name: dimension_values(chunk_table, self.dimensions[name], columns)
+            for name, columns in resolved.items()
+        })
+        if self.measure:
+            table = table.append_column(self.measure, data_utils.numeric_values(chunk_table.column(self.measure)))
+
+        if self.states_dimension:
+            table = data_utils.filter_table_by_states(table, self.states, self.states_dimension)
+        mask = filter_mask(table, self.filters)
+        if mask is not None:
+            table = table.filter(mask)
+        return table.select(self.group_by + ([self.measure] if self.measure else []))
+
+    def add_counts(self, counts: Optional[pa.Table]) -> None:
+        """Soma contagens já prontas (ex.: de um cubo), com as colunas do group_by e 'count'."""
+        if counts is None or counts.num_rows == 0:
+            return
+        mask = filter_mask(counts, self.filters)
+        if mask is not None:
+            counts = counts.filter(mask)
+        self.aggregator.add_counts(aggregation.sum_counts(counts, self.group_by))
+
+    def to_records(
+        self,
+        measures: Sequence[str] = aggregation.MEASURES,
+        rename: Optional[Dict[str, str]] = None,
+        count_name: str = aggregation.COUNT_COLUMN
+    ) -> List[Dict[str, Any]]:
+        return self.aggregator.to_records(
+            measures, rename=rename, key_types=output_key_types(self.dimensions, self.group_by) or None, count_name=count_name
+        )
+
+    def total(self) -> int:
+        return self.aggregator.total()
+
+
+def validate_request(
+    dimensions: Dict[str, Dict[str, Any]],
+    group_by: Sequence[str],
+    aggregations: Sequence[str],
+    filters: Optional[Dict[str, List[str]]] = None
+) -> None:
+    """Levanta ValueError para dimensões ou medidas desconhecidas (ou sem tabela configurada)."""
+    invalid_dimensions = [dim for dim in group_by if dim not in dimensions]
+    if invalid_dimensions:
+        raise ValueError(f"Dimensões inválidas: {invalid_dimensions}. Use: {list(dimensions)}")
+    requested = list(group_by) + list(filters or {})
+    if any(dimensions[dim]["kind"] == "icd10_group" for dim in requested) and not icd10.has_groups():
+        raise ValueError("A dimensão de grupo da CID-10 exige a variável CID10_GROUPS_CSV (CID-10-GRUPOS.CSV do DATASUS).")
+    invalid_measures = [agg for agg in aggregations if agg not in aggregation.MEASURES]
+    if invalid_measures:
+        raise ValueError(f"Medidas inválidas: {invalid_measures}. Use: {list(aggregation.MEASURES)}")
@@ -0,0 +1,99 @@
+# src/infrastructure/shared/summary_response.py
+"""
+Formatos de resposta dos resumos por município (SIM, SINAN, SINASC, CNES).
+
+Layouts (parâmetro 'layout' ou cabeçalho Accept):
+    rows     lista de registros {"municipality_code": ..., "total_deaths": ...} (padrão, formato original).
+    columns  o mesmo resumo em listas paralelas: {"municipality_code": [...], "total_deaths": [...]}.
+             Os nomes das chaves aparecem uma vez só, em vez de uma vez por município.
+    arrow    Arrow IPC stream com o resumo; o restante da resposta (metadata, columns)
+             vai em JSON nos metadados do schema, na chave 'datasus.response'.
+"""
+import json
+from typing import Any, Dict, List, Optional
+
+import pyarrow as pa
+from fastapi import status
+from fastapi.responses import JSONResponse, Response
+
+from src.infrastructure.shared import streaming_response
+
+LAYOUTS = ("rows", "columns", "arrow")
+DEFAULT_LAYOUT = "rows"
+ARROW_MEDIA_TYPE = streaming_response.MEDIA_TYPES["arrow"]
+METADATA_KEY = b"datasus.response"
+
+
+class UnsupportedLayoutError(ValueError):
+    """O layout pedido não é um dos LAYOUTS."""
+
+
+def negotiate_layout(layout: Optional[str] = None, accept: Optional[str] = None) -> str:
+    """O parâmetro explícito vence; sem ele, um Accept de Arrow escolhe 'arrow'; senão, 'rows'."""
+    if layout:
+        chosen = layout.strip().lower()
+        if chosen not in LAYOUTS:
+            raise UnsupportedLayoutError(f"Layout '{layout}' inválido. Use um de: {list(LAYOUTS)}")
+        return chosen
+    if accept and streaming_response.negotiate_format(None, accept) == "arrow":
+        return "arrow"
+    return DEFAULT_LAYOUT
+
+
+def to_columns(records: List[Dict[str, Any]], fields: Optional[List[str]] = None) -> Dict[str, List[Any]]:
+    """Converte uma lista de registros em listas paralelas, uma por campo."""
+    fields = fields or (list(records[0]) if records else [])
+    return {field: [record.get(field) for record in records] for field in fields}
+
+
+def _arrow_bytes(
+    records: List[Dict[str, Any]],
+    extra: Dict[str, Any],
+    fields: Optional[List[str]],
+    table: Optional[pa.Table] = None
+) -> bytes:
+    if table is None and records:
+        table = pa.Table.from_pylist(records)
+    elif table is None:
+        table = pa.table({field: pa.array([], pa.string()) for field in fields or []})
+    table = table.replace_schema_metadata({METADATA_KEY: json.dumps(extra, ensure_ascii=False, default=str).encode("utf-8")})
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def build_response(
+    content: Dict[str, Any],
+    summary_key: str,
+    layout: str,
+    fields: Optional[List[str]] = None,
+    status_code: int = status.HTTP_200_OK,
+    filename: str = "resumo",
+    table: Optional[pa.Table] = None
+) -> Response:
+    """
+    Monta a resposta de um resumo: `content[summary_key]` é a lista de registros,
+    o resto de `content` segue como está (metadata, columns...).
+
+    `table`, quando informada, é o mesmo resumo já em Arrow: o layout 'arrow' a envia
+    como está, com os tipos originais, em vez de reconstruí-la a partir dos registros.
+    """
+    records = content.get(summary_key) or []
+    if layout == "columns":
+        body = dict(content)
+        body[summary_key] = to_columns(records, fields)
+        body["layout"] = "columns"
+        return JSONResponse(content=body, status_code=status_code)
+
+    if layout == "arrow":
+        extra = {key: value for key, value in content.items() if key != summary_key}
+        return Response(
+            content=_arrow_bytes(records, extra, fields, table),
+            media_type=ARROW_MEDIA_TYPE,
+            status_code=status_code,
+            headers={"Content-Disposition": f'attachment; filename="{filename}.arrows"'}
+        )
+
+    return JSONResponse(content=content, status_code=status_code)
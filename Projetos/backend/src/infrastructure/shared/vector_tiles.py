@@ -0,0 +1,173 @@
+# src/infrastructure/shared/vector_tiles.py
+"""
+Tiles vetoriais (Mapbox Vector Tile) das camadas do geometry_registry, para mapas web
+interativos sem um PNG renderizado por visualização.
+
+Um tile z/x/y (esquema XYZ do Web Mercator) é montado só com as partições das UFs cuja
+bbox cruza o tile, no nível de simplificação do zoom (geometry_registry.pick_tier), e
+guardado no disco na primeira vez que é pedido:
+
+    <raiz>/<layer>/<ano da malha>/<variante>/<z>/<x>/<y>.mvt
+
+A variante separa tiles só com geometria ('plain') dos tiles com métricas anexadas, e inclui
+a versão dos dados: uma sincronização com o FTP passa a gerar tiles novos. Os zooms baixos
+(os tiles que cobrem o Brasil inteiro) podem ser gerados antes com scripts/build_tiles.py.
+
+Configuração (variáveis de ambiente):
+    TILE_CACHE_DIR            pasta dos tiles gerados (padrão: <DATASUS_STORE_DIR>/tiles).
+    TILE_PRECOMPUTE_MAX_ZOOM  maior zoom gerado pelo scripts/build_tiles.py (padrão: 6).
+"""
+import math
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Any, Iterator, Optional, Sequence, Tuple
+
+import geopandas as gpd
+import mapbox_vector_tile
+import numpy as np
+import shapely
+
+from src.infrastructure.shared import datasus_store, geometry_registry
+
+TILE_CACHE_DIR = os.environ.get("TILE_CACHE_DIR", str(Path(datasus_store.STORE_DIR) / "tiles"))
+TILE_PRECOMPUTE_MAX_ZOOM = int(os.environ.get("TILE_PRECOMPUTE_MAX_ZOOM", 6))
+
+MAX_ZOOM = 22
+TILE_EXTENT = 4096
+# Margem em volta do tile, em unidades do tile: evita costuras nas bordas ao desenhar.
+TILE_BUFFER = 64
+WEB_MERCATOR_CRS = "EPSG:3857"
+WEB_MERCATOR_HALF = 20037508.342789244
+MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+
+Bounds = Tuple[float, float, float, float]
+
+
+def check_tile(z: int, x: int, y: int) -> None:
+    """Levanta ValueError para coordenadas de tile fora do esquema XYZ."""
+    if not 0 <= z <= MAX_ZOOM:
+        raise ValueError(f"Zoom {z} fora do intervalo 0-{MAX_ZOOM}.")
+    if not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise ValueError(f"Tile {z}/{x}/{y} não existe: x e y vão de 0 a {2 ** z - 1} no zoom {z}.")
+
+
+def _tile_latitude(y: int, z: int) -> float:
+    return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / 2 ** z))))
+
+
+def tile_bounds_lonlat(z: int, x: int, y: int) -> Bounds:
+    """Bbox do tile em graus (minx, miny, maxx, maxy)."""
+    n = 2 ** z
+    return x / n * 360.0 - 180.0, _tile_latitude(y + 1, z), (x + 1) / n * 360.0 - 180.0, _tile_latitude(y, z)
+
+
+def tile_bounds_mercator(z: int, x: int, y: int) -> Bounds:
+    """Bbox do tile em metros do Web Mercator."""
+    size = 2 * WEB_MERCATOR_HALF / 2 ** z
+    minx = -WEB_MERCATOR_HALF + x * size
+    maxy = WEB_MERCATOR_HALF - y * size
+    return minx, maxy - size, minx + size, maxy
+
+
+def tiles_in_bounds(bounds: Sequence[float], z: int) -> Iterator[Tuple[int, int]]:
+    """Tiles (x, y) do zoom `z` que cobrem uma bbox em graus."""
+    minx, miny, maxx, maxy = bounds
+    n = 2 ** z
+
+    def column(lon: float) -> int:
+        return min(n - 1, max(0, int((lon + 180.0) / 360.0 * n)))
+
+    def row(lat: float) -> int:
+        lat = max(-85.0511, min(85.0511, lat))
+        return min(n - 1, max(0, int((1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * n)))
+
+    for x in range(column(minx), column(maxx) + 1):
+        for y in range(row(maxy), row(miny) + 1):
+            yield x, y
+
+
+def _property(value: Any) -> Any:
+    """Valor aceito como atributo no MVT (tipos do Python; None para ausente)."""
+    if value is None:
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        if math.isnan(value):
+            return None
+        if value.is_integer():
+            return int(value)
+    if isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def encode_tile(gdf: gpd.GeoDataFrame, layer_name: str, z: int, x: int, y: int) -> bytes:
+    """
+    Codifica as feições de `gdf` que cruzam o tile: reprojetadas para o Web Mercator,
+    recortadas com uma margem de TILE_BUFFER e quantizadas em TILE_EXTENT unidades.
+    """
+    bounds = tile_bounds_mercator(z, x, y)
+    features = []
+    if not gdf.empty:
+        margin = (bounds[2] - bounds[0]) * TILE_BUFFER / TILE_EXTENT
+        clip_box = shapely.box(bounds[0] - margin, bounds[1] - margin, bounds[2] + margin, bounds[3] + margin)
+        projected = gdf.to_crs(WEB_MERCATOR_CRS)
+        projected = projected.iloc[projected.sindex.query(clip_box, predicate="intersects")]
+        columns = [column for column in projected.columns if column != projected.geometry.name]
+        clipped = shapely.intersection(projected.geometry.values, clip_box)
+        for geometry, (_, row) in zip(clipped, projected[columns].iterrows()):
+            if geometry is None or geometry.is_empty:
+                continue
+            properties = {name: _property(value) for name, value in row.items()}
+            features.append({
+                "geometry": geometry,
+                "properties": {name: value for name, value in properties.items() if value is not None},
+            })
+
+    return mapbox_vector_tile.encode(
+        [{"name": layer_name, "features": features}],
+        default_options={"quantize_bounds": bounds, "extents": TILE_EXTENT},
+    )
+
+
+class TileCache:
+    """Tiles já gerados, gravados no disco por camada, ano, variante e z/x/y."""
+    def __init__(self, cache_dir: str = TILE_CACHE_DIR):
+        self._dir = Path(cache_dir)
+
+    def _path(self, layer: str, year: int, variant: str, z: int, x: int, y: int) -> Path:
+        variant = re.sub(r"[^A-Za-z0-9_.-]", "_", variant)
+        return self._dir / layer / str(year) / variant / str(z) / str(x) / f"{y}.mvt"
+
+    def get(self, layer: str, year: int, variant: str, z: int, x: int, y: int) -> Optional[bytes]:
+        path = self._path(layer, year, variant, z, x, y)
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def put(self, layer: str, year: int, variant: str, z: int, x: int, y: int, tile: bytes) -> None:
+        # Escrita atômica, como no manifesto do datasus_store, com nome temporário único.
+        path = self._path(layer, year, variant, z, x, y)
+        temp_path: Optional[Path] = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(prefix=f"{path.name}.", suffix=".tmp", dir=path.parent)
+            temp_path = Path(temp_name)
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(tile)
+            os.replace(temp_path, path)
+        except Exception as e:
+            # O tile continua sendo servido, só não fica no cache.
+            print(f" -> [Tiles] Não foi possível salvar o tile {z}/{x}/{y}: {e}")
+            if temp_path is not None:
+                temp_path.unlink(missing_ok=True)
+
+
+def tile_features(layer: str, z: int, x: int, y: int, year: int = geometry_registry.CONTEXT_YEAR) -> gpd.GeoDataFrame:
+    """Feições de `layer` das UFs que cruzam o tile, no nível de simplificação do zoom."""
+    tier = geometry_registry.pick_tier(zoom=z)
+    return geometry_registry.get_registry().layer_in_bounds(layer, tile_bounds_lonlat(z, x, y), year, tier)
@@ -2,9 +2,24 @@
 
 import streamlit as st
 import requests
+import pandas as pd
 from typing import Optional, Dict, Any, List
 from src.ui.constants import API_URL
 
+# Os resumos por município são pedidos em listas paralelas (layout=columns), que viram
+# DataFrame direto, sem montar um dicionário por município.
+SUMMARY_LAYOUT = "columns"
+
+
+def _summary_to_dataframe(payload: Dict[str, Any], summary_key: str) -> Dict[str, Any]:
+    """Troca o resumo colunar da resposta (listas paralelas) por um DataFrame."""
+    summary = payload.get(summary_key)
+    if isinstance(summary, dict) and payload.get("layout") == SUMMARY_LAYOUT:
+        payload[summary_key] = pd.DataFrame(summary)
+    elif isinstance(summary, list):
+        payload[summary_key] = pd.DataFrame(summary)
+    return payload
+
 @st.cache_data
 def fetch_table_list() -> Optional[List[Dict[str, Any]]]:
     try:
@@ -99,7 +114,7 @@ def fetch_sinan_variables() -> Optional[Dict[str, Any]]:
         return None
     
 @st.cache_data   
-def fetch_sinan_data(params: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+def fetch_sinan_data(params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """Requests a summary of SINAN data from the API based on disease, year, and state."""
     
     # A API espera os anos e estados como listas, que já estão no dicionário 'params'
@@ -109,11 +124,11 @@ def fetch_sinan_data(params: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
     
     try:
         # Nota: O 'requests' lida automaticamente com listas nos parâmetros (years=[2022] vira ?years=2022)
-        response = requests.get(base_url, params=params, timeout=120) 
+        response = requests.get(base_url, params={**params, "layout": SUMMARY_LAYOUT}, timeout=120) 
         response.raise_for_status()
         
-        # O backend retorna uma lista de dicionários (o sumário de casos)
-        return response.json() 
+        # O sumário de casos chega em colunas e é devolvido como DataFrame
+        return _summary_to_dataframe(response.json(), "summary_by_municipality")
         
     except requests.exceptions.RequestException as e:
         st.error(f"❌ Error fetching SINAN data from the API.")
@@ -243,7 +258,8 @@ def fetch_sim_data(
     # de listas (years, states) para a query string.
     params: Dict[str, Any] = {
         "group_code": group_code,
-        "years": years
+        "years": years,
+        "layout": SUMMARY_LAYOUT
     }
     
     # Adiciona 'states' apenas se a lista não estiver vazia
@@ -258,8 +274,8 @@ def fetch_sim_data(
         response = requests.get(base_url, params=params, timeout=180)
         response.raise_for_status()  # Lança exceção para status 4xx/5xx
         
-        # Retorna os dados em formato JSON (dicionário)
-        return response.json()
+        # Retorna o dicionário da API com o sumário já em DataFrame
+        return _summary_to_dataframe(response.json(), "summary_by_municipality")
     
     except requests.exceptions.RequestException as e:
         st.error(f"❌ Erro ao buscar dados do SIM na API.")
@@ -306,7 +322,8 @@ def fetch_sinasc_data(
     base_url = f"{API_URL}/pysus/sinasc/get-summary"
     params: Dict[str, Any] = {
         "group_code": group_code,
-        "years": years
+        "years": years,
+        "layout": SUMMARY_LAYOUT
     }
     if states:
         params["states"] = states
@@ -316,7 +333,8 @@ def fetch_sinasc_data(
     try:
         response = requests.get(base_url, params=params, timeout=180)
         response.raise_for_status()  
-        return response.json()
+        # 'summary' vira um DataFrame com uma linha por (município, sexo, faixa etária da mãe)
+        return _summary_to_dataframe(response.json(), "summary")
     
     except requests.exceptions.RequestException as e:
         st.error(f"❌ Erro ao buscar dados do SIM na API.")
@@ -327,4 +345,44 @@ def fetch_sinasc_data(
                 st.write(f"Server error details: {error_detail}")
             except:
                 st.write(f"Network error details: {e}")
-        return None
\ No newline at end of file
+        return None
+
+@st.cache_data
+def fetch_cnes_data(
+    group_code: str,
+    years: List[int],
+    states: Optional[List[str]] = None,
+    columns: Optional[List[str]] = None,
+    measure: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+
+    base_url = f"{API_URL}/pysus/cnes/fetch-data"
+    params: Dict[str, Any] = {
+        "group_code": group_code,
+        "years": years,
+        "layout": SUMMARY_LAYOUT
+    }
+    if states:
+        params["states"] = states
+    if columns:
+        params["columns"] = columns
+    if measure:
+        params["measure"] = measure
+
+    st.info(f"Calling API: {base_url} with params: {params}")
+
+    try:
+        response = requests.get(base_url, params=params, timeout=180)
+        response.raise_for_status()
+        return _summary_to_dataframe(response.json(), "summary_by_municipality")
+
+    except requests.exceptions.RequestException as e:
+        st.error(f"❌ Erro ao buscar dados do CNES na API.")
+
+        if e.response is not None:
+            try:
+                error_detail = e.response.json().get("detail", e.response.text)
+                st.write(f"Server error details: {error_detail}")
+            except:
+                st.write(f"Network error details: {e}")
+        return None
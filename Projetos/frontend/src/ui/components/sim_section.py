@@ -82,13 +82,13 @@ def display_sim_query_section():
             
             total_records = metadata.get('total_records_found', 0)
             
-            if data_to_display and isinstance(data_to_display, list) and data_to_display:
+            if isinstance(data_to_display, pd.DataFrame) and not data_to_display.empty:
                 
                 if total_records == 0:
                     total_records = len(data_to_display)
                 
                 st.success(f"✅ {total_records} records found for {selected_group_label}!")
-                st.dataframe(pd.DataFrame(data_to_display), use_container_width=True)
+                st.dataframe(data_to_display, use_container_width=True)
                 
                 if columns_list: 
                     with st.expander(f"Show {len(columns_list)} available data columns for this group"):
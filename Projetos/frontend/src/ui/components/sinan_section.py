@@ -106,10 +106,10 @@ def display_sinan_query_section():
                 total_records = metadata.get('total_records_found', 0)
                 columns_list = metadata.get('columns', metadata.get('available_columns', [])) 
 
-                if data_to_display and isinstance(data_to_display, list) and data_to_display:
+                if isinstance(data_to_display, pd.DataFrame) and not data_to_display.empty:
                     
                     st.success(f"✅ {total_records} records found for {selected_disease_label}!")
-                    st.dataframe(pd.DataFrame(data_to_display), use_container_width=True)
+                    st.dataframe(data_to_display, use_container_width=True)
                     
                     if columns_list: 
                         with st.expander(f"Show {len(columns_list)} available data columns"):
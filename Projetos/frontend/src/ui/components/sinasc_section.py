@@ -97,40 +97,37 @@ def display_sinasc_query_section():
                     states=state_list
                 )
                 
-                summary_dict = data.get('summary', {}) if data else {}
+                summary_df = data.get('summary') if data else None
                 columns_list = data.get('columns', []) if data else []
                 
-                rows_to_display = []
-
-                if summary_dict:
-                    for mun_code, stats in summary_dict.items():
-                        
-                        row = {
-                            "Município Code": mun_code.strip(),
-                            "Total Nascimentos": stats.get('total', 0)
-                        }
-                        
-                        if 'by_sex' in stats:
-                            row['Masc (1)'] = stats['by_sex'].get('1', 0)
-                            row['Fem (2)'] = stats['by_sex'].get('2', 0)
-                            
-                        if 'by_mother_age_group' in stats:
-                            for age_group, count in stats['by_mother_age_group'].items():
-                                row[f"Mãe {age_group}"] = count
-
-                        rows_to_display.append(row)
-
-                if rows_to_display:
-                    total_records = len(rows_to_display)
+                rows_df = pd.DataFrame()
+
+                if isinstance(summary_df, pd.DataFrame) and not summary_df.empty:
+                    # Uma linha por (município, sexo, faixa etária da mãe): pivota por município.
+                    by_municipality = summary_df.groupby("municipality_code")
+                    rows_df = pd.DataFrame({"Total Nascimentos": by_municipality["count"].sum()})
+
+                    by_sex = summary_df.pivot_table(index="municipality_code", columns="sex", values="count", aggfunc="sum", fill_value=0)
+                    rows_df["Masc (1)"] = by_sex.get("1", 0)
+                    rows_df["Fem (2)"] = by_sex.get("2", 0)
+
+                    by_age = summary_df.pivot_table(index="municipality_code", columns="mother_age_group", values="count", aggfunc="sum", fill_value=0)
+                    for age_group in by_age.columns:
+                        rows_df[f"Mãe {age_group}"] = by_age[age_group]
+
+                    rows_df = rows_df.fillna(0).astype(int).rename_axis("Município Code").reset_index()
+
+                if not rows_df.empty:
+                    total_records = len(rows_df)
                     st.success(f"✅ Encontrados dados para {total_records} municípios!")
                     
-                    st.dataframe(pd.DataFrame(rows_to_display), use_container_width=True)
+                    st.dataframe(rows_df, use_container_width=True)
                     
                     if columns_list: 
                         with st.expander(f"Show raw columns"):
                             st.write(columns_list)
                 
-                elif not summary_dict and data:
+                elif data:
                      st.warning("Data received but 'summary' dictionary is empty.")
                 else:
                     st.info(f"ℹ️ No records found. Try different parameters.")